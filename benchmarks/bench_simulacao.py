@@ -0,0 +1,289 @@
+# benchmarks/bench_simulacao.py
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+# O renderizador roda no driver SDL sem janela para medir o tempo de quadro
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+from src.ambiente.ambiente_carro import AmbienteCarro
+from src.ambiente.frota_vetorizada import FrotaVetorizada
+from src.agentes.agente_q_learning import AgenteQLearning, AgenteQLearningDenso
+from src.agentes.aprendiz_frota import AprendizFrota
+from src.agentes.carro_genetico import CarroGenetico
+from src.treino_headless import executar_episodio
+from src.util.constantes import ACOES
+
+VERSAO_RESULTADOS = 1
+SEMENTE = 1234
+
+def _semear(semente=SEMENTE):
+    """Fixa os geradores aleatórios para que cada benchmark use os mesmos dados."""
+    random.seed(semente)
+    np.random.seed(semente)
+
+def _criar_ambiente(num_carros, tamanho_grid, headless=True):
+    _semear()
+    return AmbienteCarro(num_carros=num_carros, headless=headless, tamanho_grid=tamanho_grid)
+
+def _celulas_livres(ambiente):
+    """Lista (x, y) de todas as células livres do labirinto, em ordem fixa."""
+    return [(int(x), int(y)) for y, x in np.argwhere(ambiente.labirinto == 0)]
+
+def cronometrar(executar, operacoes, repeticoes):
+    """
+    Executa o lote várias vezes e resume a vazão.
+
+    Args:
+        executar (callable): Executa um lote de operações
+        operacoes (int): Número de operações de um lote
+        repeticoes (int): Quantas vezes o lote é medido
+
+    Returns:
+        dict: Operações por segundo (mediana e melhor) e tempo por operação
+    """
+    executar()  # Aquecimento
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        executar()
+        tempos.append(time.perf_counter() - inicio)
+
+    mediana = statistics.median(tempos)
+    return {
+        'operacoes': operacoes,
+        'repeticoes': repeticoes,
+        'operacoes_por_segundo': operacoes / mediana,
+        'melhor_operacoes_por_segundo': operacoes / min(tempos),
+        'microssegundos_por_operacao': mediana / operacoes * 1e6,
+    }
+
+# Cada preparador monta o fixture e retorna (lote, operações por lote)
+
+def preparar_executar_acao(num_carros, tamanho_grid, escala):
+    ambiente = _criar_ambiente(num_carros, tamanho_grid)
+    ticks = 200 * escala
+    sorteios = random.Random(SEMENTE)
+
+    def lote():
+        ambiente.reset_todos()
+        for _ in range(ticks):
+            for i in range(num_carros):
+                acoes = ambiente.obter_acoes_validas(i)
+                ambiente.executar_acao(i, acoes[int(sorteios.random() * len(acoes))])
+    return lote, ticks * num_carros
+
+def preparar_obter_acoes_validas(num_carros, tamanho_grid, escala):
+    ambiente = _criar_ambiente(num_carros, tamanho_grid)
+    celulas = _celulas_livres(ambiente)[:500 * escala]
+
+    def lote():
+        for posicao in celulas:
+            for i in range(num_carros):
+                ambiente.carros[i]['posicao'] = posicao
+                ambiente.obter_acoes_validas(i)
+    return lote, len(celulas) * num_carros
+
+def _preparar_agente(tipo, num_carros, tamanho_grid, escala):
+    ambiente = _criar_ambiente(num_carros, tamanho_grid)
+    if tipo == 'densa':
+        agentes = [AgenteQLearningDenso(i, dimensoes=(ambiente.LINHAS, ambiente.COLUNAS))
+                   for i in range(num_carros)]
+    else:
+        agentes = [AgenteQLearning(i) for i in range(num_carros)]
+
+    # Transições fixas sorteadas entre células livres
+    celulas = _celulas_livres(ambiente)
+    sorteios = random.Random(SEMENTE)
+    transicoes = [(sorteios.choice(celulas), sorteios.choice(ACOES), sorteios.choice(celulas))
+                  for _ in range(1000 * escala)]
+    todas = list(ACOES)
+
+    def lote():
+        for estado, acao, proximo in transicoes:
+            for agente in agentes:
+                agente.escolher_acao(estado, todas)
+                agente.aprender(estado, acao, -0.1, proximo, todas)
+    return lote, len(transicoes) * num_carros
+
+def preparar_agente_dicionario(num_carros, tamanho_grid, escala):
+    return _preparar_agente('dicionario', num_carros, tamanho_grid, escala)
+
+def preparar_agente_denso(num_carros, tamanho_grid, escala):
+    return _preparar_agente('densa', num_carros, tamanho_grid, escala)
+
+def preparar_frota_vetorizada(num_carros, tamanho_grid, escala):
+    ambiente = _criar_ambiente(num_carros, tamanho_grid)
+    frota = FrotaVetorizada(ambiente, semente=SEMENTE)
+    aprendiz = AprendizFrota(num_carros, (ambiente.LINHAS, ambiente.COLUNAS), semente=SEMENTE)
+    ticks = 200 * escala
+
+    def lote():
+        posicoes = frota.reset()
+        mascaras = frota.mascaras_acoes_validas()
+        for _ in range(ticks):
+            ativos = ~frota.terminados
+            acoes = aprendiz.escolher_acoes(posicoes, mascaras)
+            proximas, recompensas, _ = frota.passo(acoes)
+            proximas_mascaras = frota.mascaras_acoes_validas()
+            aprendiz.aprender(posicoes, acoes, recompensas, proximas, proximas_mascaras, ativos)
+            posicoes, mascaras = proximas, proximas_mascaras
+    return lote, ticks * num_carros
+
+def preparar_mutacao(num_carros, tamanho_grid, escala):
+    _semear()
+    pais = [CarroGenetico(i).genes for i in range(2)]
+    chamadas = 5000 * escala
+
+    def lote():
+        for _ in range(chamadas):
+            CarroGenetico.mutacao(pais[0], pais[1])
+    return lote, chamadas
+
+def preparar_episodio_headless(num_carros, tamanho_grid, escala):
+    ambiente = _criar_ambiente(num_carros, tamanho_grid)
+    episodios = 2 * escala
+
+    def lote():
+        # Agentes novos a cada lote para que todos os lotes meçam o mesmo trabalho
+        _semear()
+        ambiente.episodio = 0
+        agentes = [AgenteQLearning(i) for i in range(num_carros)]
+        for _ in range(episodios):
+            executar_episodio(ambiente, agentes, max_passos=2000)
+    return lote, episodios
+
+def preparar_renderizar(num_carros, tamanho_grid, escala):
+    ambiente = _criar_ambiente(num_carros, tamanho_grid, headless=False)
+    quadros = 100 * escala
+    sorteios = random.Random(SEMENTE)
+
+    def lote():
+        ambiente.reset_todos()
+        ambiente.invalidar_renderizacao()
+        for _ in range(quadros):
+            for i in range(num_carros):
+                acoes = ambiente.obter_acoes_validas(i)
+                ambiente.executar_acao(i, acoes[int(sorteios.random() * len(acoes))])
+            ambiente.renderizar()
+    return lote, quadros
+
+# Nome -> (preparador, depende do número de carros)
+BENCHMARKS = {
+    'executar_acao': (preparar_executar_acao, True),
+    'obter_acoes_validas': (preparar_obter_acoes_validas, True),
+    'agente_dicionario': (preparar_agente_dicionario, True),
+    'agente_denso': (preparar_agente_denso, True),
+    'frota_vetorizada': (preparar_frota_vetorizada, True),
+    'mutacao': (preparar_mutacao, False),
+    'episodio_headless': (preparar_episodio_headless, True),
+    'renderizar': (preparar_renderizar, True),
+}
+
+def _commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def executar_benchmarks(nomes, frotas, grids, repeticoes=5, escala=1, verboso=True):
+    """
+    Executa os benchmarks em todas as combinações de frota e tamanho de grid.
+
+    Args:
+        nomes (list): Benchmarks a executar (chaves de BENCHMARKS)
+        frotas (list): Números de carros
+        grids (list): Tamanhos de célula em pixels (menor = mais células)
+        repeticoes (int): Medições por combinação
+        escala (int): Multiplicador do tamanho de cada lote
+        verboso (bool): Se True, imprime cada resultado
+
+    Returns:
+        dict: Resultados em formato serializável em JSON
+    """
+    resultados = []
+    for nome in nomes:
+        preparador, usa_frota = BENCHMARKS[nome]
+        for tamanho_grid in grids:
+            for num_carros in (frotas if usa_frota else frotas[:1]):
+                lote, operacoes = preparador(num_carros, tamanho_grid, escala)
+                medida = cronometrar(lote, operacoes, repeticoes)
+                medida.update({
+                    'nome': nome,
+                    'num_carros': num_carros if usa_frota else None,
+                    'tamanho_grid': tamanho_grid,
+                })
+                resultados.append(medida)
+                if verboso:
+                    print(f"{nome:20s} grid={tamanho_grid:3d} carros={num_carros:5d} "
+                          f"{medida['operacoes_por_segundo']:14.0f} op/s "
+                          f"({medida['microssegundos_por_operacao']:.2f} us/op)")
+
+    return {
+        'versao': VERSAO_RESULTADOS,
+        'commit': _commit_atual(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+
+def _chave(resultado):
+    return (resultado['nome'], resultado['num_carros'], resultado['tamanho_grid'])
+
+def comparar(base, atual):
+    """
+    Imprime a razão de vazão entre dois arquivos de resultados.
+    Valores acima de 1.0 indicam que a versão atual é mais rápida.
+    """
+    anteriores = {_chave(r): r for r in base['resultados']}
+    print(f"\nComparação com {base.get('commit')}:")
+    for resultado in atual['resultados']:
+        anterior = anteriores.get(_chave(resultado))
+        if anterior is None:
+            continue
+        razao = resultado['operacoes_por_segundo'] / anterior['operacoes_por_segundo']
+        nome, num_carros, tamanho_grid = _chave(resultado)
+        print(f"{nome:20s} grid={tamanho_grid:3d} carros={num_carros or '-':>5} {razao:6.2f}x")
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando dos benchmarks.
+    Exemplo: python -m benchmarks.bench_simulacao --saida resultados.json
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos da simulação.")
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmarks a executar (Padrão: todos)")
+    parser.add_argument('--carros', nargs='+', type=int, default=[1, 6, 64],
+                        help="Tamanhos de frota (Padrão: 1 6 64)")
+    parser.add_argument('--grids', nargs='+', type=int, default=[40, 20, 10],
+                        help="Tamanhos de célula em pixels (Padrão: 40 20 10)")
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help="Medições por combinação (Padrão: 5)")
+    parser.add_argument('--escala', type=int, default=1,
+                        help="Multiplicador do tamanho dos lotes (Padrão: 1)")
+    parser.add_argument('--saida', default=None,
+                        help="Arquivo JSON onde os resultados são gravados")
+    parser.add_argument('--comparar', default=None,
+                        help="Arquivo JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    resultados = executar_benchmarks(args.benchmarks, args.carros, args.grids,
+                                     args.repeticoes, args.escala)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            comparar(json.load(arquivo), resultados)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+# src/agentes/agente_linear.py
+
+import numpy as np
+from ..util.aleatorio import gerador_ou_padrao
+from ..util.constantes import PARAMS_APRENDIZAGEM as PA
+from ..util.constantes import PARAMS_GENETICOS as PG
+from ..util.constantes import ACOES, DESLOCAMENTOS, INDICE_ACAO
+from ..ambiente.campo_distancias import INALCANCAVEL
+
+# Características de cada par (estado, ação), na ordem do vetor. As sete
+# primeiras vêm do mapa (a célula de destino da ação e a meta) e as quatro
+# últimas dos genes do carro
+NOMES_CARACTERISTICAS = (
+    'vies',
+    'parede',               # A ação leva a uma parede ou para fora do grid
+    'armadilha',            # A ação leva a uma armadilha
+    'meta',                 # A ação leva à meta
+    'aproxima',             # +1 se a ação reduz a distância BFS até a meta, -1 se aumenta
+    'distancia_destino',    # Distância BFS do destino, normalizada (1 sem caminho)
+    'alinhamento',          # Cosseno entre a ação e a direção da meta
+    'risco_armadilha',      # armadilha vezes a chance de o sensor não evitá-la
+    'velocidade',           # Genes normalizados para [0, 1]
+    'sensor_perigo',
+    'anda',                 # 1 se a velocidade tira o carro da célula
+)
+NUM_CARACTERISTICAS_MAPA = 7
+
+def _vizinho(mapa, dx, dy, borda):
+    """Valor de cada célula vizinha no deslocamento (dx, dy), com borda fora do grid."""
+    linhas, colunas = mapa.shape
+    expandido = np.pad(mapa, 1, constant_values=borda)
+    return expandido[1 + dy:1 + dy + linhas, 1 + dx:1 + dx + colunas]
+
+class ExtratorCaracteristicas:
+    """
+    Converte pares (posição, ação) em vetores de características que não
+    dependem do tamanho nem do desenho do labirinto, para que um aprendiz
+    linear generalize entre células, ações e labirintos.
+
+    As características do mapa são pré-calculadas para todas as células e
+    ações em um array (linhas, colunas, 4, NUM_CARACTERISTICAS_MAPA), como as
+    máscaras de ações e o campo de distâncias do ambiente, e recalculadas
+    automaticamente quando o ambiente troca a tabela de transições (labirinto,
+    armadilhas ou meta novos). Os pesos aprendidos não dependem do tamanho do grid.
+    """
+    def __init__(self, ambiente):
+        """
+        Args:
+            ambiente (AmbienteCarro): Ambiente com labirinto, armadilhas e carros genéticos
+        """
+        self.ambiente = ambiente
+        self.num_caracteristicas = len(NOMES_CARACTERISTICAS)
+        self._transicoes = None
+        self._genes = []
+        self._vetores_genes = np.zeros((0, 4), dtype=np.float32)
+        self.atualizar()
+
+    def atualizar(self):
+        """Recalcula as características do mapa a partir do estado atual do ambiente."""
+        ambiente = self.ambiente
+        linhas, colunas = ambiente.labirinto.shape
+        livre = ambiente.labirinto == 0
+        armadilhas = np.zeros(livre.shape, dtype=bool)
+        for x, y in ambiente.armadilhas:
+            armadilhas[y, x] = True
+        meta = np.zeros(livre.shape, dtype=bool)
+        meta[ambiente.pos_meta[1], ambiente.pos_meta[0]] = True
+        alcancavel = ambiente.distancias != INALCANCAVEL
+        distancias = ambiente.distancias.astype(np.float32)
+
+        ys, xs = np.mgrid[0:linhas, 0:colunas]
+        para_x = ambiente.pos_meta[0] - xs
+        para_y = ambiente.pos_meta[1] - ys
+        norma = np.maximum(np.hypot(para_x, para_y), 1.0)
+
+        mapa = np.zeros((linhas, colunas, len(ACOES), NUM_CARACTERISTICAS_MAPA), dtype=np.float32)
+        mapa[..., 0] = 1.0
+        for i, (dx, dy) in enumerate(DESLOCAMENTOS):
+            vizinho_livre = _vizinho(livre, dx, dy, False)
+            vizinho_alcancavel = _vizinho(alcancavel, dx, dy, False) & vizinho_livre
+            distancia_vizinho = _vizinho(distancias, dx, dy, 0)
+            mapa[..., i, 1] = ~vizinho_livre
+            mapa[..., i, 2] = _vizinho(armadilhas, dx, dy, False)
+            mapa[..., i, 3] = _vizinho(meta, dx, dy, False)
+            mapa[..., i, 4] = np.where(vizinho_alcancavel & alcancavel,
+                                       distancias - distancia_vizinho, 0.0)
+            mapa[..., i, 5] = np.where(vizinho_alcancavel,
+                                       distancia_vizinho / ambiente.distancia_maxima, 1.0)
+            mapa[..., i, 6] = (dx * para_x + dy * para_y) / norma
+
+        self.mapa = mapa
+        self._transicoes = ambiente.transicoes
+
+    def verificar(self):
+        """Recalcula o mapa se o ambiente mudou desde o último cálculo."""
+        if self.ambiente.transicoes is not self._transicoes:
+            self.atualizar()
+
+    @staticmethod
+    def vetor_genes(genes):
+        """
+        Características dos genes de um carro: chance de o sensor não evitar
+        uma armadilha, genes normalizados para [0, 1] e se o carro anda.
+        """
+        return np.array([1.0 - min(1.0, genes.sensor_perigo / 3),
+                         genes.velocidade / PG['VELOCIDADE_MAX'],
+                         genes.sensor_perigo / PG['SENSOR_MAX'],
+                         float(genes.velocidade * 0.1 > 0.5)], dtype=np.float32)
+
+    def vetores_genes(self):
+        """
+        Características dos genes de todos os carros, formato (num_carros, 4),
+        refeitas apenas quando algum carro recebe genes novos.
+        """
+        genes = [carro.genes for carro in self.ambiente.carros_geneticos]
+        if len(genes) != len(self._genes) or any(a is not b for a, b in zip(genes, self._genes)):
+            self._genes = genes
+            self._vetores_genes = np.stack([self.vetor_genes(g) for g in genes])
+        return self._vetores_genes
+
+    def _vetor_genes_carro(self, indice_carro):
+        """Características dos genes de um carro, conferindo só os genes dele."""
+        carros = self.ambiente.carros_geneticos
+        if indice_carro >= len(self._genes) or carros[indice_carro].genes is not self._genes[indice_carro]:
+            self.vetores_genes()
+        return self._vetores_genes[indice_carro]
+
+    def caracteristicas(self, posicoes, carros):
+        """
+        Vetores de características das quatro ações de vários carros de uma vez.
+
+        Args:
+            posicoes (np.ndarray): Posições (x, y), formato (n, 2)
+            carros (np.ndarray): Índice do carro de cada posição, formato (n,)
+
+        Returns:
+            np.ndarray: Formato (n, 4, num_caracteristicas)
+        """
+        self.verificar()
+        mapa = self.mapa[posicoes[:, 1], posicoes[:, 0]]
+        genes = np.broadcast_to(self.vetores_genes()[carros][:, None, :],
+                                mapa.shape[:2] + (4,)).copy()
+        genes[..., 0] *= mapa[..., 2]
+        return np.concatenate((mapa, genes), axis=2)
+
+    def tabela_valores(self, pesos, indice_carro):
+        """
+        Valores Q de um carro em todas as células, no formato das tabelas densas.
+
+        Args:
+            pesos (np.ndarray): Pesos do aprendiz linear
+            indice_carro (int): Carro cujos genes entram nas características
+
+        Returns:
+            np.ndarray: Tabela float32 de formato (linhas, colunas, 4)
+        """
+        self.verificar()
+        genes = self._vetor_genes_carro(indice_carro)
+        num_mapa = NUM_CARACTERISTICAS_MAPA
+        valores = self.mapa @ pesos[:num_mapa].astype(np.float32)
+        valores += self.mapa[..., 2] * genes[0] * pesos[num_mapa]
+        valores += genes[1:] @ pesos[num_mapa + 1:]
+        return valores.astype(np.float32)
+
+    def vetor(self, estado, indice_carro):
+        """Vetores de características das quatro ações de um carro na posição (x, y)."""
+        self.verificar()
+        x, y = estado
+        mapa = self.mapa[y, x]
+        genes = np.tile(self._vetor_genes_carro(indice_carro), (len(ACOES), 1))
+        genes[:, 0] *= mapa[:, 2]
+        return np.concatenate((mapa, genes), axis=1)
+
+def _taxa_aprendizagem(indice_carro):
+    return min(PA['TAXA_APRENDIZAGEM_MAXIMA'],
+               PA['TAXA_APRENDIZAGEM_BASE'] + indice_carro * PA['INCREMENTO_TAXA'])
+
+class AgenteLinear:
+    """
+    Agente Q-Learning com aproximação linear: Q(s, a) = pesos · phi(s, a),
+    com phi dado por um ExtratorCaracteristicas. Tem a mesma interface do
+    AgenteQLearning (estados (x, y) e ações por nome), mas a memória é
+    constante no tamanho do grid e os mesmos pesos valem para todas as ações,
+    células e labirintos.
+
+    A atualização é o gradiente semi-TD normalizado pela norma do vetor de
+    características, estável para taxas de aprendizagem entre 0 e 1.
+    O valor seguinte é zero quando o episódio termina (fim=True); sem isso,
+    como estados terminais compartilham características com os demais, o
+    valor deles contaminaria o das outras células.
+    """
+    def __init__(self, indice_carro, extrator, pesos=None, aleatorio=None):
+        """
+        Args:
+            indice_carro (int): Índice do carro controlado pelo agente
+            extrator (ExtratorCaracteristicas): Extrator do ambiente do carro
+            pesos (np.ndarray): Pesos iniciais (num_caracteristicas,), por
+                exemplo os de um agente treinado em outro labirinto (Padrão: zeros)
+            aleatorio: Gerador da exploração, com a interface de random.Random
+                (ex.: FluxoAleatorio); None usa o módulo random
+        """
+        self.extrator = extrator
+        self.pesos = np.zeros(extrator.num_caracteristicas) if pesos is None \
+            else np.array(pesos, dtype=np.float64)
+
+        # Parâmetros de aprendizagem personalizados para cada carro
+        self.taxa_aprendizagem = _taxa_aprendizagem(indice_carro)
+        self.gamma = PA['FATOR_DESCONTO']
+        self.epsilon = PA['EPSILON_INICIAL']
+
+        # Identificação do agente e gerador da exploração
+        self.indice = indice_carro
+        self.aleatorio = aleatorio
+
+    def valores(self, estado):
+        """Valores Q das quatro ações no estado, na ordem de ACOES."""
+        return self.extrator.vetor(estado, self.indice) @ self.pesos
+
+    def tabela_valores(self):
+        """Valores Q em todas as células, no formato (linhas, colunas, 4) da tabela densa."""
+        return self.extrator.tabela_valores(self.pesos, self.indice)
+
+    def escolher_acao(self, estado, acoes_validas):
+        """
+        Seleciona uma ação usando a política epsilon-greedy.
+        Em caso de empate, escolhe a primeira ação válida, como a tabela Q.
+        """
+        aleatorio = gerador_ou_padrao(self.aleatorio)
+        if aleatorio.random() < self.epsilon:
+            return aleatorio.choice(acoes_validas)
+        valores = self.valores(estado).tolist()
+        return max(acoes_validas, key=lambda a: valores[INDICE_ACAO[a]])
+
+    def aprender(self, estado, acao, recompensa, proximo_estado, proximas_acoes, fim=False):
+        """Atualiza os pesos com a equação de Bellman."""
+        caracteristicas = self.extrator.vetor(estado, self.indice)[INDICE_ACAO[acao]]
+        proximo_max = 0.0
+        if not fim and proximas_acoes:
+            valores_proximos = self.valores(proximo_estado).tolist()
+            proximo_max = max(valores_proximos[INDICE_ACAO[a]] for a in proximas_acoes)
+
+        erro = recompensa + self.gamma * proximo_max - caracteristicas @ self.pesos
+        self.pesos += (self.taxa_aprendizagem * erro
+                       / (caracteristicas @ caracteristicas)) * caracteristicas
+
+        # Reduz gradualmente a taxa de exploração
+        self.epsilon = max(PA['EPSILON_MINIMO'],
+                          self.epsilon * PA['EPSILON_DECAY'])
+
+class AprendizLinearFrota:
+    """
+    Aprendiz linear de toda a frota, com a interface do AprendizFrota
+    (posições e máscaras em arrays, ações como índices).
+
+    Todos os carros compartilham o mesmo vetor de pesos: como os genes fazem
+    parte das características, uma única política serve para a frota inteira
+    e para as gerações seguintes. A escolha epsilon-greedy e a atualização são
+    feitas de uma vez para todos os carros ativos; o passo de cada carro mantém
+    a taxa de aprendizagem personalizada e é dividido pelo número de carros
+    ativos, como a média de um minilote.
+    """
+    def __init__(self, num_carros, extrator, semente=None, pesos=None):
+        """
+        Args:
+            num_carros (int): Número de carros da frota
+            extrator (ExtratorCaracteristicas): Extrator do ambiente da frota
+            semente (int): Semente do gerador usado na exploração
+            pesos (np.ndarray): Pesos iniciais (Padrão: zeros)
+        """
+        self.num_carros = num_carros
+        self.extrator = extrator
+        self.pesos = np.zeros(extrator.num_caracteristicas) if pesos is None \
+            else np.array(pesos, dtype=np.float64)
+
+        self.taxas_aprendizagem = np.array([_taxa_aprendizagem(i) for i in range(num_carros)])
+        self.gamma = PA['FATOR_DESCONTO']
+        self.epsilons = np.full(num_carros, PA['EPSILON_INICIAL'])
+
+        self.rng = np.random.default_rng(semente)
+        self._indices = np.arange(num_carros)
+
+    def tabelas_valores(self):
+        """Valores Q de cada carro em todas as células, formato (num_carros, linhas, colunas, 4)."""
+        return np.stack([self.extrator.tabela_valores(self.pesos, i) for i in range(self.num_carros)])
+
+    def escolher_acoes(self, posicoes, mascaras):
+        """
+        Seleciona uma ação por carro usando a política epsilon-greedy
+        (ver AprendizFrota.escolher_acoes).
+
+        Returns:
+            np.ndarray: Índice da ação escolhida para cada carro
+        """
+        valores = self.extrator.caracteristicas(posicoes, self._indices) @ self.pesos
+        gulosas = np.argmax(np.where(mascaras, valores, -np.inf), axis=1)
+
+        sorteio = np.where(mascaras, self.rng.random(mascaras.shape), -1.0)
+        aleatorias = np.argmax(sorteio, axis=1)
+
+        explorar = self.rng.random(self.num_carros) < self.epsilons
+        return np.where(explorar, aleatorias, gulosas)
+
+    def aprender(self, posicoes, acoes, recompensas, proximas_posicoes,
+                 proximas_mascaras, ativos=None, fins=None):
+        """
+        Atualiza os pesos com a equação de Bellman para todos os carros ativos
+        e reduz o epsilon de cada um (mesmos argumentos de AprendizFrota.aprender).
+        """
+        if ativos is None:
+            ativos = np.ones(self.num_carros, dtype=bool)
+        carros = self._indices[ativos]
+        if carros.size == 0:
+            return
+
+        acoes = np.asarray(acoes)[ativos]
+        caracteristicas = self.extrator.caracteristicas(posicoes[ativos], carros)[
+            np.arange(carros.size), acoes]
+        proximas = self.extrator.caracteristicas(proximas_posicoes[ativos], carros)
+        mascaras = proximas_mascaras[ativos]
+
+        # Maior valor Q do próximo estado (0 sem ação válida ou no fim do episódio)
+        proximo_max = np.max(np.where(mascaras, proximas @ self.pesos, -np.inf), axis=1)
+        sem_futuro = ~mascaras.any(axis=1)
+        if fins is not None:
+            sem_futuro |= np.asarray(fins)[ativos]
+        proximo_max[sem_futuro] = 0.0
+
+        erros = np.asarray(recompensas)[ativos] + self.gamma * proximo_max \
+            - caracteristicas @ self.pesos
+        passos = self.taxas_aprendizagem[carros] * erros \
+            / np.einsum('nd,nd->n', caracteristicas, caracteristicas) / carros.size
+        self.pesos += passos @ caracteristicas
+
+        # Reduz gradualmente a taxa de exploração
+        self.epsilons[carros] = np.maximum(PA['EPSILON_MINIMO'],
+                                           self.epsilons[carros] * PA['EPSILON_DECAY'])
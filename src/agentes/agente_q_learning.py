@@ -1,47 +1,64 @@
 # src/agentes/agente_q_learning.py
 
 from collections import defaultdict
-import random
+import numpy as np
+from ..util.aleatorio import gerador_ou_padrao
 from ..util.constantes import PARAMS_APRENDIZAGEM as PA
+from ..util.constantes import ACOES, INDICE_ACAO, TAMANHO_JANELA, TAMANHO_GRID
+from .memoria_replay import atualizar_minilote
+
+def _linha_q():
+    """Cria a linha de valores Q de um estado (função nomeada para permitir pickle)."""
+    return defaultdict(float)
 
 class AgenteQLearning:
     """
     Implementa um agente de aprendizagem por reforço usando Q-Learning.
     Cada agente mantém sua própria tabela Q e parâmetros de aprendizagem.
     """
-    def __init__(self, indice_carro=0):
+    def __init__(self, indice_carro=0, aleatorio=None):
+        """
+        Args:
+            indice_carro (int): Índice do carro controlado pelo agente
+            aleatorio: Gerador da exploração, com a interface de random.Random
+                (ex.: FluxoAleatorio); None usa o módulo random
+        """
         # Tabela Q armazena os valores estado-ação
-        self.tabela_q = defaultdict(lambda: defaultdict(float))
+        self.tabela_q = defaultdict(_linha_q)
         
         # Parâmetros de aprendizagem personalizados para cada carro
-        self.taxa_aprendizagem = PA['TAXA_APRENDIZAGEM_BASE'] + (indice_carro * PA['INCREMENTO_TAXA'])
+        self.taxa_aprendizagem = min(PA['TAXA_APRENDIZAGEM_MAXIMA'],
+                                     PA['TAXA_APRENDIZAGEM_BASE'] + (indice_carro * PA['INCREMENTO_TAXA']))
         self.gamma = PA['FATOR_DESCONTO']
         self.epsilon = PA['EPSILON_INICIAL']
         
-        # Identificação do agente
+        # Identificação do agente e gerador da exploração
         self.indice = indice_carro
+        self.aleatorio = aleatorio
 
     def escolher_acao(self, estado, acoes_validas):
         """
         Seleciona uma ação usando a política epsilon-greedy.
         Equilibra exploração (ações aleatórias) e exploração (melhores ações conhecidas).
         """
-        if random.random() < self.epsilon:
+        aleatorio = gerador_ou_padrao(self.aleatorio)
+        if aleatorio.random() < self.epsilon:
             # Exploração: escolhe ação aleatória
-            return random.choice(acoes_validas)
+            return aleatorio.choice(acoes_validas)
         else:
             # Exploração: escolhe ação com maior valor Q
             return max(acoes_validas, 
                       key=lambda a: self.tabela_q[estado][a])
 
-    def aprender(self, estado, acao, recompensa, proximo_estado, proximas_acoes):
+    def aprender(self, estado, acao, recompensa, proximo_estado, proximas_acoes, fim=False):
         """
         Atualiza a tabela Q com base na experiência adquirida.
-        Usa a equação de Bellman para atualizar os valores Q.
+        Usa a equação de Bellman para atualizar os valores Q. No fim do
+        episódio (fim=True) não há valor futuro a propagar.
         """
-        # Encontra o maior valor Q possível no próximo estado
-        proximo_max = max([self.tabela_q[proximo_estado][a] 
-                          for a in proximas_acoes], default=0)
+        # Encontra o maior valor Q possível no próximo estado (0 no fim do episódio)
+        proximo_max = 0 if fim else max([self.tabela_q[proximo_estado][a]
+                                         for a in proximas_acoes], default=0)
         
         # Atualiza o valor Q usando a equação de Bellman
         q_atual = self.tabela_q[estado][acao]
@@ -51,4 +68,94 @@ class AgenteQLearning:
         
         # Reduz gradualmente a taxa de exploração
         self.epsilon = max(PA['EPSILON_MINIMO'], 
-                          self.epsilon * PA['EPSILON_DECAY'])
\ No newline at end of file
+                          self.epsilon * PA['EPSILON_DECAY'])
+
+class AgenteQLearningDenso(AgenteQLearning):
+    """
+    Variante do AgenteQLearning com a tabela Q em um array float32 contíguo
+    de formato (linhas, colunas, 4), indexado por [y, x, índice da ação].
+    Mantém a mesma interface e o mesmo comportamento da versão com dicionários,
+    mas sem overhead por entrada nem hashing de tuplas a cada chamada.
+
+    Com uma MemoriaReplay, cada transição também é guardada e, a cada passo,
+    um minilote de experiências passadas é reaprendido em uma operação vetorizada.
+    Com um ModeloDyna, cada passo real também gera passos_planejamento
+    atualizações simuladas a partir do modelo aprendido (Dyna-Q).
+    """
+    def __init__(self, indice_carro=0, dimensoes=None, memoria=None, tamanho_lote=32,
+                 modelo=None, passos_planejamento=0, aleatorio=None):
+        """
+        Args:
+            indice_carro (int): Índice do carro controlado pelo agente
+            dimensoes (tuple): (linhas, colunas) do grid. Por padrão usa o
+                tamanho derivado de TAMANHO_JANELA e TAMANHO_GRID
+            memoria (MemoriaReplay): Memória de experiências (None = sem replay)
+            tamanho_lote (int): Transições reaprendidas por passo com memória
+            modelo (ModeloDyna): Modelo do ambiente para o planejamento (None = sem Dyna)
+            passos_planejamento (int): Atualizações simuladas por passo real
+            aleatorio: Gerador da exploração (None = módulo random)
+        """
+        super().__init__(indice_carro, aleatorio)
+        if dimensoes is None:
+            dimensoes = (TAMANHO_JANELA[1] // TAMANHO_GRID,
+                         TAMANHO_JANELA[0] // TAMANHO_GRID)
+        linhas, colunas = dimensoes
+        self.tabela_q = np.zeros((linhas, colunas, len(ACOES)), dtype=np.float32)
+        self.memoria = memoria
+        self.tamanho_lote = tamanho_lote
+        self.modelo = modelo
+        self.passos_planejamento = passos_planejamento
+
+    def escolher_acao(self, estado, acoes_validas):
+        """
+        Seleciona uma ação usando a política epsilon-greedy.
+        Em caso de empate, escolhe a primeira ação válida, como na versão com dicionários.
+        """
+        aleatorio = gerador_ou_padrao(self.aleatorio)
+        if aleatorio.random() < self.epsilon:
+            return aleatorio.choice(acoes_validas)
+        x, y = estado
+        valores = self.tabela_q[y, x].tolist()
+        return max(acoes_validas, key=lambda a: valores[INDICE_ACAO[a]])
+
+    def aprender(self, estado, acao, recompensa, proximo_estado, proximas_acoes, fim=False):
+        """
+        Atualiza a tabela Q com base na experiência adquirida.
+        Usa a equação de Bellman para atualizar os valores Q (sem valor futuro
+        no fim do episódio) e, com memória de experiências, reaprende um
+        minilote de transições passadas.
+        Com modelo, atualiza o modelo e faz os passos de planejamento Dyna.
+        """
+        x, y = estado
+        if fim:
+            proximo_max = 0
+        else:
+            prox_x, prox_y = proximo_estado
+            valores_proximos = self.tabela_q[prox_y, prox_x].tolist()
+            proximo_max = max([valores_proximos[INDICE_ACAO[a]]
+                              for a in proximas_acoes], default=0)
+
+        # Atualiza o valor Q usando a equação de Bellman
+        indice_acao = INDICE_ACAO[acao]
+        q_atual = float(self.tabela_q[y, x, indice_acao])
+        self.tabela_q[y, x, indice_acao] = q_atual + self.taxa_aprendizagem * (
+            recompensa + self.gamma * proximo_max - q_atual)
+
+        if self.memoria is not None or self.modelo is not None:
+            mascara = [a in proximas_acoes for a in ACOES]
+        if self.memoria is not None:
+            self.memoria.adicionar(estado, indice_acao, recompensa, proximo_estado,
+                                   mascara, fim, self.indice)
+            atualizar_minilote(self.tabela_q, self.memoria,
+                               self.memoria.amostrar(self.tamanho_lote),
+                               self.taxa_aprendizagem, self.gamma)
+        if self.modelo is not None:
+            self.modelo.adicionar(estado, indice_acao, recompensa, proximo_estado,
+                                  mascara, fim, self.indice)
+            atualizar_minilote(self.tabela_q, self.modelo,
+                               self.modelo.amostrar(self.passos_planejamento),
+                               self.taxa_aprendizagem, self.gamma)
+
+        # Reduz gradualmente a taxa de exploração
+        self.epsilon = max(PA['EPSILON_MINIMO'],
+                          self.epsilon * PA['EPSILON_DECAY'])
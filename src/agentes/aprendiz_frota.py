@@ -0,0 +1,128 @@
+# src/agentes/aprendiz_frota.py
+
+import numpy as np
+from ..util.constantes import PARAMS_APRENDIZAGEM as PA
+from ..util.constantes import ACOES
+from .memoria_replay import atualizar_minilote
+
+class AprendizFrota:
+    """
+    Aprendiz Q-Learning de toda a frota em uma única estrutura.
+    As tabelas Q de todos os carros ficam empilhadas em um array de formato
+    (num_carros, linhas, colunas, 4) e a escolha epsilon-greedy, a atualização
+    de Bellman e o decaimento de epsilon são feitos de uma vez para todos os carros.
+
+    Com uma MemoriaReplay compartilhada, as transições de todos os carros são
+    guardadas juntas e cada passo reaprende um minilote, atualizando a tabela
+    do carro que gerou cada transição. Com um ModeloDyna compartilhado, cada
+    passo real também faz passos_planejamento atualizações simuladas (Dyna-Q).
+    """
+    def __init__(self, num_carros, dimensoes, semente=None, memoria=None, tamanho_lote=64,
+                 modelo=None, passos_planejamento=0):
+        """
+        Args:
+            num_carros (int): Número de carros da frota
+            dimensoes (tuple): (linhas, colunas) do grid
+            semente (int): Semente do gerador usado na exploração
+            memoria (MemoriaReplay): Memória de experiências da frota (None = sem replay)
+            tamanho_lote (int): Transições reaprendidas por passo com memória
+            modelo (ModeloDyna): Modelo do ambiente da frota (None = sem Dyna)
+            passos_planejamento (int): Atualizações simuladas por passo real
+        """
+        linhas, colunas = dimensoes
+        self.num_carros = num_carros
+        self.tabelas_q = np.zeros((num_carros, linhas, colunas, len(ACOES)), dtype=np.float32)
+
+        # Parâmetros de aprendizagem: a taxa continua personalizada para cada carro
+        self.taxas_aprendizagem = np.minimum(
+            PA['TAXA_APRENDIZAGEM_MAXIMA'],
+            PA['TAXA_APRENDIZAGEM_BASE'] + np.arange(num_carros) * PA['INCREMENTO_TAXA'])
+        self.gamma = PA['FATOR_DESCONTO']
+        self.epsilons = np.full(num_carros, PA['EPSILON_INICIAL'])
+
+        self.rng = np.random.default_rng(semente)
+        self._indices = np.arange(num_carros)
+        self.memoria = memoria
+        self.tamanho_lote = tamanho_lote
+        self.modelo = modelo
+        self.passos_planejamento = passos_planejamento
+
+    def escolher_acoes(self, posicoes, mascaras):
+        """
+        Seleciona uma ação por carro usando a política epsilon-greedy.
+        Na exploração sorteia uniformemente entre as ações válidas; no
+        aproveitamento escolhe a primeira ação válida de maior valor Q.
+
+        Args:
+            posicoes (np.ndarray): Posições (x, y) dos carros, formato (num_carros, 2)
+            mascaras (np.ndarray): Ações válidas de cada carro, formato (num_carros, 4)
+
+        Returns:
+            np.ndarray: Índice da ação escolhida para cada carro
+        """
+        valores = self.tabelas_q[self._indices, posicoes[:, 1], posicoes[:, 0]]
+        gulosas = np.argmax(np.where(mascaras, valores, -np.inf), axis=1)
+
+        # Pontuações aleatórias restritas às ações válidas dão um sorteio uniforme
+        sorteio = np.where(mascaras, self.rng.random(mascaras.shape), -1.0)
+        aleatorias = np.argmax(sorteio, axis=1)
+
+        explorar = self.rng.random(self.num_carros) < self.epsilons
+        return np.where(explorar, aleatorias, gulosas)
+
+    def aprender(self, posicoes, acoes, recompensas, proximas_posicoes,
+                 proximas_mascaras, ativos=None, fins=None):
+        """
+        Atualiza as tabelas Q de todos os carros com a equação de Bellman
+        e reduz o epsilon de cada carro que aprendeu neste passo.
+
+        Args:
+            posicoes (np.ndarray): Posições (x, y) antes da ação
+            acoes (np.ndarray): Índices das ações executadas
+            recompensas (np.ndarray): Recompensas recebidas
+            proximas_posicoes (np.ndarray): Posições (x, y) após a ação
+            proximas_mascaras (np.ndarray): Ações válidas na próxima posição
+            ativos (np.ndarray): Máscara dos carros que devem aprender (Padrão: todos)
+            fins (np.ndarray): Carros que terminaram neste passo, sem valor
+                futuro na atualização (Padrão: nenhum)
+        """
+        if ativos is None:
+            ativos = np.ones(self.num_carros, dtype=bool)
+        carros = self._indices[ativos]
+        if carros.size == 0:
+            return
+
+        x, y = posicoes[ativos, 0], posicoes[ativos, 1]
+        prox_x, prox_y = proximas_posicoes[ativos, 0], proximas_posicoes[ativos, 1]
+        acoes = np.asarray(acoes)[ativos]
+        mascaras = proximas_mascaras[ativos]
+
+        fins = np.zeros(carros.size, dtype=bool) if fins is None else np.asarray(fins)[ativos]
+
+        # Maior valor Q possível no próximo estado (0 sem ação válida ou no fim do episódio)
+        valores_proximos = np.where(mascaras, self.tabelas_q[carros, prox_y, prox_x], -np.inf)
+        proximo_max = np.max(valores_proximos, axis=1)
+        proximo_max[~mascaras.any(axis=1) | fins] = 0.0
+
+        # Atualiza os valores Q usando a equação de Bellman
+        q_atual = self.tabelas_q[carros, y, x, acoes]
+        self.tabelas_q[carros, y, x, acoes] = q_atual + self.taxas_aprendizagem[carros] * (
+            np.asarray(recompensas)[ativos] + self.gamma * proximo_max - q_atual)
+
+        if self.memoria is not None or self.modelo is not None:
+            transicoes = (posicoes[ativos], acoes, np.asarray(recompensas)[ativos],
+                          proximas_posicoes[ativos], mascaras, fins, carros)
+        if self.memoria is not None:
+            self.memoria.adicionar_lote(*transicoes)
+            atualizar_minilote(self.tabelas_q, self.memoria,
+                               self.memoria.amostrar(self.tamanho_lote),
+                               self.taxas_aprendizagem, self.gamma, por_carro=True)
+        if self.modelo is not None:
+            self.modelo.adicionar_lote(*transicoes)
+            atualizar_minilote(self.tabelas_q, self.modelo,
+                               self.modelo.amostrar(self.passos_planejamento),
+                               self.taxas_aprendizagem, self.gamma, por_carro=True)
+
+        # Reduz gradualmente a taxa de exploração
+        self.epsilons[carros] = np.maximum(PA['EPSILON_MINIMO'],
+                                           self.epsilons[carros] * PA['EPSILON_DECAY'])
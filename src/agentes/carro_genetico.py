@@ -1,7 +1,7 @@
 # src/agentes/carro_genetico.py
 
-import random
 from dataclasses import dataclass
+from ..util.aleatorio import gerador_ou_padrao
 from ..util.constantes import PARAMS_GENETICOS as PG
 
 @dataclass
@@ -10,38 +10,57 @@ class Genes:
     sensor_perigo: float
 
 class CarroGenetico:
-    def __init__(self, indice):
-        self.genes = self._inicializar_genes()
+    def __init__(self, indice, aleatorio=None):
+        """
+        Args:
+            indice (int): Índice do carro
+            aleatorio: Gerador dos genes iniciais, com a interface de
+                random.Random (ex.: FluxoAleatorio); None usa o módulo random
+        """
+        self.genes = self._inicializar_genes(gerador_ou_padrao(aleatorio))
         self.indice = indice
         self.chegou_meta = False
         self.tempo_chegada = float('inf') # Infinito até chegar meta
         self.melhor_distancia = float('inf') # Para rastrear quão perto chegou
         self.fitness = 0
+
+    def chave_progresso(self):
+        """
+        Chave de ordenação do desempenho no episódio (menor é melhor).
+        Carros que chegaram à meta vêm primeiro, pelo tempo de chegada;
+        os demais são ordenados pela menor distância que alcançaram até a meta.
+        """
+        if self.chegou_meta:
+            return (0, self.tempo_chegada)
+        return (1, self.melhor_distancia)
         
-    def _inicializar_genes(self):
+    def _inicializar_genes(self, aleatorio):
         
         # Nascimento com valores moderados, partindo do mínimo 
         return Genes(
-            velocidade=random.uniform(PG['VELOCIDADE_MIN'], PG['VELOCIDADE_MAX']),
-            sensor_perigo=random.uniform(PG['SENSOR_MIN'], PG['SENSOR_MAX'])
+            velocidade=aleatorio.uniform(PG['VELOCIDADE_MIN'], PG['VELOCIDADE_MAX']),
+            sensor_perigo=aleatorio.uniform(PG['SENSOR_MIN'], PG['SENSOR_MAX'])
         )
     
     @staticmethod
-    def mutacao(genes_pai1, genes_pai2):
+    def mutacao(genes_pai1, genes_pai2, aleatorio=None):
         """
         Realiza o cruzamento genético entre dois carros.
         Permite que as mutações ultrapassem os limites iniciais,
         possibilitando evolução para valores mais altos.
+        As mutações são sorteadas por aleatorio (Padrão: módulo random).
         """
+        aleatorio = gerador_ou_padrao(aleatorio)
+
         # Crossover com média ponderada
         nova_velocidade = (genes_pai1.velocidade + genes_pai2.velocidade) / 2
         novo_sensor = (genes_pai1.sensor_perigo + genes_pai2.sensor_perigo) / 2
         
         # Adiciona mutação aleatória
-        if random.random() < PG['TAXA_MUTACAO']:
-            nova_velocidade *= random.uniform(0.8, 1.5)
-        if random.random() < PG['TAXA_MUTACAO']:
-            novo_sensor *= random.uniform(0.8, 1.5)
+        if aleatorio.random() < PG['TAXA_MUTACAO']:
+            nova_velocidade *= aleatorio.uniform(0.8, 1.5)
+        if aleatorio.random() < PG['TAXA_MUTACAO']:
+            novo_sensor *= aleatorio.uniform(0.8, 1.5)
         
         # Mantém os valores dentro dos limites
         nova_velocidade = max(PG['VELOCIDADE_MIN'], 
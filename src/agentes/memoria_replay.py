@@ -0,0 +1,127 @@
+# src/agentes/memoria_replay.py
+
+import numpy as np
+from ..util.constantes import ACOES
+
+class MemoriaReplay:
+    """
+    Memória de experiências em buffer circular pré-alocado.
+    Cada transição guarda o estado (x, y), a ação, a recompensa, o próximo
+    estado, a máscara das ações válidas nele, o fim do episódio e o carro que
+    a gerou, para que uma mesma memória possa ser compartilhada pela frota.
+    Quando cheia, as transições mais antigas são sobrescritas.
+    """
+    def __init__(self, capacidade, semente=None):
+        """
+        Args:
+            capacidade (int): Número máximo de transições guardadas
+            semente (int): Semente do gerador usado na amostragem
+        """
+        self.capacidade = capacidade
+        self.estados = np.zeros((capacidade, 2), dtype=np.int32)
+        self.acoes = np.zeros(capacidade, dtype=np.int8)
+        self.recompensas = np.zeros(capacidade, dtype=np.float32)
+        self.proximos_estados = np.zeros((capacidade, 2), dtype=np.int32)
+        self.mascaras = np.zeros((capacidade, len(ACOES)), dtype=bool)
+        self.fins = np.zeros(capacidade, dtype=bool)
+        self.carros = np.zeros(capacidade, dtype=np.int32)
+
+        self.posicao = 0     # Próxima posição a escrever
+        self.quantidade = 0  # Transições válidas
+        self.rng = np.random.default_rng(semente)
+
+    def __len__(self):
+        return self.quantidade
+
+    def adicionar(self, estado, acao, recompensa, proximo_estado, mascara, fim, carro=0):
+        """
+        Guarda uma única transição.
+
+        Args:
+            estado (tuple): Posição (x, y) antes da ação
+            acao (int): Índice da ação em ACOES
+            recompensa (float): Recompensa recebida
+            proximo_estado (tuple): Posição (x, y) após a ação
+            mascara (sequence): Ações válidas no próximo estado, uma flag por ação
+            fim (bool): Se o episódio do carro terminou nesta transição
+            carro (int): Índice do carro que gerou a transição
+        """
+        i = self.posicao
+        self.estados[i] = estado
+        self.acoes[i] = acao
+        self.recompensas[i] = recompensa
+        self.proximos_estados[i] = proximo_estado
+        self.mascaras[i] = mascara
+        self.fins[i] = fim
+        self.carros[i] = carro
+        self.posicao = (i + 1) % self.capacidade
+        self.quantidade = min(self.quantidade + 1, self.capacidade)
+
+    def adicionar_lote(self, estados, acoes, recompensas, proximos_estados, mascaras, fins, carros):
+        """Guarda várias transições de uma vez (mesmos campos de adicionar, como arrays)."""
+        n = len(acoes)
+        if n == 0:
+            return
+        if n > self.capacidade:
+            # Só as últimas transições cabem no buffer
+            corte = slice(n - self.capacidade, n)
+            estados, acoes, recompensas = estados[corte], acoes[corte], recompensas[corte]
+            proximos_estados, mascaras = proximos_estados[corte], mascaras[corte]
+            fins, carros = fins[corte], carros[corte]
+            n = self.capacidade
+
+        indices = (self.posicao + np.arange(n)) % self.capacidade
+        self.estados[indices] = estados
+        self.acoes[indices] = acoes
+        self.recompensas[indices] = recompensas
+        self.proximos_estados[indices] = proximos_estados
+        self.mascaras[indices] = mascaras
+        self.fins[indices] = fins
+        self.carros[indices] = carros
+        self.posicao = int((self.posicao + n) % self.capacidade)
+        self.quantidade = min(self.quantidade + n, self.capacidade)
+
+    def amostrar(self, tamanho):
+        """
+        Sorteia (com reposição) índices de transições guardadas.
+
+        Returns:
+            np.ndarray: Índices do minilote (vazio se a memória estiver vazia)
+        """
+        if self.quantidade == 0:
+            return np.zeros(0, dtype=np.intp)
+        return self.rng.integers(0, self.quantidade, size=tamanho)
+
+def atualizar_minilote(tabela_q, memoria, indices, taxas, gamma, por_carro=False):
+    """
+    Aplica a equação de Bellman a um minilote de transições em uma única
+    operação vetorizada. Transições finais não usam o valor do próximo estado.
+    Se o minilote repetir um mesmo par estado-ação, prevalece a última atualização.
+
+    Args:
+        tabela_q (np.ndarray): Tabela (linhas, colunas, 4) ou, com por_carro,
+            tabelas empilhadas (num_carros, linhas, colunas, 4)
+        memoria (MemoriaReplay): Memória de onde vêm as transições
+        indices (np.ndarray): Índices do minilote (ver MemoriaReplay.amostrar)
+        taxas (float | np.ndarray): Taxa de aprendizagem (uma por carro, com por_carro)
+        gamma (float): Fator de desconto
+        por_carro (bool): Se True, cada transição atualiza a tabela do seu carro
+    """
+    if len(indices) == 0:
+        return
+    carros = memoria.carros[indices]
+    prefixo = (carros,) if por_carro else ()
+    estados = memoria.estados[indices]
+    proximos = memoria.proximos_estados[indices]
+    mascaras = memoria.mascaras[indices]
+
+    # Maior valor Q do próximo estado (0 sem ação válida ou no fim do episódio)
+    valores_proximos = np.where(mascaras, tabela_q[prefixo + (proximos[:, 1], proximos[:, 0])], -np.inf)
+    proximo_max = np.max(valores_proximos, axis=1)
+    proximo_max[~mascaras.any(axis=1) | memoria.fins[indices]] = 0.0
+
+    if por_carro:
+        taxas = np.asarray(taxas)[carros]
+    alvo = prefixo + (estados[:, 1], estados[:, 0], memoria.acoes[indices])
+    q_atual = tabela_q[alvo]
+    tabela_q[alvo] = q_atual + taxas * (memoria.recompensas[indices] + gamma * proximo_max - q_atual)
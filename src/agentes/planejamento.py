@@ -0,0 +1,218 @@
+# src/agentes/planejamento.py
+
+import numpy as np
+from ..util.constantes import PARAMS_APRENDIZAGEM as PA
+from ..util.constantes import ACOES, RECOMPENSAS
+from ..ambiente.ambiente_carro import BITS_MASCARA
+from .memoria_replay import MemoriaReplay
+
+def iteracao_valor(transicoes, mascaras, labirinto, velocidade, sensor,
+                   gamma=None, tolerancia=1e-6, max_iteracoes=10000):
+    """
+    Calcula os valores Q ótimos de um carro por iteração de valor vetorizada
+    sobre todas as células livres do labirinto, usando o modelo esperado da
+    tabela de transições (ver TabelaTransicoes.modelo_esperado).
+
+    O máximo de cada célula considera só as ações válidas, como os agentes.
+    O alcance do plano é limitado pelo fator de desconto, como o do próprio
+    aprendizado: a recompensa da meta cai abaixo da precisão float32 da
+    tabela depois de algumas centenas de passos com gamma = 0.95.
+    A modelagem de recompensa por distância não entra no modelo: ela não muda
+    a política ótima e o aprendizado online corrige a diferença nos valores.
+
+    Args:
+        transicoes (TabelaTransicoes): Tabela de transições do labirinto
+        mascaras (np.ndarray): Máscaras de ações válidas (ver calcular_mascaras_acoes)
+        labirinto (np.ndarray): Matriz do labirinto (1 = parede, 0 = livre)
+        velocidade (float): Gene de velocidade do carro
+        sensor (float): Gene sensor de perigo do carro
+        gamma (float): Fator de desconto (Padrão: PARAMS_APRENDIZAGEM['FATOR_DESCONTO'])
+        tolerancia (float): Para quando nenhum valor muda mais que isso em uma varredura
+        max_iteracoes (int): Limite de varreduras
+
+    Returns:
+        np.ndarray: Tabela Q float32 de formato (linhas, colunas, 4), zero nas paredes
+    """
+    if gamma is None:
+        gamma = PA['FATOR_DESCONTO']
+    destinos, recompensas, continuacoes = transicoes.modelo_esperado(velocidade, sensor)
+
+    # Só as células livres são estados; os destinos delas são sempre células livres
+    livres = np.flatnonzero(labirinto.ravel() == 0)
+    compacto = np.full(labirinto.size, -1, dtype=np.int64)
+    compacto[livres] = np.arange(livres.size)
+    destinos = compacto[destinos[livres]]
+    descontos = gamma * continuacoes[livres]
+    validas = BITS_MASCARA[mascaras.ravel()[livres]]
+    sem_acoes = ~validas.any(axis=1)
+
+    # Ações inválidas nunca vencem o máximo
+    recompensas_validas = np.where(validas, recompensas[livres], -np.inf)
+    descontos_validos = np.where(validas, descontos, 0.0)
+
+    # Começa do valor de andar sem nunca chegar: assim a variação de cada
+    # varredura é só a frente de onda que parte da meta, e a tolerância
+    # não encerra a iteração antes de ela chegar às células distantes
+    valores = np.full(livres.size, valor_sem_meta(gamma))
+    for _ in range(max_iteracoes):
+        novos = (recompensas_validas + descontos_validos * valores[destinos]).max(axis=1)
+        novos[sem_acoes] = 0.0
+        variacao = np.abs(novos - valores).max(initial=0.0)
+        valores = novos
+        if variacao < tolerancia:
+            break
+
+    tabela = np.zeros((labirinto.size, len(ACOES)), dtype=np.float32)
+    tabela[livres] = recompensas[livres] + descontos * valores[destinos]
+    return tabela.reshape(labirinto.shape + (len(ACOES),))
+
+def valor_sem_meta(gamma=None):
+    """
+    Valor de andar para sempre sem chegar à meta (a soma descontada de PASSO).
+    Sem gamma, usa o PARAMS_APRENDIZAGEM['FATOR_DESCONTO'] atual.
+    """
+    if gamma is None:
+        gamma = PA['FATOR_DESCONTO']
+    return RECOMPENSAS['PASSO'] / (1 - gamma)
+
+def _chave_genes(genes):
+    """
+    Agrupa genes com o mesmo modelo de transição: da velocidade só importa
+    se o carro anda sempre, só de coordenadas ímpares ou nunca.
+    """
+    passo = genes.velocidade * 0.1
+    return (passo > 0.5, passo == 0.5, genes.sensor_perigo)
+
+def tabelas_planejadas(ambiente, tolerancia=1e-6):
+    """
+    Calcula a tabela Q planejada de cada carro do ambiente, de acordo com
+    seus genes. Carros com o mesmo modelo de transição compartilham o cálculo.
+
+    Returns:
+        list: Uma tabela (linhas, colunas, 4) por carro (tabelas iguais são o mesmo objeto)
+    """
+    calculadas = {}
+    tabelas = []
+    for carro in ambiente.carros_geneticos:
+        chave = _chave_genes(carro.genes)
+        if chave not in calculadas:
+            calculadas[chave] = iteracao_valor(
+                ambiente.transicoes, ambiente.mascaras_acoes, ambiente.labirinto,
+                carro.genes.velocidade, carro.genes.sensor_perigo,
+                ambiente.gamma, tolerancia)
+        tabelas.append(calculadas[chave])
+    return tabelas
+
+def aquecer_agentes(ambiente, agentes, epsilon=None, tolerancia=1e-6):
+    """
+    Inicializa as tabelas Q com os valores planejados para o labirinto atual,
+    para que os carros comecem o treino já sabendo o caminho até a meta.
+    Carros cujo plano enxerga a meta a partir da posição inicial já partem da
+    política ótima do modelo, então sua exploração começa em epsilon; nos
+    demais (meta além do alcance do desconto, ou carro lento demais para
+    andar) a exploração continua a mesma.
+
+    Args:
+        ambiente (AmbienteCarro): Ambiente com o labirinto e os genes dos carros
+        agentes: Lista de AgenteQLearning/AgenteQLearningDenso ou um AprendizFrota
+        epsilon (float): Taxa de exploração após o aquecimento
+            (Padrão: PARAMS_APRENDIZAGEM['EPSILON_MINIMO'])
+        tolerancia (float): Tolerância da iteração de valor
+    """
+    if epsilon is None:
+        epsilon = PA['EPSILON_MINIMO']
+    tabelas = tabelas_planejadas(ambiente, tolerancia)
+    limite = valor_sem_meta(ambiente.gamma) + tolerancia
+    enxergam = np.array([tabela[1, 1].max() > limite for tabela in tabelas])
+    if hasattr(agentes, 'tabelas_q'):
+        agentes.tabelas_q[...] = np.stack(tabelas)
+        agentes.epsilons[enxergam] = np.minimum(agentes.epsilons[enxergam], epsilon)
+        return
+
+    for agente, tabela, enxerga in zip(agentes, tabelas, enxergam):
+        if isinstance(agente.tabela_q, np.ndarray):
+            agente.tabela_q[...] = tabela
+        else:
+            # Tabela com dicionários: só as ações válidas das células livres
+            agente.tabela_q.clear()
+            ys, xs = np.nonzero(ambiente.labirinto == 0)
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                valores = tabela[y, x].tolist()
+                linha = agente.tabela_q[(x, y)]
+                for i, valida in enumerate(BITS_MASCARA[ambiente.mascaras_acoes[y, x]]):
+                    if valida:
+                        linha[ACOES[i]] = valores[i]
+        if enxerga:
+            agente.epsilon = min(agente.epsilon, epsilon)
+
+class ModeloDyna(MemoriaReplay):
+    """
+    Modelo aprendido do ambiente para o planejamento Dyna-Q: guarda o último
+    resultado observado de cada par (carro, estado, ação), nos mesmos campos
+    da MemoriaReplay. Planejar é reaprender um minilote sorteado entre os pares
+    já visitados com atualizar_minilote, como no replay de experiências.
+    A capacidade cresce conforme novos pares são visitados.
+    """
+    def __init__(self, capacidade_inicial=1024, semente=None):
+        """
+        Args:
+            capacidade_inicial (int): Pares reservados no início
+            semente (int): Semente do gerador usado na amostragem
+        """
+        super().__init__(capacidade_inicial, semente)
+        self._indices = {}
+
+    def limpar(self):
+        """Esquece o modelo (usado quando o labirinto muda)."""
+        self._indices.clear()
+        self.posicao = 0
+        self.quantidade = 0
+
+    def _crescer(self):
+        """Dobra a capacidade preservando os pares guardados."""
+        self.capacidade *= 2
+        for campo in ('estados', 'acoes', 'recompensas', 'proximos_estados',
+                      'mascaras', 'fins', 'carros'):
+            antigo = getattr(self, campo)
+            novo = np.zeros((self.capacidade,) + antigo.shape[1:], dtype=antigo.dtype)
+            novo[:len(antigo)] = antigo
+            setattr(self, campo, novo)
+
+    def _indice(self, carro, estado, acao):
+        """Posição do par no modelo, reservando uma nova se ainda não foi visto."""
+        chave = (carro, estado[0], estado[1], acao)
+        indice = self._indices.get(chave)
+        if indice is None:
+            if self.quantidade == self.capacidade:
+                self._crescer()
+            indice = self._indices[chave] = self.quantidade
+            self.quantidade += 1
+        return indice
+
+    def adicionar(self, estado, acao, recompensa, proximo_estado, mascara, fim, carro=0):
+        """Atualiza o resultado observado do par (carro, estado, ação)."""
+        i = self._indice(int(carro), estado, int(acao))
+        self.estados[i] = estado
+        self.acoes[i] = acao
+        self.recompensas[i] = recompensa
+        self.proximos_estados[i] = proximo_estado
+        self.mascaras[i] = mascara
+        self.fins[i] = fim
+        self.carros[i] = carro
+        self.posicao = self.quantidade
+
+    def adicionar_lote(self, estados, acoes, recompensas, proximos_estados, mascaras, fins, carros):
+        """Atualiza vários pares de uma vez (mesmos campos de adicionar, como arrays)."""
+        indices = np.array([self._indice(c, e, a) for c, e, a in
+                            zip(np.asarray(carros).tolist(), np.asarray(estados).tolist(),
+                                np.asarray(acoes).tolist())], dtype=np.intp)
+        if indices.size == 0:
+            return
+        self.estados[indices] = estados
+        self.acoes[indices] = acoes
+        self.recompensas[indices] = recompensas
+        self.proximos_estados[indices] = proximos_estados
+        self.mascaras[indices] = mascaras
+        self.fins[indices] = fins
+        self.carros[indices] = carros
+        self.posicao = self.quantidade
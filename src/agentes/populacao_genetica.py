@@ -0,0 +1,175 @@
+# src/agentes/populacao_genetica.py
+
+import numpy as np
+from ..util.constantes import PARAMS_GENETICOS as PG
+from .carro_genetico import Genes
+
+# Penalidade de quem não chegou à meta, maior que qualquer tempo de chegada
+PENALIDADE_SEM_CHEGADA = 1e9
+
+class PopulacaoGenetica:
+    """
+    População genética em estrutura de arrays (structure-of-arrays).
+    Genes, fitness, chegada à meta e tempo de chegada de todos os indivíduos
+    ficam em arrays NumPy, e seleção, cruzamento e mutação são vetorizados,
+    permitindo populações com milhares de indivíduos.
+
+    A coluna 0 de genes é a velocidade e a coluna 1 é o sensor de perigo.
+    """
+    SELECOES = ('dois_melhores', 'torneio', 'rank')
+
+    def __init__(self, tamanho, semente=None):
+        """
+        Args:
+            tamanho (int): Número de indivíduos
+            semente (int): Semente do gerador aleatório da população
+        """
+        self.rng = np.random.default_rng(semente)
+        self.minimos = np.array([PG['VELOCIDADE_MIN'], PG['SENSOR_MIN']])
+        self.maximos = np.array([PG['VELOCIDADE_MAX'], PG['SENSOR_MAX']])
+
+        # Nascimento com valores uniformes dentro dos limites, como em CarroGenetico
+        self.genes = self.rng.uniform(self.minimos, self.maximos, size=(tamanho, 2))
+        self.fitness = np.zeros(tamanho)
+        self.chegou_meta = np.zeros(tamanho, dtype=bool)
+        self.tempo_chegada = np.full(tamanho, np.inf)
+        self.melhor_distancia = np.full(tamanho, np.inf)
+
+    @property
+    def tamanho(self):
+        return len(self.genes)
+
+    @classmethod
+    def de_carros(cls, carros_geneticos, semente=None):
+        """
+        Cria a população a partir de uma lista de CarroGenetico.
+
+        Args:
+            carros_geneticos (list): Carros cujos genes e resultados serão copiados
+            semente (int): Semente do gerador aleatório da população
+        """
+        populacao = cls(len(carros_geneticos), semente)
+        for i, carro in enumerate(carros_geneticos):
+            populacao.genes[i] = (carro.genes.velocidade, carro.genes.sensor_perigo)
+            populacao.chegou_meta[i] = carro.chegou_meta
+            populacao.tempo_chegada[i] = carro.tempo_chegada
+            populacao.melhor_distancia[i] = carro.melhor_distancia
+        populacao.calcular_fitness()
+        return populacao
+
+    def obter_genes(self, indice):
+        """Retorna os genes de um indivíduo como o dataclass Genes."""
+        velocidade, sensor = self.genes[indice]
+        return Genes(velocidade=float(velocidade), sensor_perigo=float(sensor))
+
+    def aplicar_em_carros(self, carros_geneticos):
+        """Copia os genes dos primeiros indivíduos para os carros genéticos."""
+        for i, carro in enumerate(carros_geneticos):
+            carro.genes = self.obter_genes(i)
+
+    def calcular_fitness(self):
+        """
+        Calcula o fitness de cada indivíduo (maior é melhor).
+        Quem chegou à meta vale -tempo_chegada; quem não chegou fica abaixo de
+        todos os que chegaram, ordenado pela melhor distância até a meta
+        (-inf se a distância for desconhecida).
+
+        Returns:
+            np.ndarray: Fitness de cada indivíduo
+        """
+        self.fitness = np.where(self.chegou_meta, -self.tempo_chegada,
+                                -(PENALIDADE_SEM_CHEGADA + self.melhor_distancia))
+        return self.fitness
+
+    def selecao_dois_melhores(self, quantidade):
+        """
+        Seleção usada em main(): todos os filhos vêm dos dois melhores indivíduos.
+
+        Returns:
+            tuple: (pais1, pais2) com índices dos pais de cada filho
+        """
+        melhor, segundo = np.argsort(-self.fitness, kind='stable')[:2]
+        return np.full(quantidade, melhor), np.full(quantidade, segundo)
+
+    def selecao_torneio(self, quantidade, tamanho_torneio=3):
+        """
+        Seleção por torneio: cada pai é o melhor de tamanho_torneio indivíduos sorteados.
+
+        Returns:
+            tuple: (pais1, pais2) com índices dos pais de cada filho
+        """
+        candidatos = self.rng.integers(0, self.tamanho, size=(2 * quantidade, tamanho_torneio))
+        vencedores = candidatos[np.arange(2 * quantidade),
+                                np.argmax(self.fitness[candidatos], axis=1)]
+        return vencedores[:quantidade], vencedores[quantidade:]
+
+    def selecao_rank(self, quantidade):
+        """
+        Seleção por rank: a chance de ser pai é proporcional à posição no ranking.
+
+        Returns:
+            tuple: (pais1, pais2) com índices dos pais de cada filho
+        """
+        # Pesos acumulados na ordem do ranking (pior = 1, melhor = tamanho)
+        ordem = np.argsort(self.fitness, kind='stable')
+        acumulado = np.cumsum(np.arange(1, self.tamanho + 1))
+        sorteio = self.rng.random(2 * quantidade) * acumulado[-1]
+        pais = ordem[np.searchsorted(acumulado, sorteio, side='right')]
+        return pais[:quantidade], pais[quantidade:]
+
+    def cruzamento(self, pais1, pais2):
+        """
+        Cruzamento com média dos genes dos pais, como em CarroGenetico.mutacao.
+
+        Returns:
+            np.ndarray: Genes dos filhos, formato (len(pais1), 2)
+        """
+        return (self.genes[pais1] + self.genes[pais2]) / 2
+
+    def mutacao(self, genes):
+        """
+        Aplica a mutação de CarroGenetico.mutacao a todos os genes de uma vez:
+        cada gene é multiplicado por um fator entre 0.8 e 1.5 com chance
+        TAXA_MUTACAO e depois limitado aos valores de PARAMS_GENETICOS.
+
+        Returns:
+            np.ndarray: Genes mutados
+        """
+        mutar = self.rng.random(genes.shape) < PG['TAXA_MUTACAO']
+        fatores = self.rng.uniform(0.8, 1.5, size=genes.shape)
+        genes = np.where(mutar, genes * fatores, genes)
+        return np.clip(genes, self.minimos, self.maximos)
+
+    def nova_geracao(self, selecao='torneio', elite=2):
+        """
+        Substitui a população pela próxima geração.
+        Os elite melhores indivíduos são mantidos; o restante nasce de
+        seleção, cruzamento e mutação. Resultados da geração são zerados.
+
+        Args:
+            selecao (str): 'dois_melhores', 'torneio' ou 'rank'
+            elite (int): Quantos melhores indivíduos passam sem alteração
+
+        Returns:
+            np.ndarray: Índices (na geração anterior) dos indivíduos da elite
+
+        Raises:
+            ValueError: Se a seleção for desconhecida ou elite estiver fora de 0..tamanho
+        """
+        if selecao not in self.SELECOES:
+            raise ValueError(f"Seleção desconhecida: {selecao}")
+        if not 0 <= elite <= self.tamanho:
+            raise ValueError(f"A elite deve estar entre 0 e {self.tamanho}: {elite}")
+
+        indices_elite = np.argsort(-self.fitness, kind='stable')[:elite]
+        quantidade = self.tamanho - elite
+
+        pais1, pais2 = getattr(self, f'selecao_{selecao}')(quantidade)
+        filhos = self.mutacao(self.cruzamento(pais1, pais2))
+        self.genes = np.concatenate([self.genes[indices_elite], filhos])
+
+        self.fitness = np.zeros(self.tamanho)
+        self.chegou_meta = np.zeros(self.tamanho, dtype=bool)
+        self.tempo_chegada = np.full(self.tamanho, np.inf)
+        self.melhor_distancia = np.full(self.tamanho, np.inf)
+        return indices_elite
@@ -1,30 +1,85 @@
 # src/ambiente/ambiente_carro.py
 
-import pygame
 import numpy as np
-import random
-from ..util.constantes import CORES, TAMANHO_JANELA, TAMANHO_GRID, FPS
+from ..util.constantes import CORES, TAMANHO_JANELA, TAMANHO_GRID, ACOES, DESLOCAMENTOS, INDICE_ACAO
+from ..util.constantes import PARAMS_APRENDIZAGEM as PA
 from ..agentes.carro_genetico import CarroGenetico
+from .gerador_labirinto import gerar_labirinto
+from .campo_distancias import calcular_campo_distancias, INALCANCAVEL
+from .transicoes import TabelaTransicoes, LIMITE_CELULAS_LISTAS
+from ..util.aleatorio import gerador_ou_padrao
+from ..util.registro import registros_geracao, formatar_registros
+
+# Tabelas indexadas pela máscara de 4 bits das ações válidas de uma célula
+# (bit i ligado = ACOES[i] válida): nomes das ações e máscara booleana
+ACOES_POR_MASCARA = tuple(
+    tuple(acao for i, acao in enumerate(ACOES) if mascara >> i & 1)
+    for mascara in range(1 << len(ACOES))
+)
+BITS_MASCARA = np.array(
+    [[bool(mascara >> i & 1) for i in range(len(ACOES))] for mascara in range(1 << len(ACOES))],
+    dtype=bool
+)
 
 class AmbienteCarro:
-    def __init__(self, num_carros=5):
+    def __init__(self, num_carros=5, headless=False, tamanho_grid=TAMANHO_GRID,
+                 dimensoes=None, gerador=None, semente_labirinto=None, taxa_ciclos=0.05,
+                 fator_modelagem=None, aleatorio=None, aleatorios_carros=None):
         """
         Inicializa o ambiente de simulação dos carros autônomos.
         Este ambiente cria um labirinto onde os carros devem aprender a navegar.
         
         Args:
             num_carros (int): Número de carros que participarão da simulação (Padrão: 5)
+            headless (bool): Se True, não cria janela nem inicializa o Pygame,
+                permitindo treinar em servidores sem display (Padrão: False)
+            tamanho_grid (int): Tamanho em pixels de cada célula; valores menores
+                geram grids com mais células na mesma janela. O labirinto fixo
+                precisa de ao menos o grid padrão, então valores acima de
+                TAMANHO_GRID exigem um gerador (Padrão: TAMANHO_GRID)
+            dimensoes (tuple): (linhas, colunas) do grid, independente da janela;
+                o tamanho da célula é reduzido para caber na tela (Padrão: None)
+            gerador (str): Algoritmo do labirinto procedural ('backtracker' ou
+                'sidewinder'); None usa o labirinto fixo, ou 'backtracker'
+                quando dimensoes é informado (Padrão: None)
+            semente_labirinto (int): Semente do labirinto procedural (Padrão: None)
+            taxa_ciclos (float): Fração de paredes removidas no labirinto
+                procedural para criar caminhos alternativos (Padrão: 0.05)
+            fator_modelagem (float): Peso da modelagem de recompensa baseada no
+                potencial -distância até a meta (Padrão: PA['FATOR_MODELAGEM'])
+            aleatorio (random.Random): Gerador usado no sorteio das armadilhas, dos
+                genes iniciais e do sensor de perigo, com a interface de
+                random.Random (ex.: FluxoAleatorio); None usa o módulo random
+            aleatorios_carros (list): Um gerador por carro para o sensor de perigo,
+                para que cada carro tenha sua própria sequência (None = aleatorio)
+
+        Raises:
+            ValueError: Se tamanho_grid passar de TAMANHO_GRID com o labirinto fixo
         """
-        # Inicialização do Pygame e configuração da janela
-        pygame.init()
-        self.tela = pygame.display.set_mode(TAMANHO_JANELA)
-        pygame.display.set_caption("Carros Autônomos - Versão Genética")
+        if dimensoes is None and gerador is None and tamanho_grid > TAMANHO_GRID:
+            raise ValueError(f"O labirinto fixo exige tamanho_grid <= {TAMANHO_GRID}: "
+                             f"{tamanho_grid} (use um gerador ou dimensoes)")
+        self.headless = headless
+        # Geradores guardados como informados (None = módulo random, resolvido no uso)
+        self.aleatorio = aleatorio
+        self.aleatorios_carros = aleatorios_carros
         
         # Configurações do ambiente
         self.LARGURA, self.ALTURA = TAMANHO_JANELA
-        self.GRID = TAMANHO_GRID
-        self.COLUNAS = self.LARGURA // self.GRID
-        self.LINHAS = self.ALTURA // self.GRID
+        if dimensoes is None:
+            self.GRID = tamanho_grid
+            self.COLUNAS = self.LARGURA // self.GRID
+            self.LINHAS = self.ALTURA // self.GRID
+        else:
+            self.LINHAS, self.COLUNAS = dimensoes
+            self.GRID = max(1, min(tamanho_grid, self.LARGURA // self.COLUNAS,
+                                   self.ALTURA // self.LINHAS))
+            gerador = gerador or 'backtracker'
+        
+        # Parâmetros do labirinto procedural
+        self.gerador = gerador
+        self.semente_labirinto = semente_labirinto
+        self.taxa_ciclos = taxa_ciclos
         
         # Define o tamanho dos elementos em relação ao grid
         self.TAMANHO_CARRO = int(self.GRID * 1.0)    # Carro ocupa 100% da célula
@@ -36,59 +91,79 @@ class AmbienteCarro:
         
         # Cria o labirinto e inicializa os carros
         self.labirinto = self.criar_labirinto()
+        self.calcular_mascaras_acoes()
         self.num_carros = num_carros
         self.carros = []
-        self.carros_geneticos = [CarroGenetico(i) for i in range(num_carros)]
-        self.armadilhas = self.criar_armadilhas(3)
-        
-        
-        
+        self.carros_geneticos = [CarroGenetico(i, self.aleatorio) for i in range(num_carros)]
+        self.num_armadilhas = 3
+        self.armadilhas = self.criar_armadilhas(self.num_armadilhas)
+        self.calcular_distancias()
+        self.calcular_transicoes()
+        self.fator_modelagem = PA['FATOR_MODELAGEM'] if fator_modelagem is None else fator_modelagem
+        self.gamma = PA['FATOR_DESCONTO']
         
         # Inicializa cada carro com suas propriedades
         for i in range(num_carros):
             self.carros.append({
                 'posicao': (1, 1),  # Posição inicial no canto superior esquerdo
-                'cor': CORES['CARROS'][i],
+                'cor': CORES['CARROS'][i % len(CORES['CARROS'])],
                 'passos': 0,
                 'melhor_episodio': float('inf'),
                 'velocidade_atual': self.carros_geneticos[i].genes.velocidade
             })
+            self.carros_geneticos[i].melhor_distancia = self.distancia((1, 1))
         
         
         
         # Inicializa contadores e estados
         self.episodio = 0
         self.pausado = False
+        
+        # Janela e desenho (apenas no modo gráfico). O renderizador é importado
+        # aqui para que o núcleo da simulação nunca carregue o Pygame
+        self.renderizador = None
+        self.tela = None
+        if not headless:
+            from ..interface.renderizador import Renderizador
+            self.renderizador = Renderizador(self)
+            self.tela = self.renderizador.tela
     
     def criar_armadilhas(self, num_armadilhas):
         """
-        Cria armadilhas em posições aleatórias válidas no labirinto
+        Cria armadilhas em posições aleatórias válidas no labirinto.
+        As posições são sorteadas diretamente do índice de células livres,
+        sem tentativas rejeitadas em paredes, mesmo em labirintos grandes.
+
+        Células de um caminho mínimo entre a posição inicial e a meta nunca
+        recebem armadilhas: labirintos procedurais têm poucos ciclos e uma
+        armadilha no único corredor deixaria a meta sem caminho seguro. Em
+        labirintos pequenos pode haver menos células permitidas que armadilhas.
+
         Args:
             num_armadilhas (int): Quantidade de armadilhas a serem criadas
             
         Returns:
             list: Lista de tuplas (x, y) com as posições das armadilhas
         """
+        livre = self.labirinto == 0
+        permitidas = livre.copy()
+        permitidas[1, 1] = False
+        permitidas[self.pos_meta[1], self.pos_meta[0]] = False
+
+        # Uma célula está em algum caminho mínimo quando a soma das suas
+        # distâncias à posição inicial e à meta é o comprimento do caminho
+        ate_meta = calcular_campo_distancias(livre, self.pos_meta)
+        comprimento = int(ate_meta[1, 1])
+        if comprimento != INALCANCAVEL:
+            ate_inicio = calcular_campo_distancias(livre, (1, 1))
+            permitidas &= ate_meta + ate_inicio != comprimento
+
+        candidatas = np.flatnonzero(permitidas.ravel())
+        quantidade = min(len(candidatas), num_armadilhas)
         armadilhas = []
-        
-        # Mantém registro de posições que não podem ter armadilhas
-        
-        posicoes_ocupadas = {(1, 1), self.pos_meta}
-        
-        while len(armadilhas) < num_armadilhas:
-            
-            # Gera posição aleatória
-            
-            x = random.randint(1, self.COLUNAS-2)
-            y = random.randint(1, self.LINHAS-2)
-            
-            # Verifica validade da posição
-            
-            if ((x, y) not in posicoes_ocupadas and
-                self.labirinto[y, x] == 0): # 0 = caminho livre
-                armadilhas.append((x, y))
-                posicoes_ocupadas.add((x, y))
-            
+        for indice in gerador_ou_padrao(self.aleatorio).sample(range(len(candidatas)), quantidade):
+            y, x = divmod(int(candidatas[indice]), self.COLUNAS)
+            armadilhas.append((x, y))
         return armadilhas
     
     def verificar_colisao_armadilha(self, posicao):
@@ -103,67 +178,17 @@ class AmbienteCarro:
         """
         return posicao in self.armadilhas 
     
-    def executar_acao(self, indice_carro, acao):
-        """
-        Executa uma ação para um carro específico e retorna o resultado.
-        Agora considera os genes de velocidade e sensor de perigo.
-        
-        Returns:
-            tuple: (novo_estado, recompensa, terminado)
-        """
-        carro = self.carros[indice_carro]
-        carro_genetico = self.carros_geneticos[indice_carro]
-        x, y = carro['posicao']
-        
-        # Aplica a velocidade genética ao movimento
-        
-        velocidade = carro_genetico.genes.velocidade * 0.1
-        carro['passos'] += 1
-        
-        # Calcula nova posição baseado na ação e velocidade
-        
-        novo_x, novo_y = x, y
-        if acao == 'cima':
-            novo_y = y - velocidade
-        elif acao == 'direita':
-            novo_x = x + velocidade
-        elif acao == 'baixo':
-            novo_y = y + velocidade
-        elif acao == 'esquerda':
-            novo_x = x - velocidade
-        
-        # Arredonda para a posição do grid mais próxima
-        novo_x = round(novo_x)
-        novo_y = round(novo_y)
-        
-        # Verifica colisões com paredes
-        if self.labirinto[novo_y, novo_x] == 1:
-            return (x, y), -10, True
-        
-        # Verifica colisões com armadilhas
-        if self.verificar_colisao_armadilha((novo_x, novo_y)):
-            # Usa o sensor de perigo para tentar evitar a armadilha
-            if random.random() < carro_genetico.genes.sensor_perigo/3.0:
-                return (x, y), -5, False  # Evitou a armadilha
-            return (x, y), -20, True  # Não evitou a armadilha
-        
-        # Atualiza posição do carro
-        carro['posicao'] = (novo_x, novo_y)
-        
-        # Verifica se chegou na meta
-        if (novo_x, novo_y) == self.pos_meta:
-            if not carro_genetico.chegou_meta:
-                carro_genetico.chegou_meta = True
-                carro_genetico.tempo_chegada = carro['passos']
-            return (novo_x, novo_y), 100, True
-        return (novo_x, novo_y), -0.1, False
-            
     def criar_labirinto(self):
         """
         Cria o layout do labirinto com paredes e obstáculos.
-        O labirinto é representado por uma matriz onde 1 representa parede e 0 representa caminho livre.
+        O labirinto é representado por uma matriz uint8 onde 1 representa parede e 0 representa caminho livre.
+        Com um gerador configurado, o labirinto é procedural (ver gerador_labirinto).
         """
-        labirinto = np.zeros((self.LINHAS, self.COLUNAS))
+        if self.gerador is not None:
+            return gerar_labirinto(self.LINHAS, self.COLUNAS, self.semente_labirinto,
+                                   self.gerador, self.taxa_ciclos)
+
+        labirinto = np.zeros((self.LINHAS, self.COLUNAS), dtype=np.uint8)
         
         # Cria as paredes externas
         labirinto[0, :] = 1  # Parede superior
@@ -183,48 +208,169 @@ class AmbienteCarro:
         
         return labirinto
 
+    def calcular_mascaras_acoes(self):
+        """
+        Pré-calcula a máscara de ações válidas de cada célula do labirinto.
+        Como o labirinto é estático, isso é feito uma vez na construção e
+        refeito apenas quando as paredes mudam (ver atualizar_labirinto).
+
+        Returns:
+            np.ndarray: Máscaras uint8 de formato (LINHAS, COLUNAS), com o bit i
+                ligado quando ACOES[i] não leva a uma parede nem para fora do grid
+        """
+        livre = np.pad(self.labirinto == 0, 1, constant_values=False)
+        mascaras = np.zeros(self.labirinto.shape, dtype=np.uint8)
+        for i, (dx, dy) in enumerate(DESLOCAMENTOS):
+            vizinho_livre = livre[1 + dy:1 + dy + self.LINHAS, 1 + dx:1 + dx + self.COLUNAS]
+            mascaras |= vizinho_livre.astype(np.uint8) << i
+
+        self.mascaras_acoes = mascaras
+        # Versão em listas para consultas O(1) sem overhead de escalares NumPy;
+        # em grids grandes as consultas leem o array compacto
+        self._acoes_por_celula = None
+        if mascaras.size <= LIMITE_CELULAS_LISTAS:
+            self._acoes_por_celula = [[ACOES_POR_MASCARA[m] for m in linha]
+                                      for linha in mascaras.tolist()]
+        return mascaras
+
+    def calcular_distancias(self):
+        """
+        Calcula, por busca em largura a partir da meta, o menor número de passos
+        de cada célula até a meta desviando de paredes e armadilhas.
+        Deve ser refeito sempre que o labirinto ou as armadilhas mudarem.
+
+        A posição inicial sempre tem caminho seguro (ver criar_armadilhas);
+        células que só alcançam a meta passando por uma armadilha recebem a
+        distância ignorando as armadilhas, para que todo carro tenha um valor.
+
+        Returns:
+            np.ndarray: Distâncias int32 (LINHAS, COLUNAS), INALCANCAVEL nas paredes
+        """
+        livre = self.labirinto == 0
+        seguro = livre.copy()
+        for x, y in self.armadilhas:
+            seguro[y, x] = False
+
+        distancias = calcular_campo_distancias(seguro, self.pos_meta)
+        sem_caminho = seguro & (distancias == INALCANCAVEL)
+        if sem_caminho.any():
+            alternativas = calcular_campo_distancias(livre, self.pos_meta)
+            distancias[sem_caminho] = alternativas[sem_caminho]
+
+        self.distancias = distancias
+        self.distancia_maxima = max(int(distancias.max()), 1)
+        # Versão em listas para consultas O(1) a cada passo (só em grids pequenos)
+        self._distancias_por_celula = (distancias.tolist() if distancias.size <= LIMITE_CELULAS_LISTAS
+                                       else None)
+        return distancias
+
+    def calcular_transicoes(self):
+        """
+        Monta a tabela de transições (célula, ação) usada por executar_acao e
+        pela FrotaVetorizada. Deve ser refeita sempre que o labirinto, as
+        armadilhas ou a meta mudarem.
+
+        Returns:
+            TabelaTransicoes: A nova tabela
+        """
+        self.transicoes = TabelaTransicoes(self.labirinto, self.armadilhas, self.pos_meta)
+        return self.transicoes
+
+    def distancia(self, posicao):
+        """
+        Retorna a distância em passos de uma posição (x, y) até a meta
+        (infinito se não houver caminho).
+        """
+        x, y = posicao
+        if self._distancias_por_celula is not None:
+            distancia = self._distancias_por_celula[y][x]
+        else:
+            distancia = int(self.distancias[y, x])
+        return distancia if distancia != INALCANCAVEL else float('inf')
+
+    def modelagem_recompensa(self, origem, destino):
+        """
+        Termo de modelagem baseado em potencial, F = gamma * P(destino) - P(origem),
+        com P(s) = -fator_modelagem * distância(s) / distancia_maxima. Não altera
+        a política ótima e recompensa cada passo que aproxima o carro da meta;
+        a normalização mantém o termo na mesma escala em qualquer tamanho de labirinto.
+        Células sem caminho até a meta valem distancia_maxima, pois a distância
+        infinita daria inf - inf = nan.
+        """
+        distancia_origem = min(self.distancia(origem), self.distancia_maxima)
+        distancia_destino = min(self.distancia(destino), self.distancia_maxima)
+        return self.fator_modelagem * (distancia_origem - self.gamma * distancia_destino) \
+            / self.distancia_maxima
+
+    def atualizar_labirinto(self, labirinto):
+        """
+        Substitui o labirinto e recalcula as máscaras de ações válidas,
+        o campo de distâncias até a meta e a tabela de transições.
+        Armadilhas e meta devem ser alteradas antes desta chamada.
+
+        Args:
+            labirinto (np.ndarray): Nova matriz do labirinto (1 = parede, 0 = livre)
+        """
+        self.labirinto = labirinto
+        self.calcular_mascaras_acoes()
+        self.calcular_distancias()
+        self.calcular_transicoes()
+        self.invalidar_renderizacao(fundo=True)
+
+    def novo_labirinto(self, semente=None):
+        """
+        Gera um novo labirinto procedural com as mesmas dimensões e sorteia
+        novas armadilhas, por exemplo a cada geração.
+
+        Args:
+            semente (int): Semente do novo labirinto (None = aleatória)
+
+        Returns:
+            np.ndarray: O novo labirinto
+        """
+        self.semente_labirinto = semente
+        self.labirinto = gerar_labirinto(self.LINHAS, self.COLUNAS, semente,
+                                         self.gerador or 'backtracker', self.taxa_ciclos)
+        self.calcular_mascaras_acoes()
+        self.armadilhas = self.criar_armadilhas(self.num_armadilhas)
+        self.calcular_distancias()
+        self.calcular_transicoes()
+        self.invalidar_renderizacao(fundo=True)
+        return self.labirinto
+
     def reset_todos(self):
         """
         Reinicia todos os carros para a posição inicial.
         Usado no início de cada episódio de treinamento.
+        Também zera a chegada à meta e a melhor distância dos carros genéticos,
+        que medem apenas o episódio atual.
         """
-        for carro in self.carros:
+        distancia_inicial = self.distancia((1, 1))
+        for carro, carro_genetico in zip(self.carros, self.carros_geneticos):
             carro['posicao'] = (1, 1)  # Volta para posição inicial
             carro['passos'] = 0        # Zera contador de passos
+            carro_genetico.chegou_meta = False
+            carro_genetico.tempo_chegada = float('inf')
+            carro_genetico.melhor_distancia = distancia_inicial
         
         return [self.obter_estado(i) for i in range(self.num_carros)]
-    def registrar_geracao(self):
+
+    def registrar_geracao(self, registro=None, vencedores=None, novos_genes=None):
         """
-    Registra informações sobre a geração atual, incluindo:
-    - Atributos de todos os carros
-    - Carros que chegaram à meta
-    - Tempo/passos de cada carro
+        Registra informações sobre a geração atual: genes, passos e chegada de
+        cada carro e, havendo evolução, os vencedores e os novos genes.
+        Deve ser chamado antes de os novos genes serem aplicados.
+
+        Args:
+            registro (RegistroMetricas): Registro que recebe a geração; sem
+                registro, o texto detalhado é impresso de uma vez no console
+            vencedores (list): Carros genéticos escolhidos como pais
+            novos_genes (Genes): Genes da próxima geração
         """
-        print(f"\n{'='*50}")
-        print(f"Geração {self.episodio}")
-        print(f"{'='*50}")
-        
-        # Imprime informações de todos os carros
-        print("\nCarros da geração:")
-        for i, (carro, carro_genetico) in enumerate(zip(self.carros, self.carros_geneticos)):
-            print(f"\nCarro {i+1}:")
-            print(f" Velocidade: {carro_genetico.genes.velocidade:.2f}")
-            print(f" Sensor: {carro_genetico.genes.velocidade:.2f}")
-            print(f" Passos: {carro['passos']}")
-            print(f" Chegou à meta: {'Sim' if carro_genetico.chegou_meta else 'Não'}")
-            if carro_genetico.chegou_meta:
-                print(f" Tempo até meta: {carro_genetico.tempo_chegada}")
-                
-                
-        # Identifica os vencedores (carros que chegaram à meta)
-        vencedores = [carro for carro in self.carros_geneticos if carro.chegou_meta]
-        if len(vencedores) >= 2:
-            print("\nVencedores que gerarão a próxima geração:")
-            for i, v in enumerate(sorted(vencedores, key=lambda x: x.tempo_chegada)[:2]):
-                print(f"\nVencedor {i+1}:")
-                print(f"  Velocidade: {v.genes.velocidade:.2f}")
-                print(f"  Sensor: {v.genes.sensor_perigo:.2f}")
-                print(f"  Tempo até meta: {v.tempo_chegada}")
+        if registro is not None:
+            registro.geracao(self, vencedores, novos_genes)
+        else:
+            print(formatar_registros(registros_geracao(self, vencedores, novos_genes)))
 
     def obter_estado(self, indice_carro):
         """
@@ -235,139 +381,69 @@ class AmbienteCarro:
 
     def obter_acoes_validas(self, indice_carro):
         """
-        Retorna lista de ações válidas para um carro específico.
+        Retorna as ações válidas para um carro específico.
         Uma ação é válida se não leva o carro a colidir com uma parede.
+        A consulta é uma leitura indexada na tabela pré-calculada por célula;
+        a tupla retornada é compartilhada e não deve ser modificada.
         """
-        acoes = []
         x, y = self.carros[indice_carro]['posicao']
-        
-        # Verifica cada possível movimento
-        movimentos = [
-            ('cima', (x, y-1)),
-            ('direita', (x+1, y)),
-            ('baixo', (x, y+1)),
-            ('esquerda', (x-1, y))
-        ]
-        
-        for acao, (prox_x, prox_y) in movimentos:
-            if (0 <= prox_x < self.COLUNAS and 
-                0 <= prox_y < self.LINHAS and 
-                not self.labirinto[prox_y, prox_x]):
-                acoes.append(acao)
-                
-        return acoes
-    
-
-        
+        if self._acoes_por_celula is not None:
+            return self._acoes_por_celula[y][x]
+        return ACOES_POR_MASCARA[self.mascaras_acoes[y, x]]
 
     def executar_acao(self, indice_carro, acao):
         """
         Executa uma ação para um carro específico e retorna o resultado.
+        O passo é uma consulta na tabela de transições do labirinto e considera
+        os genes do carro: a velocidade decide se ele sai da célula e o sensor
+        de perigo pode evitar uma armadilha.
         
         Returns:
             tuple: (novo_estado, recompensa, terminado)
         """
         carro = self.carros[indice_carro]
-        x, y = carro['posicao']
+        carro_genetico = self.carros_geneticos[indice_carro]
+        genes = carro_genetico.genes
+        origem = carro['posicao']
         carro['passos'] += 1
         
-        # Atualiza posição baseado na ação
-        if acao == 'cima': y -= 1
-        elif acao == 'direita': x += 1
-        elif acao == 'baixo': y += 1
-        elif acao == 'esquerda': x -= 1
-        
-        # Verifica colisão com parede
-        if self.labirinto[y, x] == 1:
-            return self.obter_estado(indice_carro), -10, True
-        
-        # Atualiza posição do carro
-        carro['posicao'] = (x, y)
-        
-        # Verifica se chegou na meta
-        if (x, y) == self.pos_meta:
-            if carro['passos'] < carro['melhor_episodio']:
+        aleatorio = self.aleatorio if self.aleatorios_carros is None \
+            else self.aleatorios_carros[indice_carro]
+        x, y, recompensa, terminado = self.transicoes.passo(
+            origem[0], origem[1], INDICE_ACAO[acao],
+            genes.velocidade, genes.sensor_perigo, gerador_ou_padrao(aleatorio).random)
+        
+        if (x, y) != origem:
+            # Atualiza posição do carro e a menor distância já alcançada
+            carro['posicao'] = (x, y)
+            distancia = self.distancia((x, y))
+            if distancia < carro_genetico.melhor_distancia:
+                carro_genetico.melhor_distancia = distancia
+            
+            # Verifica se chegou na meta
+            if (x, y) == self.pos_meta and carro['passos'] < carro['melhor_episodio']:
                 carro['melhor_episodio'] = carro['passos']
-            return self.obter_estado(indice_carro), 100, True
         
-        return self.obter_estado(indice_carro), -0.1, False
+        if self.fator_modelagem:
+            recompensa += self.modelagem_recompensa(origem, carro['posicao'])
+        return self.obter_estado(indice_carro), recompensa, terminado
 
-    def renderizar(self):
+    def invalidar_renderizacao(self, fundo=False):
         """
-        Desenha o estado atual do ambiente na tela.
-        Inclui o labirinto, os carros e as informações do episódio.
-        Inclui armadilhas e informações genéticas.
-        """
-        # Limpa a tela
-        self.tela.fill(CORES['BRANCO'])
-        
-        # Desenha o labirinto
-        for y in range(self.LINHAS):
-            for x in range(self.COLUNAS):
-                if self.labirinto[y, x] == 1:
-                    pygame.draw.rect(
-                        self.tela,
-                        CORES['PRETO'],
-                        (x * self.GRID,
-                         y * self.GRID,
-                         self.TAMANHO_PAREDE,
-                         self.TAMANHO_PAREDE)
-                    )
-        
-        # Desenha as armadilhas
-        for x, y in self.armadilhas:
-            arm_x = x * self.GRID + (self.GRID - self.TAMANHO_CARRO) // 2
-            arm_y = y * self.GRID + (self.GRID - self.TAMANHO_CARRO) // 2
-            pygame.draw.rect(
-                self.tela,
-                CORES['VERMELHO'],
-                (arm_x, arm_y,
-                 self.TAMANHO_CARRO,
-                 self.TAMANHO_CARRO)
-            )
-        
-        # Desenha a meta
-        meta_x = self.pos_meta[0] * self.GRID + (self.GRID - self.TAMANHO_META) // 2
-        meta_y = self.pos_meta[1] * self.GRID + (self.GRID - self.TAMANHO_META) // 2
-        pygame.draw.rect(
-            self.tela,
-            CORES['VERDE'],
-            (meta_x, meta_y,
-             self.TAMANHO_META, 
-             self.TAMANHO_META)
-        )
-        
-        # Desenha os carros com informações genéticas
-        fonte = pygame.font.Font(None, 20)
-        for i, (carro, carro_genetico) in enumerate(zip(self.carros, self.carros_geneticos)):
-            x, y = carro['posicao']
-            car_x = x * self.GRID + (self.GRID - self.TAMANHO_CARRO) // 2
-            car_y = y * self.GRID + (self.GRID - self.TAMANHO_CARRO) // 2
-            
-            # Desenha o carro
-            pygame.draw.rect(
-                self.tela,
-                carro['cor'],
-                (car_x, car_y,
-                 self.TAMANHO_CARRO, 
-                 self.TAMANHO_CARRO)
-            )
-            
-            # Mostra atributos genéticos sobre o carro
-            info = f"V:{carro_genetico.genes.velocidade:.1f} S:{carro_genetico.genes.sensor_perigo:.1f}"
-            texto = fonte.render(info, True, CORES['PRETO'])
-            self.tela.blit(texto, (car_x - 10, car_y - 15))
-        
-        # Mostra informações do episódio
-        fonte = pygame.font.Font(None, 36)
-        info = f'Episódio: {self.episodio}'
-        for i, carro in enumerate(self.carros):
-            info += f' | Carro {i+1}: {carro["passos"]}'
-        texto = fonte.render(info, True, CORES['PRETO'])
-        self.tela.blit(texto, (50, 50))
-        
+        Força o redesenho completo da tela no próximo quadro.
+        Deve ser chamado quando algo fora do renderizador desenhou na tela
+        (como o menu de pausa) ou quando paredes, armadilhas ou meta mudaram.
         
+        Args:
+            fundo (bool): Se True, também reconstrói a camada estática em cache
+        """
+        if self.renderizador is not None:
+            self.renderizador.invalidar(fundo)
 
-            
-        # Atualiza a tela
-        pygame.display.flip()
\ No newline at end of file
+    def renderizar(self):
+        """
+        Desenha o estado atual do ambiente na tela (ver Renderizador).
+        No modo headless não há tela, então nada é desenhado.
+        """
+        if self.renderizador is not None:
+            self.renderizador.renderizar()
@@ -0,0 +1,340 @@
+# src/ambiente/ambiente_gym.py
+
+import multiprocessing as mp
+import random
+import traceback
+from multiprocessing import shared_memory
+import numpy as np
+from ..util.constantes import ACOES
+from ..util.constantes import PARAMS_GENETICOS as PG
+from ..agentes.carro_genetico import Genes
+from .ambiente_carro import AmbienteCarro, BITS_MASCARA
+
+class AmbienteGym:
+    """
+    Interface no estilo Gymnasium (reset/step) para um único carro em um
+    AmbienteCarro headless, sem depender do pacote gymnasium.
+
+    A observação é a posição (x, y) do carro como array int32 de formato (2,)
+    e a ação é um índice de ACOES. O info traz a máscara das ações válidas na
+    posição observada ('mascara') e se o carro chegou à meta ('chegou_meta').
+    O episódio termina (terminated) em parede, armadilha ou meta e é truncado
+    (truncated) ao atingir max_passos.
+
+    Cada instância tem seu próprio gerador aleatório, usado nas armadilhas, no
+    sensor de perigo e nas sementes dos novos labirintos, então instâncias com
+    sementes diferentes têm armadilhas (e labirintos) diferentes.
+    """
+    def __init__(self, dimensoes=None, gerador=None, semente_labirinto=None, genes=None,
+                 max_passos=2000, novo_labirinto_no_reset=False, fator_modelagem=None,
+                 semente=None):
+        """
+        Args:
+            dimensoes (tuple): (linhas, colunas) do labirinto (ver AmbienteCarro)
+            gerador (str): Algoritmo do labirinto procedural (ver AmbienteCarro)
+            semente_labirinto (int): Semente do primeiro labirinto procedural
+            genes (Genes): Genes do carro (None = sorteados como em CarroGenetico)
+            max_passos (int): Passos até o episódio ser truncado
+            novo_labirinto_no_reset (bool): Se True, cada reset após o primeiro
+                episódio gera um novo labirinto e novas armadilhas
+            fator_modelagem (float): Peso da modelagem de recompensa (ver AmbienteCarro)
+            semente (int): Semente do gerador aleatório da instância
+        """
+        self.aleatorio = random.Random(semente)
+        self.ambiente = AmbienteCarro(num_carros=1, headless=True, dimensoes=dimensoes,
+                                      gerador=gerador, semente_labirinto=semente_labirinto,
+                                      fator_modelagem=fator_modelagem, aleatorio=self.aleatorio)
+        self.carro_genetico = self.ambiente.carros_geneticos[0]
+        if genes is None:
+            genes = Genes(
+                velocidade=self.aleatorio.uniform(PG['VELOCIDADE_MIN'], PG['VELOCIDADE_MAX']),
+                sensor_perigo=self.aleatorio.uniform(PG['SENSOR_MIN'], PG['SENSOR_MAX'])
+            )
+        self.carro_genetico.genes = genes
+
+        self.max_passos = max_passos
+        self.novo_labirinto_no_reset = novo_labirinto_no_reset
+        self.num_acoes = len(ACOES)
+        self.dimensoes = self.ambiente.labirinto.shape
+        self._episodios = 0
+
+    def _observacao(self):
+        return np.array(self.ambiente.carros[0]['posicao'], dtype=np.int32)
+
+    def _info(self):
+        x, y = self.ambiente.carros[0]['posicao']
+        return {'mascara': BITS_MASCARA[self.ambiente.mascaras_acoes[y, x]].copy(),
+                'chegou_meta': self.carro_genetico.chegou_meta}
+
+    def reset(self, seed=None, options=None):
+        """
+        Inicia um novo episódio com o carro na posição inicial.
+
+        Args:
+            seed (int): Se informado, reinicia o gerador aleatório da instância
+            options (dict): {'labirinto': semente} gera esse labirinto agora
+
+        Returns:
+            tuple: (observacao, info)
+        """
+        if seed is not None:
+            self.aleatorio.seed(seed)
+        semente = (options or {}).get('labirinto')
+        if semente is None and self.novo_labirinto_no_reset and self._episodios > 0:
+            semente = self.aleatorio.getrandbits(32)
+        if semente is not None:
+            self.ambiente.novo_labirinto(semente)
+
+        self._episodios += 1
+        self.ambiente.episodio = self._episodios
+        self.ambiente.reset_todos()
+        return self._observacao(), self._info()
+
+    def step(self, acao):
+        """
+        Executa uma ação do carro.
+
+        Args:
+            acao (int): Índice da ação em ACOES
+
+        Returns:
+            tuple: (observacao, recompensa, terminado, truncado, info)
+        """
+        estado, recompensa, terminado = self.ambiente.executar_acao(0, ACOES[acao])
+        carro = self.ambiente.carros[0]
+        if estado == self.ambiente.pos_meta and not self.carro_genetico.chegou_meta:
+            self.carro_genetico.chegou_meta = True
+            self.carro_genetico.tempo_chegada = carro['passos']
+        truncado = not terminado and carro['passos'] >= self.max_passos
+        return self._observacao(), recompensa, terminado, truncado, self._info()
+
+# Buffers compartilhados do vetor de ambientes: nome -> (formato por ambiente, dtype)
+CAMPOS_BUFFER = {
+    'acoes': ((), np.int64),
+    'observacoes': ((2,), np.int32),
+    'mascaras': ((len(ACOES),), bool),
+    'recompensas': ((), np.float64),
+    'terminados': ((), bool),
+    'truncados': ((), bool),
+    'observacoes_finais': ((2,), np.int32),
+}
+
+def _arrays_buffer(memorias, num_ambientes):
+    """Cria os arrays NumPy sobre os blocos de memória compartilhada."""
+    return {campo: np.ndarray((num_ambientes,) + formato, dtype=dtype, buffer=memorias[campo].buf)
+            for campo, (formato, dtype) in CAMPOS_BUFFER.items()}
+
+def _executar_trabalhador(conexao, nomes, num_ambientes, inicio, configuracoes):
+    """
+    Loop de um processo do VetorAmbientesGym. Cria os ambientes da sua fatia,
+    lê as ações e escreve observações, recompensas e términos direto na memória
+    compartilhada; pelo pipe passam apenas comandos curtos e a confirmação.
+    Respostas são (True, dado) em caso de sucesso ou (False, traceback).
+    """
+    memorias = {campo: shared_memory.SharedMemory(name=nome) for campo, nome in nomes.items()}
+    arrays = _arrays_buffer(memorias, num_ambientes)
+    try:
+        ambientes = [AmbienteGym(**configuracao) for configuracao in configuracoes]
+        conexao.send((True, ambientes[0].dimensoes))
+        while True:
+            comando, argumento = conexao.recv()
+            if comando == 'passo':
+                for i, ambiente in enumerate(ambientes, inicio):
+                    observacao, recompensa, terminado, truncado, info = \
+                        ambiente.step(int(arrays['acoes'][i]))
+                    arrays['recompensas'][i] = recompensa
+                    arrays['terminados'][i] = terminado
+                    arrays['truncados'][i] = truncado
+                    # Auto-reset: a observação final fica em observacoes_finais
+                    if terminado or truncado:
+                        arrays['observacoes_finais'][i] = observacao
+                        observacao, info = ambiente.reset()
+                    arrays['observacoes'][i] = observacao
+                    arrays['mascaras'][i] = info['mascara']
+            elif comando == 'reset':
+                for i, ambiente in enumerate(ambientes, inicio):
+                    semente = None if argumento is None else argumento[i]
+                    observacao, info = ambiente.reset(seed=semente)
+                    arrays['observacoes'][i] = observacao
+                    arrays['mascaras'][i] = info['mascara']
+            elif comando == 'fechar':
+                conexao.send((True, None))
+                break
+            conexao.send((True, None))
+    except Exception:
+        conexao.send((False, traceback.format_exc()))
+    finally:
+        del arrays
+        for memoria in memorias.values():
+            memoria.close()
+        conexao.close()
+
+class VetorAmbientesGym:
+    """
+    Vetor de AmbienteGym executados em subprocessos, para alimentar um único
+    aprendiz com vários ambientes em paralelo.
+
+    Observações, máscaras de ações, recompensas e términos de todos os
+    ambientes ficam em arrays de multiprocessing.shared_memory: o processo
+    principal escreve as ações, os processos escrevem os resultados e o pipe
+    carrega só o comando e a confirmação, sem serializar tuplas a cada passo.
+    Ambientes que terminam ou são truncados são reiniciados automaticamente;
+    a observação retornada já é a do novo episódio e a final fica em
+    infos['observacoes_finais'].
+
+    Cada ambiente recebe sementes próprias, derivadas da semente do vetor,
+    para o labirinto procedural e para o seu gerador aleatório, então cada um
+    tem seu próprio labirinto e suas próprias armadilhas.
+    """
+    def __init__(self, num_ambientes, processos=None, semente=None, contexto=None,
+                 **parametros):
+        """
+        Args:
+            num_ambientes (int): Número de ambientes
+            processos (int): Número de subprocessos; os ambientes são divididos
+                entre eles em fatias contíguas (Padrão: min(num_ambientes, núcleos))
+            semente (int): Semente da qual derivam as sementes dos ambientes
+            contexto (str): Método de início dos processos ('fork', 'spawn',
+                'forkserver'; Padrão: o do sistema)
+            **parametros: Argumentos repassados a cada AmbienteGym
+        """
+        self.num_ambientes = num_ambientes
+        processos = min(num_ambientes, processos or mp.cpu_count())
+        contexto = mp.get_context(contexto)
+
+        # Sementes independentes de labirinto e de sorteios por ambiente
+        sementes = np.random.SeedSequence(semente).generate_state(2 * num_ambientes).reshape(-1, 2)
+        configuracoes = []
+        for semente_labirinto, semente_ambiente in sementes.tolist():
+            configuracao = {'semente_labirinto': semente_labirinto, 'semente': semente_ambiente}
+            configuracao.update(parametros)
+            configuracoes.append(configuracao)
+
+        self._memorias = {}
+        for campo, (formato, dtype) in CAMPOS_BUFFER.items():
+            tamanho = max(1, num_ambientes * int(np.prod(formato)) * np.dtype(dtype).itemsize)
+            self._memorias[campo] = shared_memory.SharedMemory(create=True, size=tamanho)
+        self._arrays = _arrays_buffer(self._memorias, num_ambientes)
+        nomes = {campo: memoria.name for campo, memoria in self._memorias.items()}
+
+        self._conexoes = []
+        self._processos = []
+        self._esperando = False
+        self.fechado = False
+        limites = np.linspace(0, num_ambientes, processos + 1).astype(int)
+        for inicio, fim in zip(limites[:-1].tolist(), limites[1:].tolist()):
+            local, remota = contexto.Pipe()
+            processo = contexto.Process(
+                target=_executar_trabalhador,
+                args=(remota, nomes, num_ambientes, inicio, configuracoes[inicio:fim]),
+                daemon=True)
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+        self.dimensoes = self._receber()[0]
+        self.num_acoes = len(ACOES)
+
+    def _receber(self):
+        """Espera a resposta de todos os processos e propaga erros."""
+        resultados = []
+        erros = []
+        for conexao in self._conexoes:
+            sucesso, dado = conexao.recv()
+            (resultados if sucesso else erros).append(dado)
+        if erros:
+            self.fechar()
+            raise RuntimeError('Erro em um processo do vetor de ambientes:\n' + erros[0])
+        return resultados
+
+    def _enviar(self, comando, argumento=None):
+        for conexao in self._conexoes:
+            conexao.send((comando, argumento))
+
+    def _infos(self, finais=False):
+        infos = {'mascaras': self._arrays['mascaras'].copy()}
+        if finais:
+            infos['observacoes_finais'] = self._arrays['observacoes_finais'].copy()
+        return infos
+
+    def reset(self, seed=None):
+        """
+        Reinicia todos os ambientes.
+
+        Args:
+            seed (int): Se informado, reinicia os geradores dos ambientes com
+                sementes derivadas dele
+
+        Returns:
+            tuple: (observacoes, infos) com observações de formato (num_ambientes, 2)
+        """
+        sementes = None
+        if seed is not None:
+            sementes = np.random.SeedSequence(seed).generate_state(self.num_ambientes).tolist()
+        self._enviar('reset', sementes)
+        self._receber()
+        return self._arrays['observacoes'].copy(), self._infos()
+
+    def step_async(self, acoes):
+        """
+        Escreve as ações na memória compartilhada e dispara o passo de todos
+        os ambientes sem esperar o resultado.
+
+        Args:
+            acoes (array-like): Índice da ação de cada ambiente, formato (num_ambientes,)
+        """
+        if self._esperando:
+            raise RuntimeError('step_async chamado antes do step_wait do passo anterior')
+        self._arrays['acoes'][:] = acoes
+        self._enviar('passo')
+        self._esperando = True
+
+    def step_wait(self):
+        """
+        Espera o passo disparado por step_async.
+
+        Returns:
+            tuple: (observacoes, recompensas, terminados, truncados, infos); infos
+                traz 'mascaras' e 'observacoes_finais' (válidas onde terminou ou truncou)
+        """
+        if not self._esperando:
+            raise RuntimeError('step_wait chamado sem step_async')
+        self._receber()
+        self._esperando = False
+        return (self._arrays['observacoes'].copy(), self._arrays['recompensas'].copy(),
+                self._arrays['terminados'].copy(), self._arrays['truncados'].copy(),
+                self._infos(finais=True))
+
+    def step(self, acoes):
+        """Executa um passo em todos os ambientes (step_async seguido de step_wait)."""
+        self.step_async(acoes)
+        return self.step_wait()
+
+    def fechar(self):
+        """Encerra os processos e libera a memória compartilhada."""
+        if self.fechado:
+            return
+        self.fechado = True
+        for conexao, processo in zip(self._conexoes, self._processos):
+            if processo.is_alive():
+                try:
+                    conexao.send(('fechar', None))
+                    conexao.recv()
+                except (OSError, EOFError):
+                    pass
+            conexao.close()
+            processo.join(timeout=5)
+            if processo.is_alive():
+                processo.terminate()
+        self._arrays = None
+        for memoria in self._memorias.values():
+            memoria.close()
+            memoria.unlink()
+
+    close = fechar
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
@@ -0,0 +1,80 @@
+# src/ambiente/campo_distancias.py
+
+import numpy as np
+
+# Distância das células que não alcançam o destino
+INALCANCAVEL = -1
+
+# Fronteiras menores que isto são expandidas em Python puro: nos corredores de
+# um labirinto a fronteira tem poucas células e o custo fixo de cada operação
+# NumPy passaria do custo de visitar as células uma a uma
+LIMITE_FRONTEIRA_VETORIZADA = 64
+
+def calcular_campo_distancias(livre, destino):
+    """
+    Busca em largura a partir do destino sobre as células livres, calculando
+    o menor número de passos de cada célula até ele.
+
+    A busca avança uma fronteira (nível) por vez. Fronteiras grandes, comuns
+    em labirintos com ciclos, são expandidas por operações vetorizadas sobre
+    os índices planos do grid; as pequenas, por um laço simples.
+
+    Args:
+        livre (np.ndarray): Máscara booleana (linhas, colunas) das células
+            por onde se pode passar
+        destino (tuple): Posição (x, y) do destino
+
+    Returns:
+        np.ndarray: Distâncias int32 de formato (linhas, colunas), com
+            INALCANCAVEL nas células bloqueadas ou sem caminho até o destino
+    """
+    linhas, colunas = livre.shape
+    x, y = destino
+    if not livre[y, x]:
+        return np.full((linhas, colunas), INALCANCAVEL, dtype=np.int32)
+
+    # Bordas tratadas como bloqueadas para que os vizinhos planos nunca saiam do grid.
+    # O bytearray e o array NumPy compartilham a mesma memória
+    aberto_bytes = bytearray(np.pad(livre, 1, constant_values=False).astype(np.uint8).tobytes())
+    aberto = np.frombuffer(aberto_bytes, dtype=np.uint8)
+    largura = colunas + 2
+    vizinhos = (-largura, 1, largura, -1)
+    deslocamentos = np.array(vizinhos, dtype=np.intp)
+
+    # A BFS trabalha sobre o grid com bordas e anota a distância no índice sem bordas
+    resultado = np.full(aberto.size, INALCANCAVEL, dtype=np.int32)
+    inicio = (y + 1) * largura + x + 1
+    aberto_bytes[inicio] = 0
+    fronteira = [inicio]
+    nivel = 0
+    celulas_laco, niveis_laco = [], []
+    while len(fronteira):
+        if len(fronteira) < LIMITE_FRONTEIRA_VETORIZADA:
+            if isinstance(fronteira, np.ndarray):
+                fronteira = fronteira.tolist()
+            celulas_laco.extend(fronteira)
+            niveis_laco.extend([nivel] * len(fronteira))
+            proxima = []
+            for celula in fronteira:
+                for deslocamento in vizinhos:
+                    vizinho = celula + deslocamento
+                    if aberto_bytes[vizinho]:
+                        aberto_bytes[vizinho] = 0
+                        proxima.append(vizinho)
+        else:
+            fronteira = np.asarray(fronteira, dtype=np.intp)
+            resultado[fronteira] = nivel
+            candidatos = (fronteira[:, None] + deslocamentos).ravel()
+            candidatos = candidatos[aberto[candidatos] == 1]
+            # Remove repetidos sem ordenar: cada célula guarda a posição da sua
+            # última ocorrência (resultado serve de rascunho; a distância é
+            # gravada quando a célula for fronteira ou ao final)
+            ordem = np.arange(candidatos.size, dtype=np.int32)
+            resultado[candidatos] = ordem
+            proxima = candidatos[resultado[candidatos] == ordem]
+            aberto[proxima] = 0
+        fronteira = proxima
+        nivel += 1
+
+    resultado[np.array(celulas_laco, dtype=np.intp)] = np.array(niveis_laco, dtype=np.int32)
+    return resultado.reshape(linhas + 2, largura)[1:-1, 1:-1].copy()
@@ -0,0 +1,154 @@
+# src/ambiente/frota_vetorizada.py
+
+import numpy as np
+from ..util.constantes import ACOES
+from .ambiente_carro import BITS_MASCARA
+from .transicoes import META
+
+class FrotaVetorizada:
+    """
+    Motor de passos em lote para toda a frota de carros.
+    Mantém posição, contador de passos e flag de término de cada carro em
+    arrays NumPy e resolve o passo de todos os carros em uma única consulta
+    à tabela de transições do ambiente (a mesma usada por executar_acao).
+
+    As ações são índices inteiros na ordem de ACOES
+    (0 = cima, 1 = direita, 2 = baixo, 3 = esquerda).
+    """
+    def __init__(self, ambiente, semente=None):
+        """
+        Args:
+            ambiente (AmbienteCarro): Ambiente que fornece labirinto, armadilhas,
+                meta e os carros genéticos da frota
+            semente (int): Semente do gerador usado no sorteio do sensor de perigo
+        """
+        self.ambiente = ambiente
+        self.num_carros = ambiente.num_carros
+        self.rng = np.random.default_rng(semente)
+
+        # Estado da frota em arrays NumPy
+        self.posicoes = np.zeros((self.num_carros, 2), dtype=np.int32)  # Colunas (x, y)
+        self.passos = np.zeros(self.num_carros, dtype=np.int32)
+        self.terminados = np.zeros(self.num_carros, dtype=bool)
+        self.chegou_meta = np.zeros(self.num_carros, dtype=bool)
+        self.tempo_chegada = np.full(self.num_carros, np.inf)
+        self.velocidades = np.zeros(self.num_carros)
+        self.sensores = np.zeros(self.num_carros)
+        self.melhores_distancias = np.full(self.num_carros, np.inf)
+
+        self.atualizar_mapa()
+        self.reset()
+
+    def atualizar_mapa(self):
+        """
+        Lê do ambiente a tabela de transições e o campo de distâncias até a meta.
+        Deve ser chamado sempre que o labirinto ou as armadilhas mudarem.
+        """
+        self.transicoes = self.ambiente.transicoes
+        distancias = self.ambiente.distancias
+        self.distancias = np.where(distancias >= 0, distancias, np.inf)
+        # Na modelagem, células sem caminho valem a distância máxima (inf - inf = nan)
+        self._distancias_modelagem = np.where(distancias >= 0, distancias,
+                                              self.ambiente.distancia_maxima)
+
+    def sincronizar_genes(self):
+        """Lê os genes velocidade e sensor_perigo de cada carro genético do ambiente."""
+        self.velocidades = np.array(
+            [carro.genes.velocidade for carro in self.ambiente.carros_geneticos],
+            dtype=np.float64
+        )
+        self.sensores = np.array(
+            [carro.genes.sensor_perigo for carro in self.ambiente.carros_geneticos],
+            dtype=np.float64
+        )
+
+    def reset(self):
+        """
+        Reinicia todos os carros para a posição inicial.
+
+        Returns:
+            np.ndarray: Posições (x, y) de todos os carros, formato (num_carros, 2)
+        """
+        self.posicoes[:] = (1, 1)
+        self.passos[:] = 0
+        self.terminados[:] = False
+        self.chegou_meta[:] = False
+        self.tempo_chegada[:] = np.inf
+        self.melhores_distancias[:] = self.distancias[1, 1]
+        self.sincronizar_genes()
+        return self.posicoes.copy()
+
+    def mascaras_acoes_validas(self):
+        """
+        Retorna as ações válidas de todos os carros de uma vez, lidas da
+        tabela de máscaras pré-calculada pelo ambiente.
+
+        Returns:
+            np.ndarray: Máscara booleana de formato (num_carros, 4)
+        """
+        mascaras = self.ambiente.mascaras_acoes[self.posicoes[:, 1], self.posicoes[:, 0]]
+        return BITS_MASCARA[mascaras]
+
+    def passo(self, acoes):
+        """
+        Executa uma ação para cada carro da frota.
+        Carros que já terminaram o episódio ficam parados e recebem recompensa 0.
+
+        Args:
+            acoes (array-like): Índice da ação de cada carro, formato (num_carros,)
+
+        Returns:
+            tuple: (posicoes, recompensas, fins) onde fins marca os carros que
+                terminaram neste passo
+        """
+        acoes = np.asarray(acoes, dtype=np.intp)
+        ativos = ~self.terminados
+        origens = self.posicoes.copy()
+
+        novas, recompensas, fins, tipos = self.transicoes.passo_lote(
+            origens, acoes, self.velocidades, self.sensores, self.rng.random(self.num_carros))
+        recompensas[~ativos] = 0
+        fins &= ativos
+        meta = ativos & (tipos == META)
+
+        # Modelagem de recompensa pela variação da distância até a meta
+        fator = self.ambiente.fator_modelagem
+        if fator:
+            distancia_origem = self._distancias_modelagem[origens[:, 1], origens[:, 0]]
+            distancia_destino = self._distancias_modelagem[novas[:, 1], novas[:, 0]]
+            modelagem = fator * (distancia_origem - self.ambiente.gamma * distancia_destino) \
+                / self.ambiente.distancia_maxima
+            recompensas[ativos] += modelagem[ativos]
+
+        # Atualiza o estado da frota
+        self.passos += ativos
+        self.posicoes[ativos] = novas[ativos]
+        np.minimum(self.melhores_distancias,
+                   self.distancias[self.posicoes[:, 1], self.posicoes[:, 0]],
+                   out=self.melhores_distancias)
+
+        chegaram = meta & ~self.chegou_meta
+        self.chegou_meta |= chegaram
+        self.tempo_chegada[chegaram] = self.passos[chegaram]
+        self.terminados |= fins
+
+        return self.posicoes.copy(), recompensas, fins
+
+    def sincronizar_ambiente(self):
+        """
+        Copia o estado da frota para os dicionários de carros do ambiente,
+        permitindo usar renderizar() e registrar_geracao() no modo vetorizado.
+        """
+        for i, (carro, carro_genetico) in enumerate(
+                zip(self.ambiente.carros, self.ambiente.carros_geneticos)):
+            carro['posicao'] = (int(self.posicoes[i, 0]), int(self.posicoes[i, 1]))
+            carro['passos'] = int(self.passos[i])
+            carro_genetico.melhor_distancia = float(self.melhores_distancias[i])
+            if self.chegou_meta[i] and not carro_genetico.chegou_meta:
+                carro_genetico.chegou_meta = True
+                carro_genetico.tempo_chegada = int(self.tempo_chegada[i])
+
+    @staticmethod
+    def indices_para_acoes(acoes):
+        """Converte índices de ação para os nomes usados pelo AgenteQLearning."""
+        return [ACOES[a] for a in acoes]
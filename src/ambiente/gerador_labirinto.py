@@ -0,0 +1,155 @@
+# src/ambiente/gerador_labirinto.py
+
+import random
+import numpy as np
+
+ALGORITMOS = ('backtracker', 'sidewinder')
+
+def _gerar_backtracker(altura, largura, sorteio):
+    """
+    Labirinto perfeito por backtracking recursivo (implementado com pilha).
+    Trabalha sobre as células de passagem (coordenadas ímpares do grid).
+
+    Returns:
+        np.ndarray: Grid uint8 de formato (2*altura+1, 2*largura+1)
+    """
+    grid = np.ones((2 * altura + 1, 2 * largura + 1), dtype=np.uint8)
+    visitado = bytearray(altura * largura)
+    passagens = []  # Índices planos do grid a abrir
+
+    linhas_grid = 2 * largura + 1
+    pilha = [0]
+    visitado[0] = 1
+    passagens.append(linhas_grid + 1)
+    while pilha:
+        celula = pilha[-1]
+        i, j = divmod(celula, largura)
+
+        # Vizinhos ainda não visitados
+        vizinhos = []
+        if i > 0 and not visitado[celula - largura]:
+            vizinhos.append(celula - largura)
+        if j < largura - 1 and not visitado[celula + 1]:
+            vizinhos.append(celula + 1)
+        if i < altura - 1 and not visitado[celula + largura]:
+            vizinhos.append(celula + largura)
+        if j > 0 and not visitado[celula - 1]:
+            vizinhos.append(celula - 1)
+
+        if not vizinhos:
+            pilha.pop()
+            continue
+
+        vizinho = vizinhos[int(sorteio.random() * len(vizinhos))]
+        visitado[vizinho] = 1
+        vi, vj = divmod(vizinho, largura)
+
+        # Abre a célula vizinha e a parede entre as duas
+        passagens.append((2 * vi + 1) * linhas_grid + 2 * vj + 1)
+        passagens.append((i + vi + 1) * linhas_grid + j + vj + 1)
+        pilha.append(vizinho)
+
+    grid.ravel()[passagens] = 0
+    return grid
+
+def _gerar_sidewinder(altura, largura, rng):
+    """
+    Labirinto perfeito pelo algoritmo sidewinder, totalmente vetorizado.
+    Em cada linha (exceto a primeira) as células formam trechos horizontais;
+    cada trecho abre uma passagem para cima em uma célula sorteada.
+
+    Returns:
+        np.ndarray: Grid uint8 de formato (2*altura+1, 2*largura+1)
+    """
+    grid = np.ones((2 * altura + 1, 2 * largura + 1), dtype=np.uint8)
+    grid[1::2, 1::2] = 0
+
+    # Primeira linha: corredor contínuo
+    grid[1, 1:-1] = 0
+
+    if altura > 1:
+        # Fecha o trecho ao acaso ou sempre na última coluna
+        fecha = rng.random((altura - 1, largura)) < 0.5
+        fecha[:, -1] = True
+
+        # Sem fechar, abre a parede para a direita
+        leste = ~fecha[:, :-1]
+        grid[3::2, 2:-1:2][leste] = 0
+
+        # Identifica os trechos e sorteia a célula de cada um que sobe
+        fecha_plano = fecha.ravel()
+        fins = np.flatnonzero(fecha_plano)
+        inicios = np.concatenate(([0], fins[:-1] + 1))
+        chaves = rng.random(fecha_plano.size)
+        maximos = np.maximum.reduceat(chaves, inicios)
+        trecho = np.repeat(np.arange(len(inicios)), fins - inicios + 1)
+        sobe = chaves == maximos[trecho]
+
+        linhas, colunas = np.divmod(np.flatnonzero(sobe), largura)
+        grid[2 * (linhas + 1), 2 * colunas + 1] = 0
+    return grid
+
+def gerar_labirinto(linhas, colunas, semente=None, algoritmo='backtracker', taxa_ciclos=0.05):
+    """
+    Gera um labirinto procedural com semente, em uma matriz uint8
+    (1 = parede, 0 = caminho livre) cercada por paredes.
+
+    As posições (1, 1) e (colunas-2, linhas-2) são sempre livres, para que o
+    início e a meta padrão do AmbienteCarro funcionem em qualquer tamanho.
+
+    Args:
+        linhas (int): Número de linhas do grid (mínimo 5)
+        colunas (int): Número de colunas do grid (mínimo 5)
+        semente (int): Semente do gerador (None = aleatória)
+        algoritmo (str): 'backtracker' (labirinto perfeito, laço em Python)
+            ou 'sidewinder' (vetorizado, indicado para milhares de células por lado)
+        taxa_ciclos (float): Fração de paredes internas removidas para criar
+            caminhos alternativos (0 = labirinto perfeito)
+
+    Returns:
+        np.ndarray: Labirinto de formato (linhas, colunas) e dtype uint8
+    """
+    if linhas < 5 or colunas < 5:
+        raise ValueError("O labirinto precisa de pelo menos 5x5 células")
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo de labirinto desconhecido: {algoritmo}")
+
+    rng = np.random.default_rng(semente)
+    altura, largura = (linhas - 1) // 2, (colunas - 1) // 2
+    if algoritmo == 'backtracker':
+        base = _gerar_backtracker(altura, largura, random.Random(int(rng.integers(2**63))))
+    else:
+        base = _gerar_sidewinder(altura, largura, rng)
+
+    labirinto = np.ones((linhas, colunas), dtype=np.uint8)
+    labirinto[:base.shape[0], :base.shape[1]] = base
+
+    # Dimensões pares: a última coluna/linha livre repete a anterior
+    if colunas % 2 == 0:
+        labirinto[1:-1, -2] = labirinto[1:-1, -3]
+    if linhas % 2 == 0:
+        labirinto[-2, 1:-1] = labirinto[-3, 1:-1]
+
+    if taxa_ciclos > 0:
+        # Paredes internas entre duas passagens (horizontal ou vertical)
+        interno = labirinto[1:-1, 1:-1]
+        horizontal = (labirinto[1:-1, :-2] == 0) & (labirinto[1:-1, 2:] == 0)
+        vertical = (labirinto[:-2, 1:-1] == 0) & (labirinto[2:, 1:-1] == 0)
+        removivel = (interno == 1) & (horizontal ^ vertical)
+        interno[removivel & (rng.random(interno.shape) < taxa_ciclos)] = 0
+
+    return labirinto
+
+def compactar_labirinto(labirinto):
+    """
+    Compacta o labirinto em um bit por célula, para armazenamento.
+
+    Returns:
+        tuple: (bits uint8, formato original)
+    """
+    return np.packbits(labirinto.astype(bool), axis=None), labirinto.shape
+
+def descompactar_labirinto(bits, formato):
+    """Reconstrói o labirinto uint8 a partir de compactar_labirinto."""
+    linhas, colunas = formato
+    return np.unpackbits(bits, count=linhas * colunas).reshape(linhas, colunas)
@@ -0,0 +1,196 @@
+# src/ambiente/transicoes.py
+
+import numpy as np
+from ..util.constantes import DESLOCAMENTOS, RECOMPENSAS
+
+# Tipos de resultado de um movimento de uma célula
+LIVRE, PAREDE, ARMADILHA, META = range(4)
+
+# Recompensa e término de cada tipo (a armadilha vale como não evitada)
+RECOMPENSA_POR_TIPO = (RECOMPENSAS['PASSO'], RECOMPENSAS['PAREDE'],
+                       RECOMPENSAS['ARMADILHA'], RECOMPENSAS['META'])
+TERMINAL_POR_TIPO = (False, True, True, True)
+_RECOMPENSAS_TIPO = np.array(RECOMPENSA_POR_TIPO, dtype=np.float64)
+_TERMINAIS_TIPO = np.array(TERMINAL_POR_TIPO)
+
+# Acima deste número de células, as tabelas por célula ficam só em arrays NumPy
+# compactos: as versões em listas Python (mais rápidas por consulta) custariam
+# dezenas de bytes por entrada e segundos para montar a cada labirinto
+LIMITE_CELULAS_LISTAS = 1 << 20
+
+def anda(velocidade, coordenada):
+    """
+    Indica se o carro sai da célula com a velocidade genética, seguindo a regra
+    original round(coordenada ± velocidade * 0.1): com passo acima de 0.5 o carro
+    anda uma célula, abaixo fica parado e, exatamente em 0.5, o arredondamento
+    para o par faz o carro andar apenas a partir de coordenadas ímpares.
+
+    Args:
+        velocidade (float): Gene de velocidade (1 a 10)
+        coordenada (int): Coordenada do carro no eixo do movimento
+    """
+    passo = velocidade * 0.1
+    return passo > 0.5 or (passo == 0.5 and coordenada % 2 == 1)
+
+class TabelaTransicoes:
+    """
+    Núcleo único de passo dos carros. Para cada labirinto, pré-calcula a tabela
+    (célula, ação) -> (próxima célula, tipo), de onde vêm recompensa, término e
+    armadilha. Um passo vira uma consulta na tabela, mais a regra da velocidade
+    genética e o sorteio do sensor de perigo quando o movimento cai em uma armadilha.
+
+    As células são índices planos y * colunas + x e as ações seguem a ordem de ACOES.
+    Colisões (parede ou armadilha) mantêm o carro na célula de origem.
+    A tabela ocupa 5 bytes por (célula, ação): destinos int32 e tipos int8;
+    recompensa e término são lidos do tipo.
+    """
+    def __init__(self, labirinto, armadilhas, pos_meta):
+        """
+        Args:
+            labirinto (np.ndarray): Matriz do labirinto (1 = parede, 0 = livre)
+            armadilhas (list): Posições (x, y) das armadilhas
+            pos_meta (tuple): Posição (x, y) da meta
+        """
+        linhas, colunas = labirinto.shape
+        self.colunas = colunas
+        self.num_celulas = linhas * colunas
+        celulas = np.arange(self.num_celulas, dtype=np.int32).reshape(linhas, colunas)
+
+        # Sair do grid conta como parede: a borda do array ampliado é parede
+        paredes = np.pad(labirinto == 1, 1, constant_values=True)
+        mapa_armadilhas = np.zeros((linhas + 2, colunas + 2), dtype=bool)
+        for ax, ay in armadilhas:
+            mapa_armadilhas[ay + 1, ax + 1] = True
+        meta_x, meta_y = pos_meta
+
+        self.destinos = np.empty((self.num_celulas, len(DESLOCAMENTOS)), dtype=np.int32)
+        self.tipos = np.empty((self.num_celulas, len(DESLOCAMENTOS)), dtype=np.int8)
+        destinos = self.destinos.reshape(linhas, colunas, -1)
+        tipos = self.tipos.reshape(linhas, colunas, -1)
+        for i, (dx, dy) in enumerate(DESLOCAMENTOS):
+            # Vizinho (x + dx, y + dy) de cada célula, lido por um deslocamento do array ampliado
+            vizinhos = (slice(1 + dy, 1 + dy + linhas), slice(1 + dx, 1 + dx + colunas))
+            parede = paredes[vizinhos]
+            armadilha = ~parede & mapa_armadilhas[vizinhos]
+            colisao = parede | armadilha
+
+            tipo = tipos[..., i]
+            tipo[:] = LIVRE
+            tipo[parede] = PAREDE
+            tipo[armadilha] = ARMADILHA
+            origem_x, origem_y = meta_x - dx, meta_y - dy
+            if 0 <= origem_x < colunas and 0 <= origem_y < linhas and not colisao[origem_y, origem_x]:
+                tipo[origem_y, origem_x] = META
+
+            np.add(celulas, dy * colunas + dx, out=destinos[..., i])
+            np.copyto(destinos[..., i], celulas, where=colisao)
+
+        self._codigos = None
+        # Eixo do movimento de cada ação: 0 = x, 1 = y
+        self._eixos = np.array([0 if dx else 1 for dx, _ in DESLOCAMENTOS])
+
+    @property
+    def codigos(self):
+        """
+        Tabela em lista plana para o passo escalar: o código de (célula, ação)
+        fica no índice célula * 4 + ação e vale próxima célula * 4 + tipo.
+        Criada só no primeiro uso, pois o modo vetorizado não precisa dela, e
+        None em grids acima de LIMITE_CELULAS_LISTAS (o passo lê os arrays).
+        """
+        if self._codigos is None and self.num_celulas <= LIMITE_CELULAS_LISTAS:
+            self._codigos = (self.destinos.astype(np.int64) * 4 + self.tipos).ravel().tolist()
+        return self._codigos
+
+    def modelo_esperado(self, velocidade, sensor):
+        """
+        Modelo de transição de um carro com os genes informados, no formato usado
+        pelo planejamento: o valor de (célula, ação) é recompensa + gamma *
+        continuação * V(destino). A armadilha vira a média dos seus dois
+        resultados, ponderada pela chance do sensor de perigo evitá-la.
+
+        Args:
+            velocidade (float): Gene de velocidade do carro
+            sensor (float): Gene sensor de perigo do carro
+
+        Returns:
+            tuple: (destinos, recompensas esperadas, probabilidades de continuar),
+                arrays de formato (células, 4)
+        """
+        celulas = np.arange(self.num_celulas, dtype=np.int32)
+        coordenadas = np.where(self._eixos == 0, (celulas % self.colunas)[:, None],
+                               (celulas // self.colunas)[:, None])
+        passo = velocidade * 0.1
+        andam = (passo > 0.5) | ((passo == 0.5) & (coordenadas % 2 == 1))
+
+        evita = min(sensor / 3.0, 1.0)
+        armadilha = self.tipos == ARMADILHA
+        recompensas = np.where(armadilha, evita * RECOMPENSAS['ARMADILHA_EVITADA']
+                               + (1 - evita) * RECOMPENSAS['ARMADILHA'], _RECOMPENSAS_TIPO[self.tipos])
+        continuacoes = np.where(armadilha, evita, ~_TERMINAIS_TIPO[self.tipos]).astype(np.float64)
+
+        destinos = np.where(andam, self.destinos, celulas[:, None])
+        recompensas = np.where(andam, recompensas, RECOMPENSAS['PASSO'])
+        continuacoes = np.where(andam, continuacoes, 1.0)
+        return destinos, recompensas, continuacoes
+
+    def passo(self, x, y, indice_acao, velocidade, sensor, sorteio):
+        """
+        Executa o passo de um carro.
+
+        Args:
+            x, y (int): Posição atual
+            indice_acao (int): Índice da ação em ACOES
+            velocidade (float): Gene de velocidade do carro
+            sensor (float): Gene sensor de perigo do carro
+            sorteio (callable): Gerador de números em [0, 1), ex.: random.random
+
+        Returns:
+            tuple: (próximo x, próximo y, recompensa, terminado)
+        """
+        dx, dy = DESLOCAMENTOS[indice_acao]
+        if not anda(velocidade, x if dx else y):
+            return x, y, RECOMPENSAS['PASSO'], False
+
+        celula = y * self.colunas + x
+        codigos = self.codigos
+        if codigos is not None:
+            destino, tipo = divmod(codigos[celula * 4 + indice_acao], 4)
+        else:
+            destino = int(self.destinos[celula, indice_acao])
+            tipo = int(self.tipos[celula, indice_acao])
+        if tipo == ARMADILHA and sorteio() < sensor / 3.0:
+            return x, y, RECOMPENSAS['ARMADILHA_EVITADA'], False  # Evitou a armadilha
+        novo_y, novo_x = divmod(destino, self.colunas)
+        return novo_x, novo_y, RECOMPENSA_POR_TIPO[tipo], TERMINAL_POR_TIPO[tipo]
+
+    def passo_lote(self, posicoes, acoes, velocidades, sensores, sorteios):
+        """
+        Executa o passo de vários carros de uma vez, com as mesmas regras de passo().
+
+        Args:
+            posicoes (np.ndarray): Posições (x, y), formato (n, 2)
+            acoes (np.ndarray): Índices das ações
+            velocidades (np.ndarray): Genes de velocidade
+            sensores (np.ndarray): Genes sensor de perigo
+            sorteios (np.ndarray): Números em [0, 1) para o sensor de perigo
+
+        Returns:
+            tuple: (novas posições (n, 2), recompensas, terminados, tipos)
+        """
+        x, y = posicoes[:, 0], posicoes[:, 1]
+        celulas = y * self.colunas + x
+        coordenadas = np.where(self._eixos[acoes] == 0, x, y)
+        passo = velocidades * 0.1
+        andam = (passo > 0.5) | ((passo == 0.5) & (coordenadas % 2 == 1))
+
+        tipos = np.where(andam, self.tipos[celulas, acoes], LIVRE)
+        destinos = np.where(andam, self.destinos[celulas, acoes], celulas)
+        recompensas = np.where(andam, _RECOMPENSAS_TIPO[tipos], RECOMPENSAS['PASSO'])
+        terminados = _TERMINAIS_TIPO[tipos]
+
+        evitou = (tipos == ARMADILHA) & (sorteios < sensores / 3.0)
+        recompensas[evitou] = RECOMPENSAS['ARMADILHA_EVITADA']
+        terminados[evitou] = False
+
+        novas = np.stack((destinos % self.colunas, destinos // self.colunas), axis=1)
+        return novas, recompensas, terminados, tipos
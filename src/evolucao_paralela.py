@@ -0,0 +1,189 @@
+# src/evolucao_paralela.py
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.ambiente.ambiente_carro import AmbienteCarro
+from src.agentes.agente_q_learning import AgenteQLearning
+from src.agentes.populacao_genetica import PopulacaoGenetica
+from src.treino_headless import executar_episodio
+from src.util.aleatorio import FluxosExecucao
+
+def avaliar_genes(tarefa):
+    """
+    Avalia um conjunto de genes em um ambiente headless próprio do processo.
+    Um único carro com esses genes treina por alguns episódios. Episódios em
+    que o carro não chega à meta contam como max_passos mais a menor
+    distância que ele alcançou até a meta, diferenciando o progresso parcial.
+
+    Args:
+        tarefa (tuple): (genes, episodios, max_passos, semente)
+
+    Returns:
+        tuple: (episódios que chegaram à meta, média de passos, média da menor
+            distância alcançada até a meta, que é 0 nos episódios que chegaram)
+    """
+    genes, episodios, max_passos, semente = tarefa
+    fluxos = FluxosExecucao(semente, 1)
+
+    ambiente = AmbienteCarro(num_carros=1, headless=True, aleatorio=fluxos.execucao,
+                             aleatorios_carros=fluxos.sensores)
+    ambiente.carros_geneticos[0].genes = genes
+    agente = AgenteQLearning(0, fluxos.exploracao[0])
+
+    chegadas = 0
+    total = 0
+    distancias = 0
+    for _ in range(episodios):
+        executar_episodio(ambiente, [agente], max_passos)
+        carro = ambiente.carros[0]
+        melhor_distancia = ambiente.carros_geneticos[0].melhor_distancia
+        distancias += melhor_distancia
+        if carro['posicao'] == ambiente.pos_meta:
+            chegadas += 1
+            total += carro['passos']
+        else:
+            total += max_passos + melhor_distancia
+    return chegadas, total / episodios, distancias / episodios
+
+class EvolucaoParalela:
+    """
+    Driver de evolução que distribui a avaliação de uma população de genes
+    por um ProcessPoolExecutor, usando todos os núcleos da máquina.
+    A população é uma PopulacaoGenetica; por padrão a seleção segue a regra
+    de main(): os dois mais rápidos geram os filhos e são mantidos na
+    geração seguinte.
+    """
+    def __init__(self, tamanho_populacao=32, episodios=5, max_passos=2000, processos=None,
+                 selecao='dois_melhores', elite=2, semente=None):
+        """
+        Args:
+            tamanho_populacao (int): Conjuntos de genes avaliados por geração
+            episodios (int): Episódios de treino por avaliação
+            max_passos (int): Limite de ticks por episódio avaliado
+            processos (int): Número de processos (Padrão: núcleos disponíveis)
+            selecao (str): Operador de seleção: 'dois_melhores', 'torneio' ou 'rank'
+            elite (int): Quantos melhores indivíduos passam sem alteração
+            semente (int): Semente da população e das sementes das avaliações
+
+        Raises:
+            ValueError: Se a população tiver menos de dois indivíduos ou a
+                elite estiver fora de 0..tamanho_populacao
+        """
+        if tamanho_populacao < 2:
+            raise ValueError("A população precisa de pelo menos dois indivíduos")
+        if not 0 <= elite <= tamanho_populacao:
+            raise ValueError(f"A elite deve estar entre 0 e {tamanho_populacao}: {elite}")
+        self.episodios = episodios
+        self.max_passos = max_passos
+        self.processos = processos or os.cpu_count()
+        self.selecao = selecao
+        self.elite = elite
+        self.populacao = PopulacaoGenetica(tamanho_populacao, semente)
+        self.geracao = 0
+
+    def avaliar(self, executor):
+        """
+        Avalia toda a população em paralelo e grava os resultados e o fitness
+        em self.populacao. Só conta como chegada à meta o indivíduo que chegou
+        em todos os episódios; os demais são ordenados pela PopulacaoGenetica
+        pela distância média alcançada (ver calcular_fitness).
+
+        Returns:
+            np.ndarray: Média de passos até a meta de cada indivíduo
+        """
+        sementes = self.populacao.rng.integers(0, 2**32, size=self.populacao.tamanho)
+        tarefas = [(self.populacao.obter_genes(i), self.episodios, self.max_passos, int(semente))
+                   for i, semente in enumerate(sementes)]
+        tamanho_lote = max(1, len(tarefas) // (self.processos * 4))
+        resultados = np.array(list(executor.map(avaliar_genes, tarefas, chunksize=tamanho_lote)))
+        chegadas, medias, distancias = resultados.T
+
+        self.populacao.chegou_meta = chegadas == self.episodios
+        self.populacao.tempo_chegada = medias
+        self.populacao.melhor_distancia = distancias
+        self.populacao.calcular_fitness()
+        return medias
+
+    def proxima_geracao(self):
+        """
+        Gera a nova população a partir do fitness da geração atual.
+
+        Returns:
+            Genes: Genes do melhor indivíduo da geração avaliada
+        """
+        melhor = self.populacao.obter_genes(int(np.argmax(self.populacao.fitness)))
+        self.populacao.nova_geracao(self.selecao, self.elite)
+        self.geracao += 1
+        return melhor
+
+    def executar(self, geracoes, verboso=True):
+        """
+        Executa várias gerações de avaliação paralela e seleção.
+
+        Args:
+            geracoes (int): Número de gerações
+            verboso (bool): Se True, imprime o resumo de cada geração
+
+        Returns:
+            list: Histórico com (melhor média de passos, genes do vencedor) por geração
+        """
+        historico = []
+        with ProcessPoolExecutor(max_workers=self.processos) as executor:
+            for _ in range(geracoes):
+                inicio = time.perf_counter()
+                medias = self.avaliar(executor)
+                # Média do vencedor, que pode não ser a menor: chegar em todos os episódios vem antes
+                melhor_media = float(medias[np.argmax(self.populacao.fitness)])
+                vencedor = self.proxima_geracao()
+                historico.append((melhor_media, vencedor))
+
+                if verboso:
+                    print(f"Geração {self.geracao}: melhor {melhor_media:.1f} passos | "
+                          f"Velocidade {vencedor.velocidade:.2f} Sensor {vencedor.sensor_perigo:.2f} "
+                          f"({time.perf_counter() - inicio:.2f}s)")
+        return historico
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando da evolução paralela.
+    Exemplo: python -m src.evolucao_paralela --populacao 64 --geracoes 20
+    """
+    parser = argparse.ArgumentParser(
+        description="Evolui os genes dos carros avaliando a população em vários processos.")
+    parser.add_argument('--populacao', type=int, default=32,
+                        help="Indivíduos por geração (Padrão: 32)")
+    parser.add_argument('--geracoes', type=int, default=10,
+                        help="Número de gerações (Padrão: 10)")
+    parser.add_argument('--episodios', type=int, default=5,
+                        help="Episódios de treino por avaliação (Padrão: 5)")
+    parser.add_argument('--max-passos', type=int, default=2000,
+                        help="Limite de ticks por episódio avaliado (Padrão: 2000)")
+    parser.add_argument('--processos', type=int, default=None,
+                        help="Número de processos (Padrão: núcleos disponíveis)")
+    parser.add_argument('--selecao', choices=PopulacaoGenetica.SELECOES, default='dois_melhores',
+                        help="Operador de seleção (Padrão: dois_melhores)")
+    parser.add_argument('--elite', type=int, default=2,
+                        help="Indivíduos mantidos sem alteração a cada geração (Padrão: 2)")
+    parser.add_argument('--semente', type=int, default=None,
+                        help="Semente da população e das avaliações")
+    args = parser.parse_args(argv)
+
+    try:
+        evolucao = EvolucaoParalela(
+            tamanho_populacao=args.populacao,
+            episodios=args.episodios,
+            max_passos=args.max_passos,
+            processos=args.processos,
+            selecao=args.selecao,
+            elite=args.elite,
+            semente=args.semente
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    evolucao.executar(args.geracoes)
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from ..util.constantes import CORES, TAMANHO_JANELA
 
 class MenuInicial:
     def __init__(self):
-        pygame.init()
+        # O Pygame já foi inicializado pelo programa principal
         self.tela = pygame.display.set_mode(TAMANHO_JANELA)
         pygame.display.set_caption("Configuração da Simulação")
         self.fonte = pygame.font.Font(None, 36)
@@ -67,4 +67,45 @@ class MenuPausa:
                         rect = pygame.Rect((TAMANHO_JANELA[0] - largura_opcao) // 2,
                                          pos_y, largura_opcao, altura_opcao)
                         if rect.collidepoint(mouse_pos):
-                            return i
\ No newline at end of file
+                            return i
+
+    def mostrar_estatisticas(self, instrumentacao, agentes=None, caminho='estatisticas.json'):
+        """
+        Mostra a tela de estatísticas com as medidas do loop da simulação.
+        A tecla S grava o resumo em um arquivo JSON; ESC volta à simulação.
+        
+        Args:
+            instrumentacao (Instrumentacao): Medidas coletadas no loop principal
+            agentes: Agentes cujas tabelas Q são exibidas
+            caminho (str): Arquivo onde o resumo é gravado
+        """
+        fonte_titulo = pygame.font.Font(None, 48)
+        fonte_linha = pygame.font.Font(None, 28)
+        mensagem = "S: salvar em arquivo | ESC: voltar"
+        
+        while True:
+            self.ambiente.tela.fill(CORES['BRANCO'])
+            titulo = fonte_titulo.render("Estatísticas", True, CORES['PRETO'])
+            self.ambiente.tela.blit(titulo, titulo.get_rect(center=(TAMANHO_JANELA[0]//2, 60)))
+            
+            # Linhas do resumo, uma abaixo da outra
+            pos_y = 120
+            for linha in instrumentacao.linhas_texto(agentes):
+                texto = fonte_linha.render(linha, True, CORES['PRETO'])
+                self.ambiente.tela.blit(texto, (100, pos_y))
+                pos_y += 30
+            
+            rodape = fonte_linha.render(mensagem, True, CORES['PRETO'])
+            self.ambiente.tela.blit(rodape, rodape.get_rect(center=(TAMANHO_JANELA[0]//2,
+                                                                    TAMANHO_JANELA[1] - 40)))
+            pygame.display.flip()
+            
+            evento = pygame.event.wait()
+            if evento.type == pygame.QUIT:
+                return
+            if evento.type == pygame.KEYDOWN:
+                if evento.key == pygame.K_ESCAPE:
+                    return
+                if evento.key == pygame.K_s:
+                    instrumentacao.salvar(caminho, agentes)
+                    mensagem = f"Salvo em {caminho} | ESC: voltar"
@@ -0,0 +1,162 @@
+# src/interface/renderizador.py
+
+import pygame
+import numpy as np
+from ..util.constantes import CORES, TAMANHO_JANELA
+
+class Renderizador:
+    """
+    Desenha um AmbienteCarro em uma janela Pygame.
+    É o único ponto do núcleo da simulação que depende do Pygame: o ambiente
+    só importa este módulo quando é criado no modo gráfico, então o treino
+    headless e os workers dos pools nunca carregam o Pygame nem o SDL.
+    """
+    def __init__(self, ambiente):
+        """
+        Inicializa o Pygame (se ainda não foi inicializado) e a janela.
+        Uma janela já aberta no tamanho certo, como a do menu inicial, é reaproveitada.
+
+        Args:
+            ambiente (AmbienteCarro): Ambiente a ser desenhado
+        """
+        if not pygame.get_init():
+            pygame.init()
+        tela = pygame.display.get_surface()
+        if tela is None or tela.get_size() != TAMANHO_JANELA:
+            tela = pygame.display.set_mode(TAMANHO_JANELA)
+        pygame.display.set_caption("Carros Autônomos - Versão Genética")
+        self.tela = tela
+        self.ambiente = ambiente
+
+        # Cache de renderização: fundo estático, fontes, rótulos e áreas sujas
+        self._fundo = None
+        self._fontes = {}
+        self._rotulos = {}
+        self._retangulos_sujos = []
+        self._redesenhar_tudo = True
+        # Rótulos com os genes sobre os carros (o replay desliga em logs sem genes)
+        self.mostrar_genes = True
+
+    def invalidar(self, fundo=False):
+        """
+        Força o redesenho completo da tela no próximo quadro.
+
+        Args:
+            fundo (bool): Se True, também reconstrói a camada estática em cache
+        """
+        self._redesenhar_tudo = True
+        if fundo:
+            self._fundo = None
+
+    def _obter_fonte(self, tamanho):
+        """Retorna uma fonte do tamanho pedido, criada apenas uma vez."""
+        fonte = self._fontes.get(tamanho)
+        if fonte is None:
+            fonte = self._fontes[tamanho] = pygame.font.Font(None, tamanho)
+        return fonte
+
+    def _rotulo_carro(self, genes):
+        """Retorna a superfície com os atributos genéticos, em cache por texto."""
+        info = f"V:{genes.velocidade:.1f} S:{genes.sensor_perigo:.1f}"
+        rotulo = self._rotulos.get(info)
+        if rotulo is None:
+            rotulo = self._rotulos[info] = self._obter_fonte(20).render(info, True, CORES['PRETO'])
+        return rotulo
+
+    def _construir_fundo(self):
+        """
+        Pré-renderiza a camada estática (labirinto, armadilhas e meta)
+        em uma superfície reaproveitada em todos os quadros.
+        """
+        ambiente = self.ambiente
+        grid = ambiente.GRID
+        fundo = pygame.Surface(self.tela.get_size()).convert()
+        fundo.fill(CORES['BRANCO'])
+
+        # Desenha o labirinto: um pixel por célula, ampliado para o tamanho do grid
+        pixels = np.where(ambiente.labirinto.T[..., None] == 1,
+                          np.array(CORES['PRETO'], dtype=np.uint8),
+                          np.array(CORES['BRANCO'], dtype=np.uint8))
+        paredes = pygame.surfarray.make_surface(pixels)
+        fundo.blit(pygame.transform.scale(paredes, (ambiente.COLUNAS * grid,
+                                                    ambiente.LINHAS * grid)), (0, 0))
+
+        # Desenha as armadilhas
+        for x, y in ambiente.armadilhas:
+            arm_x = x * grid + (grid - ambiente.TAMANHO_CARRO) // 2
+            arm_y = y * grid + (grid - ambiente.TAMANHO_CARRO) // 2
+            pygame.draw.rect(
+                fundo,
+                CORES['VERMELHO'],
+                (arm_x, arm_y,
+                 ambiente.TAMANHO_CARRO,
+                 ambiente.TAMANHO_CARRO)
+            )
+
+        # Desenha a meta
+        meta_x = ambiente.pos_meta[0] * grid + (grid - ambiente.TAMANHO_META) // 2
+        meta_y = ambiente.pos_meta[1] * grid + (grid - ambiente.TAMANHO_META) // 2
+        pygame.draw.rect(
+            fundo,
+            CORES['VERDE'],
+            (meta_x, meta_y,
+             ambiente.TAMANHO_META,
+             ambiente.TAMANHO_META)
+        )
+        return fundo
+
+    def renderizar(self):
+        """
+        Desenha o estado atual do ambiente na tela.
+        O labirinto, as armadilhas e a meta vêm de um fundo pré-renderizado;
+        a cada quadro só as áreas dos carros e do HUD são redesenhadas e
+        enviadas ao display.
+        """
+        ambiente = self.ambiente
+        grid = ambiente.GRID
+        if self._fundo is None:
+            self._fundo = self._construir_fundo()
+            self._redesenhar_tudo = True
+
+        # Apaga o quadro anterior restaurando o fundo nas áreas sujas
+        if self._redesenhar_tudo:
+            self.tela.blit(self._fundo, (0, 0))
+        else:
+            for retangulo in self._retangulos_sujos:
+                self.tela.blit(self._fundo, retangulo, retangulo)
+
+        # Desenha os carros com informações genéticas
+        novos_retangulos = []
+        for carro, carro_genetico in zip(ambiente.carros, ambiente.carros_geneticos):
+            x, y = carro['posicao']
+            car_x = x * grid + (grid - ambiente.TAMANHO_CARRO) // 2
+            car_y = y * grid + (grid - ambiente.TAMANHO_CARRO) // 2
+
+            # Desenha o carro
+            novos_retangulos.append(pygame.draw.rect(
+                self.tela,
+                carro['cor'],
+                (car_x, car_y,
+                 ambiente.TAMANHO_CARRO,
+                 ambiente.TAMANHO_CARRO)
+            ))
+
+            # Mostra atributos genéticos sobre o carro
+            if self.mostrar_genes:
+                rotulo = self._rotulo_carro(carro_genetico.genes)
+                novos_retangulos.append(self.tela.blit(rotulo, (car_x - 10, car_y - 15)))
+
+        # Mostra informações do episódio
+        info = f'Episódio: {ambiente.episodio}'
+        for i, carro in enumerate(ambiente.carros):
+            info += f' | Carro {i+1}: {carro["passos"]}'
+        texto = self._obter_fonte(36).render(info, True, CORES['PRETO'])
+        novos_retangulos.append(self.tela.blit(texto, (50, 50)))
+
+        # Atualiza apenas as áreas alteradas (anteriores e novas)
+        if self._redesenhar_tudo:
+            pygame.display.flip()
+            self._redesenhar_tudo = False
+        else:
+            pygame.display.update(self._retangulos_sujos + novos_retangulos)
+        self._retangulos_sujos = novos_retangulos
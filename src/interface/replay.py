@@ -0,0 +1,188 @@
+# src/interface/replay.py
+
+import argparse
+import numpy as np
+import pygame
+from ..agentes.carro_genetico import Genes
+from ..ambiente.ambiente_carro import AmbienteCarro
+from ..util.constantes import CORES, FPS, TAMANHO_JANELA
+from ..util.trajetoria import LeitorTrajetoria, aplicar_registros, estado_no_tick
+
+class Replay:
+    """
+    Visualizador offline de uma trajetória gravada pelo treino headless.
+    Desenha os episódios com o renderizador do AmbienteCarro a partir do log,
+    sem executar a simulação.
+
+    Controles:
+        ESPAÇO: pausa/continua       ←/→: volta/avança um tick
+        ↑/↓: mais/menos ticks por quadro (pular quadros)
+        N/P: próximo/anterior episódio   HOME/END: início/fim do episódio
+        0-9: salta para 0%-90% do episódio   ESC: sair
+    """
+    VELOCIDADES = (1, 2, 4, 8, 16, 32, 64, 128)  # Ticks avançados por quadro
+
+    def __init__(self, caminho, episodio=None, velocidade=1, fps=FPS):
+        """
+        Args:
+            caminho (str): Log gravado com --trajetoria
+            episodio (int): Episódio inicial (Padrão: o primeiro gravado)
+            velocidade (int): Ticks avançados por quadro
+            fps (int): Quadros por segundo da reprodução
+
+        Raises:
+            ValueError: Se o log não tiver nenhum episódio
+        """
+        self.leitor = LeitorTrajetoria(caminho)
+        if len(self.leitor.episodios) == 0:
+            raise ValueError(f"{caminho} não contém episódios")
+
+        labirinto, _, _ = self.leitor.mapa(int(self.leitor.episodios[0]))
+        self.ambiente = AmbienteCarro(num_carros=self.leitor.num_carros, dimensoes=labirinto.shape)
+        pygame.display.set_caption("Carros Autônomos - Replay")
+        self.fonte = pygame.font.Font(None, 28)
+        self.relogio = pygame.time.Clock()
+        self.fps = fps
+
+        self.velocidade = velocidade
+        self.pausado = False
+        indice = 0
+        if episodio is not None:
+            indice = int(np.searchsorted(self.leitor.episodios, episodio))
+        self.carregar_episodio(min(indice, len(self.leitor.episodios) - 1))
+
+    def carregar_episodio(self, indice):
+        """Carrega o mapa e os registros do indice-ésimo episódio gravado."""
+        self.indice = indice
+        self.registros = self.leitor.registros_episodio(indice)
+        self.total_ticks = int(self.registros['passo'][-1]) + 1 if len(self.registros) else 0
+
+        episodio = int(self.leitor.episodios[indice])
+        labirinto, armadilhas, meta = self.leitor.mapa(episodio)
+        if (not np.array_equal(labirinto, self.ambiente.labirinto)
+                or armadilhas != self.ambiente.armadilhas or meta != self.ambiente.pos_meta):
+            self.ambiente.armadilhas = armadilhas
+            self.ambiente.pos_meta = meta
+            self.ambiente.atualizar_labirinto(labirinto)
+        self.ambiente.episodio = episodio
+
+        # Genes gravados no log; sem eles os rótulos ficam ocultos em vez de
+        # mostrar os genes sorteados pelo AmbienteCarro do replay
+        genes = self.leitor.genes(episodio)
+        self.ambiente.renderizador.mostrar_genes = genes is not None
+        if genes is not None:
+            for carro_genetico, (velocidade, sensor) in zip(self.ambiente.carros_geneticos,
+                                                            genes.tolist()):
+                carro_genetico.genes = Genes(velocidade=velocidade, sensor_perigo=sensor)
+        self.ir_para(-1)
+
+    def ir_para(self, tick):
+        """Posiciona a reprodução ao final de um tick (-1 = antes do primeiro)."""
+        self.tick = max(-1, min(tick, self.total_ticks - 1))
+        self.posicoes, self.passos = estado_no_tick(self.registros, self.tick,
+                                                    self.leitor.num_carros)
+
+    def avancar(self, ticks):
+        """Avança a reprodução aplicando só os registros dos novos ticks."""
+        destino = min(self.tick + ticks, self.total_ticks - 1)
+        passos = self.registros['passo']
+        inicio = np.searchsorted(passos, self.tick, side='right')
+        fim = np.searchsorted(passos, destino, side='right')
+        aplicar_registros(self.posicoes, self.passos, self.registros[inicio:fim])
+        self.tick = destino
+
+    def processar_evento(self, evento):
+        """
+        Trata um evento de teclado.
+
+        Returns:
+            bool: False quando o replay deve ser encerrado
+        """
+        if evento.type == pygame.QUIT:
+            return False
+        if evento.type != pygame.KEYDOWN:
+            return True
+
+        tecla = evento.key
+        if tecla == pygame.K_ESCAPE:
+            return False
+        if tecla == pygame.K_SPACE:
+            self.pausado = not self.pausado
+        elif tecla == pygame.K_RIGHT:
+            self.avancar(1)
+        elif tecla == pygame.K_LEFT:
+            self.ir_para(self.tick - 1)
+        elif tecla == pygame.K_UP:
+            self.velocidade = next((v for v in self.VELOCIDADES if v > self.velocidade),
+                                   self.VELOCIDADES[-1])
+        elif tecla == pygame.K_DOWN:
+            self.velocidade = next((v for v in reversed(self.VELOCIDADES) if v < self.velocidade),
+                                   self.VELOCIDADES[0])
+        elif tecla == pygame.K_n:
+            self.carregar_episodio(min(self.indice + 1, len(self.leitor.episodios) - 1))
+        elif tecla == pygame.K_p:
+            self.carregar_episodio(max(self.indice - 1, 0))
+        elif tecla == pygame.K_HOME:
+            self.ir_para(-1)
+        elif tecla == pygame.K_END:
+            self.ir_para(self.total_ticks - 1)
+        elif pygame.K_0 <= tecla <= pygame.K_9:
+            self.ir_para((tecla - pygame.K_0) * self.total_ticks // 10)
+        return True
+
+    def desenhar(self):
+        """Copia o estado do tick atual para o ambiente e desenha o quadro."""
+        for carro, posicao, passos in zip(self.ambiente.carros, self.posicoes.tolist(),
+                                          self.passos.tolist()):
+            carro['posicao'] = tuple(posicao)
+            carro['passos'] = passos
+
+        # O texto do replay fica sobre o fundo, então o quadro é redesenhado inteiro
+        self.ambiente.invalidar_renderizacao()
+        self.ambiente.renderizar()
+
+        estado = 'pausado' if self.pausado else f'{self.velocidade}x'
+        info = (f"Tick {self.tick + 1}/{self.total_ticks} | {estado} | "
+                f"Episódio {self.indice + 1}/{len(self.leitor.episodios)}")
+        texto = self.fonte.render(info, True, CORES['PRETO'], CORES['CINZA'])
+        retangulo = self.ambiente.tela.blit(texto, (50, TAMANHO_JANELA[1] - 40))
+        pygame.display.update(retangulo)
+
+    def executar(self):
+        """Loop da reprodução até o usuário sair."""
+        rodando = True
+        while rodando:
+            for evento in pygame.event.get():
+                rodando = rodando and self.processar_evento(evento)
+
+            if not self.pausado:
+                if self.tick < self.total_ticks - 1:
+                    self.avancar(self.velocidade)
+                elif self.indice < len(self.leitor.episodios) - 1:
+                    self.carregar_episodio(self.indice + 1)
+                else:
+                    self.pausado = True
+
+            self.desenhar()
+            self.relogio.tick(self.fps)
+        pygame.quit()
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando do replay.
+    Exemplo: python -m src.interface.replay trajetoria.bin --episodio 10
+    """
+    parser = argparse.ArgumentParser(description="Reproduz uma trajetória gravada no treino headless.")
+    parser.add_argument('trajetoria', help="Log gravado com --trajetoria")
+    parser.add_argument('--episodio', type=int, default=None,
+                        help="Episódio inicial (Padrão: o primeiro gravado)")
+    parser.add_argument('--velocidade', type=int, default=1,
+                        help="Ticks avançados por quadro (Padrão: 1)")
+    parser.add_argument('--fps', type=int, default=FPS,
+                        help=f"Quadros por segundo (Padrão: {FPS})")
+    args = parser.parse_args(argv)
+
+    Replay(args.trajetoria, args.episodio, args.velocidade, args.fps).executar()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 # src/main.py
 
+import argparse
+import os
 import pygame
 from src.interface.menu_inicial import MenuInicial
 from src.interface.menu_pausa import MenuPausa
@@ -7,12 +9,23 @@ from src.ambiente.ambiente_carro import AmbienteCarro
 from src.agentes.agente_q_learning import AgenteQLearning
 from src.agentes.carro_genetico import CarroGenetico
 from src.util.constantes import FPS
+from src.util.checkpoint import SalvadorCheckpoint, carregar_checkpoint
+from src.util.instrumentacao import Instrumentacao
+from src.util.registro import RegistroMetricas, SILENCIOSO, RESUMO, DETALHADO
 
-def main():
+def main(caminho_checkpoint=None, intervalo_checkpoint=10, retomar=False,
+         caminho_registro=None, verbosidade=DETALHADO):
     """
     Função principal que coordena toda a simulação dos carros autônomos.
     Integra aspectos de aprendizado por reforço (Q-Learning) com evolução genética.
     Os carros aprendem tanto por experiência individual quanto por herança genética.
+    
+    Args:
+        caminho_checkpoint (str): Arquivo .npz onde o aprendizado é salvo (None = não salva)
+        intervalo_checkpoint (int): Salva em segundo plano a cada N episódios
+        retomar (bool): Se True e o checkpoint existir, continua a partir dele
+        caminho_registro (str): Arquivo .jsonl ou .csv do registro das gerações
+        verbosidade (int): Detalhe do registro no console (SILENCIOSO, RESUMO ou DETALHADO)
     """
     # Inicialização do ambiente Pygame
     pygame.init()
@@ -29,9 +42,22 @@ def main():
     agentes = [AgenteQLearning(i) for i in range(num_carros)]
     menu_pausa = MenuPausa(ambiente)
     
+    # Checkpoints periódicos em segundo plano
+    salvador = None
+    if caminho_checkpoint:
+        if retomar and os.path.exists(caminho_checkpoint):
+            carregar_checkpoint(caminho_checkpoint, ambiente, agentes)
+        salvador = SalvadorCheckpoint(caminho_checkpoint, intervalo_checkpoint)
+    
     # Configuração do relógio para controle de FPS
     clock = pygame.time.Clock()
     
+    # Medidas por fase do loop, exibidas na tela de estatísticas
+    instrumentacao = Instrumentacao()
+    
+    # Registro das gerações, escrito em segundo plano
+    registro = RegistroMetricas(caminho_registro, verbosidade)
+    
     # Loop principal do programa
     rodando = True
     while rodando:
@@ -45,11 +71,15 @@ def main():
                     if evento.key == pygame.K_ESCAPE:
                         menu_pausa.pausado = True
                         opcao = menu_pausa.mostrar()
+                        if opcao == 2:  # Estatísticas
+                            menu_pausa.mostrar_estatisticas(instrumentacao, agentes)
+                        ambiente.invalidar_renderizacao()
                         
                         # Tratamento das opções do menu de pausa
                         if opcao == 1:  # Reiniciar
                             ambiente = AmbienteCarro(num_carros=num_carros)
                             agentes = [AgenteQLearning(i) for i in range(num_carros)]
+                            instrumentacao.reiniciar()
                         elif opcao == 3:  # Sair
                             rodando = False
                             break
@@ -57,6 +87,10 @@ def main():
             if not rodando:
                 break
 
+            # Salva o aprendizado periodicamente antes de um novo episódio
+            if salvador:
+                salvador.talvez_salvar(ambiente, agentes)
+            
             # Início de um novo episódio
             estados = ambiente.reset_todos()
             terminado = False
@@ -70,14 +104,18 @@ def main():
             # Loop do episódio - continua até que dois carros cheguem à meta
             # ou até que todos os carros sejam eliminados
             while not terminado and rodando:
+                inicio_quadro = t = instrumentacao.agora()
+                
                 # Atualização de cada carro no ambiente
                 for i, (estado, agente) in enumerate(zip(estados, agentes)):
                     # Obtém ações válidas e escolhe uma usando Q-Learning
                     acoes_validas = ambiente.obter_acoes_validas(i)
                     acao = agente.escolher_acao(estado, acoes_validas)
+                    t = instrumentacao.registrar('acao', t)
                     
                     # Executa a ação e observa o resultado
                     proximo_estado, recompensa, fim = ambiente.executar_acao(i, acao)
+                    t = instrumentacao.registrar('passo', t)
                     
                     # Verifica se o carro chegou à meta
                     if proximo_estado == ambiente.pos_meta:
@@ -87,15 +125,10 @@ def main():
                             carro_genetico.chegou_meta = True
                             carro_genetico.tempo_chegada = ambiente.carros[i]['passos']
                             carros_completaram.append(carro_genetico)
-                            print(f"\nCarro {i+1} chegou à meta em {carro_genetico.tempo_chegada} passo!")
+                            registro.chegada(ambiente.episodio, i, carro_genetico.tempo_chegada)
                     
                     # Verifica se dois carros chegaram (condição de evolução genética)
                     if len(carros_completaram) >= 2:
-                        ambiente.registrar_geracao() # Registra dados da geração
-                        
-                        # Registra a geração atual
-                        ambiente.registrar_geracao
-                        
                         # Ordena os vencedores pelo tempo de chegada
                         vencedores = sorted(carros_completaram,
                                             key =lambda x: x.tempo_chegada)[:2]
@@ -106,14 +139,8 @@ def main():
                             vencedores[1].genes   # Genes do segundo colocado
                         )
                         
-                        # Mostra os novos genes que serão aplicados e os resultados da evolução
-                        print("\nDois carros completaram o percurso!")
-                        print(f"Primeiro: {vencedores[0].tempo_chegada} passos")
-                        print(f"Segundo: {vencedores[0].tempo_chegada} passos")
-                        print("\nNovos genes para a próxima geração:")
-                        print(f" Velocidade: {novos_genes.velocidade:.2f}")
-                        print(f" Sensor: {novos_genes.sensor_perigo:.2f}")
-                        print(f"{'='*50}\n")
+                        # Registra a geração, os vencedores e os novos genes
+                        ambiente.registrar_geracao(registro, vencedores, novos_genes)
                         
                         # Aplica os novos genes melhorados a todos os carros
                         # para a próxima geração
@@ -126,19 +153,25 @@ def main():
                     # O agente aprende com a experiência usando Q-Learning
                     proximas_acoes = ambiente.obter_acoes_validas(i)
                     agente.aprender(estado, acao, recompensa, 
-                                  proximo_estado, proximas_acoes)
+                                  proximo_estado, proximas_acoes, fim)
+                    t = instrumentacao.registrar('aprender', t)
                     
                     estados[i] = proximo_estado
                     terminado = terminado or fim
                 
                 # Renderização do estado atual do ambiente
                 ambiente.renderizar()
+                t = instrumentacao.registrar('renderizar', t)
                 
                 # Controle de FPS para manter a simulação em velocidade adequada
                 clock.tick(FPS)
+                t = instrumentacao.registrar('clock', t)
                 
                 # Verificação de eventos durante o episódio
-                for evento in pygame.event.get():
+                eventos = pygame.event.get()
+                instrumentacao.registrar('eventos', t)
+                instrumentacao.registrar_quadro(inicio_quadro)
+                for evento in eventos:
                     if evento.type == pygame.QUIT:
                         rodando = False
                         break
@@ -146,10 +179,14 @@ def main():
                         if evento.key == pygame.K_ESCAPE:
                             menu_pausa.pausado = True
                             opcao = menu_pausa.mostrar()
+                            if opcao == 2:  # Estatísticas
+                                menu_pausa.mostrar_estatisticas(instrumentacao, agentes)
+                            ambiente.invalidar_renderizacao()
                             
                             if opcao == 1:  # Reiniciar
                                 ambiente = AmbienteCarro(num_carros=num_carros)
                                 agentes = [AgenteQLearning(i) for i in range(num_carros)]
+                                instrumentacao.reiniciar()
                                 terminado = True
                             elif opcao == 3:  # Sair
                                 rodando = False
@@ -160,8 +197,27 @@ def main():
             print(f"Erro durante a execução: {e}")
             break
 
+    # Grava o último checkpoint e os registros pendentes antes de sair
+    registro.fechar()
+    if salvador:
+        salvador.fechar(ambiente, agentes)
+    
     # Limpeza e encerramento do Pygame
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Simulação de carros autônomos.")
+    parser.add_argument('--checkpoint', default=None,
+                        help="Arquivo .npz onde o aprendizado é salvo")
+    parser.add_argument('--intervalo-checkpoint', type=int, default=10,
+                        help="Salva o checkpoint a cada N episódios (Padrão: 10)")
+    parser.add_argument('--retomar', action='store_true',
+                        help="Continua a partir do checkpoint, se existir")
+    parser.add_argument('--registro', default=None,
+                        help="Registra gerações e carros neste arquivo .jsonl ou .csv")
+    parser.add_argument('--verbosidade', type=int, choices=[SILENCIOSO, RESUMO, DETALHADO],
+                        default=DETALHADO, help="Detalhe do console: 0 = nada, 1 = uma linha "
+                                                "por geração, 2 = cada carro (Padrão: 2)")
+    args = parser.parse_args()
+    main(args.checkpoint, args.intervalo_checkpoint, args.retomar,
+         args.registro, args.verbosidade)
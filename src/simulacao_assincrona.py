@@ -0,0 +1,277 @@
+# src/simulacao_assincrona.py
+
+import argparse
+import os
+import threading
+import time
+from dataclasses import dataclass
+import numpy as np
+import pygame
+from src.interface.menu_inicial import MenuInicial
+from src.interface.menu_pausa import MenuPausa
+from src.ambiente.ambiente_carro import AmbienteCarro
+from src.treino_headless import criar_agentes, executar_episodio, evoluir_geracao
+from src.util.aleatorio import FluxosExecucao
+from src.util.constantes import FPS
+from src.util.checkpoint import SalvadorCheckpoint, carregar_checkpoint
+from src.util.instrumentacao import Instrumentacao
+from src.util.registro import RegistroMetricas, SILENCIOSO, RESUMO, DETALHADO
+
+@dataclass
+class Instantaneo:
+    episodio: int           # Episódio em andamento
+    tick: int               # Tick total da simulação
+    posicoes: np.ndarray    # Posições (x, y) dos carros, formato (num_carros, 2)
+    passos: np.ndarray      # Passos de cada carro no episódio
+    genes: list             # Genes de cada carro (objetos imutáveis, só referências)
+    labirinto: np.ndarray   # Referência ao labirinto em uso
+    armadilhas: list        # Referência às armadilhas em uso
+
+class CanalInstantaneos:
+    """
+    Canal de um único lugar entre a thread da simulação e a de renderização.
+    A renderização pede um instantâneo e a simulação só o monta quando há
+    pedido, então publicar não custa nada nos ticks que ninguém vai desenhar.
+    Um instantâneo novo substitui o anterior; nenhum dos lados espera o outro.
+    """
+    def __init__(self):
+        self.pedido = True
+        self._ultimo = None
+        self._trava = threading.Lock()
+
+    def publicar(self, instantaneo):
+        """Substitui o instantâneo mais recente (chamado pela simulação)."""
+        with self._trava:
+            self._ultimo = instantaneo
+            self.pedido = False
+
+    def ultimo(self):
+        """Retorna o instantâneo mais recente e pede o próximo (chamado pela renderização)."""
+        with self._trava:
+            self.pedido = True
+            return self._ultimo
+
+class SimulacaoAssincrona:
+    """
+    Executa o treino (Q-Learning e evolução genética, com as regras de main())
+    em uma thread própria, sem renderização nem limite de FPS, publicando
+    instantâneos das posições no CanalInstantaneos.
+    """
+    def __init__(self, num_carros, tabela='dicionario', max_passos=None,
+                 ticks_por_segundo=None, salvador=None, caminho_checkpoint=None, registro=None,
+                 semente=None):
+        """
+        Args:
+            num_carros (int): Número de carros
+            tabela (str): Backend da tabela Q dos agentes: 'dicionario' ou 'densa'
+            max_passos (int): Limite de ticks por episódio (None = sem limite)
+            ticks_por_segundo (float): Limita a velocidade da simulação para
+                acompanhar em câmera lenta (None = velocidade máxima)
+            salvador (SalvadorCheckpoint): Salvador de checkpoints periódicos
+            caminho_checkpoint (str): Checkpoint a retomar, se existir
+            registro (RegistroMetricas): Registro das gerações (None = sem registro)
+            semente (int): Semente dos sorteios da simulação (None = aleatória)
+        """
+        fluxos = FluxosExecucao(semente, num_carros)
+        self.ambiente = AmbienteCarro(num_carros=num_carros, headless=True,
+                                      aleatorio=fluxos.execucao, aleatorios_carros=fluxos.sensores)
+        self.agentes = criar_agentes(self.ambiente, tabela, fluxos=fluxos)
+        if caminho_checkpoint and os.path.exists(caminho_checkpoint):
+            carregar_checkpoint(caminho_checkpoint, self.ambiente, self.agentes)
+
+        self.max_passos = max_passos
+        self.intervalo_tick = 1.0 / ticks_por_segundo if ticks_por_segundo else 0.0
+        self.salvador = salvador
+        self.registro = registro
+        self.instrumentacao = Instrumentacao()
+        self.canal = CanalInstantaneos()
+        self.ticks = 0
+        self.erro = None
+
+        self._parar = threading.Event()
+        self._continuar = threading.Event()
+        self._continuar.set()
+        # Sinalizado pela thread da simulação quando ela de fato parou em uma pausa
+        self._pausada = threading.Event()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+
+    def pausar(self):
+        """
+        Pausa a simulação ao final do tick atual e espera a thread parar, para
+        que ambiente e agentes possam ser lidos sem ela alterá-los ao mesmo tempo.
+        """
+        self._continuar.clear()
+        while self._thread.is_alive() and not self._pausada.wait(0.1):
+            pass
+
+    def continuar(self):
+        self._pausada.clear()
+        self._continuar.set()
+
+    def parar(self):
+        """Encerra a thread da simulação e espera seu término."""
+        self._parar.set()
+        self._continuar.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    @property
+    def rodando(self):
+        return self._thread.is_alive()
+
+    def _ao_tick(self):
+        """Publica o instantâneo pedido, aplica pausa e limite de velocidade."""
+        self.ticks += 1
+        if self.canal.pedido:
+            ambiente = self.ambiente
+            self.canal.publicar(Instantaneo(
+                episodio=ambiente.episodio,
+                tick=self.ticks,
+                posicoes=np.array([carro['posicao'] for carro in ambiente.carros], dtype=np.int32),
+                passos=np.array([carro['passos'] for carro in ambiente.carros], dtype=np.int32),
+                genes=[carro.genes for carro in ambiente.carros_geneticos],
+                labirinto=ambiente.labirinto,
+                armadilhas=ambiente.armadilhas,
+            ))
+        if self.intervalo_tick:
+            time.sleep(self.intervalo_tick)
+        if not self._continuar.is_set():
+            self._pausada.set()
+            self._continuar.wait()
+        return self._parar.is_set()
+
+    def _executar(self):
+        """Loop de episódios da thread de simulação."""
+        try:
+            while not self._parar.is_set():
+                if self.salvador:
+                    self.salvador.talvez_salvar(self.ambiente, self.agentes)
+                resultado = executar_episodio(self.ambiente, self.agentes, self.max_passos,
+                                              self.instrumentacao, ao_tick=self._ao_tick)
+                if len(resultado.completaram) >= 2:
+                    evoluir_geracao(self.ambiente, resultado.completaram, registro=self.registro,
+                                    ticks=resultado.ticks, truncado=resultado.truncado)
+                elif self.registro is not None:
+                    self.registro.geracao(self.ambiente, ticks=resultado.ticks,
+                                          truncado=resultado.truncado)
+        except Exception as e:
+            self.erro = e
+
+def aplicar_instantaneo(ambiente, instantaneo):
+    """
+    Copia um instantâneo para o ambiente usado apenas para desenhar.
+    Labirinto e armadilhas só são copiados quando a simulação os trocou.
+    """
+    if instantaneo.labirinto is not ambiente.labirinto or instantaneo.armadilhas is not ambiente.armadilhas:
+        ambiente.armadilhas = instantaneo.armadilhas
+        ambiente.atualizar_labirinto(instantaneo.labirinto)
+    ambiente.episodio = instantaneo.episodio
+    for carro, carro_genetico, posicao, passos, genes in zip(
+            ambiente.carros, ambiente.carros_geneticos, instantaneo.posicoes.tolist(),
+            instantaneo.passos.tolist(), instantaneo.genes):
+        carro['posicao'] = tuple(posicao)
+        carro['passos'] = passos
+        carro_genetico.genes = genes
+
+def main(caminho_checkpoint=None, intervalo_checkpoint=10, retomar=False,
+         tabela='dicionario', ticks_por_segundo=None, caminho_registro=None,
+         verbosidade=DETALHADO, semente=None):
+    """
+    Versão de main() com simulação e renderização desacopladas: o treino roda
+    em uma thread na velocidade máxima e a janela desenha, no FPS da tela,
+    o instantâneo mais recente publicado pela simulação.
+
+    Args:
+        caminho_checkpoint (str): Arquivo .npz onde o aprendizado é salvo (None = não salva)
+        intervalo_checkpoint (int): Salva em segundo plano a cada N episódios
+        retomar (bool): Se True e o checkpoint existir, continua a partir dele
+        tabela (str): Backend da tabela Q dos agentes: 'dicionario' ou 'densa'
+        ticks_por_segundo (float): Limite de velocidade da simulação (None = máxima)
+        caminho_registro (str): Arquivo .jsonl ou .csv do registro das gerações
+        verbosidade (int): Detalhe do registro no console (SILENCIOSO, RESUMO ou DETALHADO)
+        semente (int): Semente dos sorteios da simulação; reiniciar pelo menu
+            repete a mesma execução (None = aleatória)
+    """
+    pygame.init()
+    menu = MenuInicial()
+    num_carros = menu.mostrar()
+    if num_carros == 0:
+        pygame.quit()
+        return
+
+    # Ambiente só para desenhar; o estado real fica com a simulação
+    ambiente = AmbienteCarro(num_carros=num_carros)
+    menu_pausa = MenuPausa(ambiente)
+    clock = pygame.time.Clock()
+    salvador = SalvadorCheckpoint(caminho_checkpoint, intervalo_checkpoint) if caminho_checkpoint else None
+    registro = RegistroMetricas(caminho_registro, verbosidade)
+
+    def nova_simulacao(retomar_checkpoint):
+        simulacao = SimulacaoAssincrona(
+            num_carros, tabela, ticks_por_segundo=ticks_por_segundo, salvador=salvador,
+            caminho_checkpoint=caminho_checkpoint if retomar_checkpoint else None,
+            registro=registro, semente=semente)
+        simulacao.iniciar()
+        return simulacao
+
+    simulacao = nova_simulacao(retomar)
+    rodando = True
+    while rodando and simulacao.rodando:
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT:
+                rodando = False
+            elif evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE:
+                simulacao.pausar()
+                menu_pausa.pausado = True
+                opcao = menu_pausa.mostrar()
+                if opcao == 2:  # Estatísticas
+                    menu_pausa.mostrar_estatisticas(simulacao.instrumentacao, simulacao.agentes)
+                ambiente.invalidar_renderizacao()
+
+                if opcao == 1:  # Reiniciar
+                    simulacao.parar()
+                    simulacao = nova_simulacao(False)
+                elif opcao == 3:  # Sair
+                    rodando = False
+                simulacao.continuar()
+
+        instantaneo = simulacao.canal.ultimo()
+        if instantaneo is not None:
+            aplicar_instantaneo(ambiente, instantaneo)
+            ambiente.renderizar()
+        clock.tick(FPS)
+
+    simulacao.parar()
+    if simulacao.erro is not None:
+        print(f"Erro durante a execução: {simulacao.erro}")
+    registro.fechar()
+    if salvador:
+        salvador.fechar(simulacao.ambiente, simulacao.agentes)
+    pygame.quit()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Simulação de carros autônomos com treino e renderização em threads separadas.")
+    parser.add_argument('--checkpoint', default=None,
+                        help="Arquivo .npz onde o aprendizado é salvo")
+    parser.add_argument('--intervalo-checkpoint', type=int, default=10,
+                        help="Salva o checkpoint a cada N episódios (Padrão: 10)")
+    parser.add_argument('--retomar', action='store_true',
+                        help="Continua a partir do checkpoint, se existir")
+    parser.add_argument('--tabela', choices=['dicionario', 'densa'], default='dicionario',
+                        help="Backend da tabela Q dos agentes (Padrão: dicionario)")
+    parser.add_argument('--ticks-por-segundo', type=float, default=None,
+                        help="Limita a velocidade da simulação (Padrão: sem limite)")
+    parser.add_argument('--registro', default=None,
+                        help="Registra gerações e carros neste arquivo .jsonl ou .csv")
+    parser.add_argument('--verbosidade', type=int, choices=[SILENCIOSO, RESUMO, DETALHADO],
+                        default=DETALHADO, help="Detalhe do console: 0 = nada, 1 = uma linha "
+                                                "por geração, 2 = cada carro (Padrão: 2)")
+    parser.add_argument('--semente', type=int, default=None,
+                        help="Semente dos sorteios da simulação (Padrão: aleatória)")
+    args = parser.parse_args()
+    main(args.checkpoint, args.intervalo_checkpoint, args.retomar,
+         args.tabela, args.ticks_por_segundo, args.registro, args.verbosidade, args.semente)
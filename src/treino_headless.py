@@ -0,0 +1,620 @@
+# src/treino_headless.py
+
+import argparse
+import os
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from src.ambiente.ambiente_carro import AmbienteCarro
+from src.ambiente.frota_vetorizada import FrotaVetorizada
+from src.agentes.agente_q_learning import AgenteQLearning, AgenteQLearningDenso
+from src.agentes.agente_linear import ExtratorCaracteristicas, AgenteLinear, AprendizLinearFrota
+from src.agentes.aprendiz_frota import AprendizFrota
+from src.agentes.memoria_replay import MemoriaReplay
+from src.agentes.planejamento import ModeloDyna, aquecer_agentes
+from src.agentes.carro_genetico import CarroGenetico
+from src.util.aleatorio import FluxosExecucao
+from src.util.checkpoint import SalvadorCheckpoint, carregar_checkpoint
+from src.util.constantes import INDICE_ACAO
+from src.util.instrumentacao import Instrumentacao
+from src.util.trajetoria import abrir_gravador
+from src.util.registro import RegistroMetricas, SILENCIOSO, RESUMO, DETALHADO
+from src.util.convergencia import MonitorConvergencia, congelar_agentes, PARAR, CONGELAR
+
+@dataclass
+class ResultadoEpisodio:
+    passos: int = 0                 # Total de passos executados (somando todos os carros)
+    ticks: int = 0                  # Iterações do loop do episódio
+    completaram: list = field(default_factory=list)  # Carros que chegaram à meta
+    truncado: bool = False          # True se o episódio atingiu o limite de ticks
+
+def criar_agentes(ambiente, tabela='dicionario', capacidade_replay=0, lote_replay=32,
+                  passos_dyna=0, fluxos=None):
+    """
+    Cria um agente Q-Learning por carro do ambiente.
+
+    Args:
+        ambiente (AmbienteCarro): Ambiente cujos carros serão controlados
+        tabela (str): Backend da tabela Q: 'dicionario', 'densa' ou 'linear'
+            (aproximação linear sobre características, ver AgenteLinear)
+        capacidade_replay (int): Transições da memória de experiências de cada
+            agente (0 = sem replay; exige a tabela densa)
+        lote_replay (int): Transições reaprendidas por passo
+        passos_dyna (int): Atualizações simuladas do planejamento Dyna por passo
+            real, com um ModeloDyna por agente (0 = sem Dyna; exige a tabela densa)
+        fluxos (FluxosExecucao): Fluxos aleatórios da execução: cada agente explora
+            com o fluxo do seu carro (None = módulo random e sementes aleatórias)
+
+    Returns:
+        list: Agentes na ordem dos carros
+
+    Raises:
+        ValueError: Se a memória de experiências ou o Dyna forem pedidos sem
+            a tabela densa
+    """
+    if fluxos is not None:
+        aleatorios, semente = fluxos.exploracao, fluxos.semente_numpy
+    else:
+        aleatorios, semente = [None] * ambiente.num_carros, lambda: None
+    if tabela == 'densa':
+        return [AgenteQLearningDenso(i, dimensoes=(ambiente.LINHAS, ambiente.COLUNAS),
+                                     memoria=MemoriaReplay(capacidade_replay, semente())
+                                     if capacidade_replay else None,
+                                     tamanho_lote=lote_replay,
+                                     modelo=ModeloDyna(semente=semente()) if passos_dyna else None,
+                                     passos_planejamento=passos_dyna, aleatorio=aleatorios[i])
+                for i in range(ambiente.num_carros)]
+    if capacidade_replay:
+        raise ValueError("A memória de experiências exige a tabela 'densa' ou o modo vetorizado")
+    if passos_dyna:
+        raise ValueError("O planejamento Dyna exige a tabela 'densa' ou o modo vetorizado")
+    if tabela == 'linear':
+        extrator = ExtratorCaracteristicas(ambiente)
+        return [AgenteLinear(i, extrator, aleatorio=aleatorios[i]) for i in range(ambiente.num_carros)]
+    return [AgenteQLearning(i, aleatorios[i]) for i in range(ambiente.num_carros)]
+
+def executar_episodio(ambiente, agentes, max_passos=None, instrumentacao=None, gravador=None,
+                      ao_tick=None, aprender=True):
+    """
+    Executa um episódio completo sem renderização nem tratamento de eventos.
+    Segue as mesmas regras do loop de episódio de main(): o episódio termina
+    quando algum carro finaliza ou quando dois carros chegam à meta.
+
+    Args:
+        ambiente (AmbienteCarro): Ambiente da simulação
+        agentes (list): Lista de AgenteQLearning, um por carro
+        max_passos (int): Limite de ticks do episódio (None = sem limite)
+        instrumentacao (Instrumentacao): Se informada, mede o tempo de cada fase
+        gravador (GravadorTrajetoria): Se informado, grava cada passo dos carros
+        ao_tick (callable): Chamado sem argumentos ao final de cada tick; se
+            retornar True, o episódio é interrompido
+        aprender (bool): Se False, os agentes só agem (avaliação da política)
+
+    Returns:
+        ResultadoEpisodio: Estatísticas do episódio executado
+    """
+    resultado = ResultadoEpisodio()
+    estados = ambiente.reset_todos()
+    ambiente.episodio += 1
+    medir = instrumentacao is not None
+
+    terminado = False
+    while not terminado:
+        if medir:
+            inicio_quadro = t = instrumentacao.agora()
+        for i, (estado, agente) in enumerate(zip(estados, agentes)):
+            # Escolhe e executa a ação do carro
+            acoes_validas = ambiente.obter_acoes_validas(i)
+            acao = agente.escolher_acao(estado, acoes_validas)
+            if medir:
+                t = instrumentacao.registrar('acao', t)
+            proximo_estado, recompensa, fim = ambiente.executar_acao(i, acao)
+            resultado.passos += 1
+            if medir:
+                t = instrumentacao.registrar('passo', t)
+            if gravador:
+                gravador.acrescentar(ambiente.episodio, resultado.ticks, i, proximo_estado,
+                                     INDICE_ACAO[acao], recompensa, fim)
+
+            # Verifica se o carro chegou à meta
+            if proximo_estado == ambiente.pos_meta:
+                carro_genetico = ambiente.carros_geneticos[i]
+                if not carro_genetico.chegou_meta:
+                    carro_genetico.chegou_meta = True
+                    carro_genetico.tempo_chegada = ambiente.carros[i]['passos']
+                    resultado.completaram.append(carro_genetico)
+
+            # Dois carros na meta encerram o episódio (condição de evolução)
+            if len(resultado.completaram) >= 2:
+                terminado = True
+                break
+
+            # O agente aprende com a experiência usando Q-Learning
+            if aprender:
+                proximas_acoes = ambiente.obter_acoes_validas(i)
+                agente.aprender(estado, acao, recompensa,
+                                proximo_estado, proximas_acoes, fim)
+            if medir:
+                t = instrumentacao.registrar('aprender', t)
+
+            estados[i] = proximo_estado
+            terminado = terminado or fim
+
+        if medir:
+            instrumentacao.registrar_quadro(inicio_quadro)
+        resultado.ticks += 1
+        if ao_tick is not None and ao_tick():
+            resultado.truncado = not terminado
+            break
+        if not terminado and max_passos is not None and resultado.ticks >= max_passos:
+            resultado.truncado = True
+            break
+
+    return resultado
+
+def executar_episodio_vetorizado(frota, aprendiz, max_passos=None, instrumentacao=None,
+                                 gravador=None, aprender=True):
+    """
+    Executa um episódio com a frota e o aprendiz vetorizados.
+    Cada carro para ao terminar; o episódio acaba quando todos os carros
+    terminam ou quando dois carros chegam à meta.
+
+    Args:
+        frota (FrotaVetorizada): Motor de passos em lote
+        aprendiz (AprendizFrota): Aprendiz Q-Learning da frota
+        max_passos (int): Limite de ticks do episódio (None = sem limite)
+        instrumentacao (Instrumentacao): Se informada, mede o tempo de cada fase
+        gravador (GravadorTrajetoria): Se informado, grava cada passo dos carros ativos
+        aprender (bool): Se False, o aprendiz só age (avaliação da política)
+
+    Returns:
+        ResultadoEpisodio: Estatísticas do episódio executado
+    """
+    resultado = ResultadoEpisodio()
+    ambiente = frota.ambiente
+    posicoes = frota.reset()
+    mascaras = frota.mascaras_acoes_validas()
+    ambiente.episodio += 1
+    medir = instrumentacao is not None
+
+    while not frota.terminados.all():
+        if medir:
+            inicio_quadro = t = instrumentacao.agora()
+        ativos = ~frota.terminados
+        num_ativos = int(ativos.sum())
+        acoes = aprendiz.escolher_acoes(posicoes, mascaras)
+        if medir:
+            t = instrumentacao.registrar('acao', t, num_ativos)
+        proximas_posicoes, recompensas, fins = frota.passo(acoes)
+        proximas_mascaras = frota.mascaras_acoes_validas()
+        if medir:
+            t = instrumentacao.registrar('passo', t, num_ativos)
+        if gravador:
+            gravador.registrar(ambiente.episodio, resultado.ticks, np.flatnonzero(ativos),
+                               proximas_posicoes[ativos], acoes[ativos],
+                               recompensas[ativos], fins[ativos])
+        resultado.passos += num_ativos
+        resultado.ticks += 1
+
+        # Dois carros na meta encerram o episódio antes do aprendizado,
+        # como no loop de main()
+        if frota.chegou_meta.sum() >= 2:
+            break
+
+        if aprender:
+            aprendiz.aprender(posicoes, acoes, recompensas,
+                              proximas_posicoes, proximas_mascaras, ativos, fins)
+        posicoes, mascaras = proximas_posicoes, proximas_mascaras
+        if medir:
+            instrumentacao.registrar('aprender', t, num_ativos)
+            instrumentacao.registrar_quadro(inicio_quadro)
+
+        if max_passos is not None and resultado.ticks >= max_passos:
+            resultado.truncado = not frota.terminados.all()
+            break
+
+    # Registra o resultado do episódio nos carros genéticos
+    for carro_genetico, chegou, tempo, distancia in zip(
+            ambiente.carros_geneticos, frota.chegou_meta, frota.tempo_chegada,
+            frota.melhores_distancias):
+        carro_genetico.chegou_meta = bool(chegou)
+        carro_genetico.tempo_chegada = int(tempo) if chegou else float('inf')
+        carro_genetico.melhor_distancia = float(distancia)
+
+    # Carros que chegaram à meta, ordenados pelo tempo de chegada
+    for i in np.flatnonzero(frota.chegou_meta)[np.argsort(frota.tempo_chegada[frota.chegou_meta],
+                                                            kind='stable')]:
+        resultado.completaram.append(ambiente.carros_geneticos[i])
+
+    return resultado
+
+def evoluir_geracao(ambiente, completaram, verboso=False, registro=None, **extras):
+    """
+    Aplica a evolução genética a partir dos dois melhores carros do episódio:
+    os mais rápidos até a meta e, se faltarem, os que chegaram mais perto dela.
+
+    Args:
+        ambiente (AmbienteCarro): Ambiente cujos carros receberão os novos genes
+        completaram (list): Carros genéticos candidatos (normalmente os que
+            chegaram à meta no episódio)
+        verboso (bool): Se True e sem registro, imprime o registro detalhado da geração
+        registro (RegistroMetricas): Recebe a geração com os vencedores e os novos genes
+        **extras: Campos adicionais do registro da geração (ex.: ticks)
+
+    Returns:
+        Genes: Genes aplicados a todos os carros na próxima geração
+    """
+    vencedores = sorted(completaram, key=CarroGenetico.chave_progresso)[:2]
+    novos_genes = CarroGenetico.mutacao(vencedores[0].genes, vencedores[1].genes, ambiente.aleatorio)
+
+    if registro is not None:
+        registro.geracao(ambiente, vencedores, novos_genes, **extras)
+    elif verboso:
+        ambiente.registrar_geracao(vencedores=vencedores, novos_genes=novos_genes)
+
+    for carro in ambiente.carros_geneticos:
+        carro.genes = novos_genes
+
+    return novos_genes
+
+def executar_treino(num_carros, geracoes, max_passos=None, verboso=False,
+                    tabela='dicionario', vetorizado=False, caminho_checkpoint=None,
+                    intervalo_checkpoint=0, retomar=False, caminho_estatisticas=None,
+                    dimensoes=None, gerador=None, semente_labirinto=None,
+                    novo_labirinto=False, fator_modelagem=None, evoluir_por_progresso=False,
+                    caminho_trajetoria=None, capacidade_replay=0, lote_replay=32,
+                    planejar=False, passos_dyna=0, ao_fim_geracao=None,
+                    caminho_registro=None, verbosidade=None, criterios_convergencia=None,
+                    semente=None):
+    """
+    Treina os carros sem janela, sem limite de FPS e sem polling de eventos.
+    Cada geração corresponde a um episódio do ambiente.
+
+    Args:
+        num_carros (int): Número de carros da simulação
+        geracoes (int): Número de gerações (episódios) a executar
+        max_passos (int): Limite de ticks por episódio (None = sem limite)
+        verboso (bool): Se True, imprime o registro detalhado de cada geração
+            (atalho para verbosidade=DETALHADO)
+        tabela (str): Backend da tabela Q dos agentes: 'dicionario', 'densa' ou
+            'linear' (sem checkpoint, planejamento, memória nem Dyna)
+        vetorizado (bool): Se True, usa FrotaVetorizada e AprendizFrota (ou
+            AprendizLinearFrota com a tabela 'linear') em vez de um agente por carro
+        caminho_checkpoint (str): Arquivo .npz de checkpoint (None = sem checkpoints)
+        intervalo_checkpoint (int): Salva em segundo plano a cada N gerações
+            (0 = só ao final do treino)
+        retomar (bool): Se True e o checkpoint existir, continua a partir dele
+        caminho_estatisticas (str): Se informado, mede o tempo de cada fase do
+            loop e grava o resumo neste arquivo JSON ao final
+        dimensoes (tuple): (linhas, colunas) de um labirinto procedural
+            (None = grid derivado da janela)
+        gerador (str): Algoritmo do labirinto procedural (None = labirinto fixo)
+        semente_labirinto (int): Semente do primeiro labirinto procedural
+            (None = derivada de semente)
+        novo_labirinto (bool): Se True, gera um labirinto novo a cada geração
+            (a semente de cada um deriva de semente_labirinto, quando informada)
+        fator_modelagem (float): Peso da modelagem de recompensa pela distância
+            até a meta (None = PARAMS_APRENDIZAGEM['FATOR_MODELAGEM'])
+        evoluir_por_progresso (bool): Se True, evolui também quando menos de dois
+            carros chegam à meta, escolhendo os pais pela distância alcançada
+        caminho_trajetoria (str): Se informado, grava todos os passos neste log
+            mapeado em memória, para o replay (ver src.interface.replay)
+        capacidade_replay (int): Transições da memória de experiências (por agente,
+            ou compartilhada no modo vetorizado); 0 = sem memória
+        lote_replay (int): Transições da memória reaprendidas a cada passo
+        planejar (bool): Se True, inicializa as tabelas Q por iteração de valor
+            sobre o labirinto conhecido, no início e a cada labirinto novo
+        passos_dyna (int): Atualizações simuladas do planejamento Dyna por passo real
+        ao_fim_geracao (callable): Chamado como ao_fim_geracao(ambiente, resultado)
+            ao final de cada geração, antes da evolução; se retornar True, o
+            treino é encerrado após a geração
+        caminho_registro (str): Arquivo .jsonl ou .csv onde cada geração e cada
+            carro são registrados por uma thread de segundo plano
+        verbosidade (int): Detalhe do console: SILENCIOSO, RESUMO ou DETALHADO
+            (None = DETALHADO com verboso, senão SILENCIOSO)
+        criterios_convergencia (dict): Argumentos de um MonitorConvergencia que
+            mede cada geração e, quando o treino estabiliza, encerra o treino ou
+            congela o aprendizado para avaliar a política gulosa (None = desligado)
+        semente (int): Semente de todos os sorteios da execução (armadilhas, genes,
+            exploração e sensor de perigo, ver FluxosExecucao); a mesma semente
+            reproduz o treino bit a bit (None = aleatória)
+
+    Returns:
+        dict: Estatísticas do treino (passos, tempo, passos por segundo, a
+            semente usada e o MonitorConvergencia em 'convergencia', se houver)
+
+    Raises:
+        ValueError: Se a tabela 'linear' for combinada com checkpoint,
+            planejamento, memória de experiências ou Dyna
+    """
+    if tabela == 'linear' and (caminho_checkpoint or planejar or capacidade_replay or passos_dyna):
+        raise ValueError("A tabela 'linear' não suporta checkpoint, planejamento, "
+                         "memória de experiências nem Dyna")
+    fluxos = FluxosExecucao(semente, num_carros)
+    if semente_labirinto is None:
+        semente_labirinto = fluxos.semente_labirinto
+    ambiente = AmbienteCarro(num_carros=num_carros, headless=True, dimensoes=dimensoes,
+                             gerador=gerador, semente_labirinto=semente_labirinto,
+                             fator_modelagem=fator_modelagem, aleatorio=fluxos.execucao,
+                             aleatorios_carros=fluxos.sensores)
+    if vetorizado and tabela == 'linear':
+        frota = FrotaVetorizada(ambiente, fluxos.semente_numpy())
+        agentes = AprendizLinearFrota(num_carros, ExtratorCaracteristicas(ambiente),
+                                      semente=fluxos.semente_numpy())
+        modelos = []
+    elif vetorizado:
+        frota = FrotaVetorizada(ambiente, fluxos.semente_numpy())
+        memoria = MemoriaReplay(capacidade_replay, fluxos.semente_numpy()) if capacidade_replay else None
+        agentes = AprendizFrota(num_carros, (ambiente.LINHAS, ambiente.COLUNAS),
+                                semente=fluxos.semente_numpy(),
+                                memoria=memoria, tamanho_lote=lote_replay,
+                                modelo=ModeloDyna(semente=fluxos.semente_numpy()) if passos_dyna else None,
+                                passos_planejamento=passos_dyna)
+        modelos = [agentes.modelo]
+    else:
+        agentes = criar_agentes(ambiente, tabela, capacidade_replay, lote_replay, passos_dyna, fluxos)
+        modelos = [getattr(agente, 'modelo', None) for agente in agentes]
+    modelos = [modelo for modelo in modelos if modelo is not None]
+
+    salvador = None
+    retomado = False
+    if caminho_checkpoint:
+        if retomar and os.path.exists(caminho_checkpoint):
+            retomado = True
+            carregar_checkpoint(caminho_checkpoint, ambiente, agentes)
+            if vetorizado:
+                frota.atualizar_mapa()
+            if verboso:
+                print(f"Checkpoint retomado: geração {ambiente.episodio}")
+        salvador = SalvadorCheckpoint(caminho_checkpoint, intervalo_checkpoint)
+
+    if planejar and not retomado:
+        aquecer_agentes(ambiente, agentes)
+
+    if verbosidade is None:
+        verbosidade = DETALHADO if verboso else SILENCIOSO
+    registro = RegistroMetricas(caminho_registro, verbosidade)
+    instrumentacao = Instrumentacao() if caminho_estatisticas else None
+    gravador = abrir_gravador(caminho_trajetoria, ambiente) if caminho_trajetoria else None
+    monitor = MonitorConvergencia(**criterios_convergencia) if criterios_convergencia is not None else None
+    congelado = False
+    avaliacoes = 0
+
+    passos_totais = 0
+    evolucoes = 0
+    inicio = time.perf_counter()
+
+    for geracao in range(geracoes):
+        if novo_labirinto and geracao > 0:
+            ambiente.novo_labirinto(semente_labirinto + ambiente.episodio)
+            if vetorizado:
+                frota.atualizar_mapa()
+            if gravador:
+                gravador.registrar_mapa(ambiente)
+            for modelo in modelos:
+                modelo.limpar()
+            if planejar:
+                aquecer_agentes(ambiente, agentes)
+
+        if gravador:
+            gravador.registrar_genes(ambiente)
+        if vetorizado:
+            resultado = executar_episodio_vetorizado(frota, agentes, max_passos,
+                                                     instrumentacao, gravador, not congelado)
+        else:
+            resultado = executar_episodio(ambiente, agentes, max_passos, instrumentacao, gravador,
+                                          aprender=not congelado)
+        passos_totais += resultado.passos
+        parar = ao_fim_geracao is not None and ao_fim_geracao(ambiente, resultado)
+
+        if vetorizado and registro.ativo:
+            frota.sincronizar_ambiente()
+
+        # Convergência: mede a geração e, se estabilizou, para ou congela
+        extras = {'ticks': resultado.ticks, 'truncado': resultado.truncado}
+        if congelado:
+            avaliacoes += 1
+            extras['congelado'] = True
+            parar = parar or avaliacoes >= monitor.geracoes_avaliacao
+        elif monitor is not None:
+            extras.update(monitor.atualizar(ambiente, agentes))
+            if monitor.geracao_convergencia is not None:
+                if monitor.modo == CONGELAR and monitor.geracoes_avaliacao > 0:
+                    congelado = True
+                    congelar_agentes(agentes)
+                else:
+                    parar = True
+
+        candidatos = None
+        if congelado:
+            pass  # Sem evolução durante a avaliação da política congelada
+        elif len(resultado.completaram) >= 2:
+            candidatos = resultado.completaram
+        elif evoluir_por_progresso and num_carros >= 2:
+            candidatos = ambiente.carros_geneticos
+        if candidatos:
+            evoluir_geracao(ambiente, candidatos, registro=registro, **extras)
+            evolucoes += 1
+        else:
+            registro.geracao(ambiente, **extras)
+
+        if salvador:
+            salvador.talvez_salvar(ambiente, agentes)
+        if parar:
+            geracoes = geracao + 1
+            break
+
+    duracao = time.perf_counter() - inicio
+    registro.fechar()
+    if instrumentacao:
+        instrumentacao.salvar(caminho_estatisticas, agentes)
+        if verboso:
+            print('\n'.join(instrumentacao.linhas_texto(agentes)))
+    if salvador:
+        salvador.fechar(ambiente, agentes)
+    if gravador:
+        gravador.fechar()
+
+    return {
+        'geracoes': geracoes,
+        'passos': passos_totais,
+        'evolucoes': evolucoes,
+        'duracao': duracao,
+        'passos_por_segundo': passos_totais / duracao if duracao > 0 else float('inf'),
+        'ambiente': ambiente,
+        'agentes': agentes,
+        'semente': fluxos.semente,
+        'convergencia': monitor,
+    }
+
+def adicionar_argumentos_convergencia(parser):
+    """Adiciona ao parser as opções de convergência lidas por criterios_convergencia."""
+    grupo = parser.add_argument_group("convergência")
+    grupo.add_argument('--ao-convergir', choices=[PARAR, CONGELAR], default=None,
+                       help="Mede a convergência a cada geração e, quando o treino estabiliza, "
+                            "para ou congela o aprendizado para avaliar a política gulosa")
+    grupo.add_argument('--janela-convergencia', type=int, default=10,
+                       help="Gerações em que os critérios de convergência devem valer (Padrão: 10)")
+    grupo.add_argument('--tolerancia-q', type=float, default=0.05,
+                       help="Variação relativa média dos valores Q na janela, "
+                            "negativa = ignorar (Padrão: 0.05)")
+    grupo.add_argument('--tolerancia-genes', type=float, default=1e-3,
+                       help="Variância dos genes normalizados na janela, "
+                            "negativa = ignorar (Padrão: 0.001)")
+    grupo.add_argument('--sem-caminho-estavel', action='store_true',
+                       help="Não exige um caminho guloso estável até a meta para convergir")
+    grupo.add_argument('--geracoes-avaliacao', type=int, default=5,
+                       help="Gerações da avaliação gulosa com --ao-convergir congelar (Padrão: 5)")
+
+def criterios_convergencia(args, parser):
+    """
+    Monta os argumentos do MonitorConvergencia a partir das opções
+    --ao-convergir, --janela-convergencia, --tolerancia-q, --tolerancia-genes,
+    --sem-caminho-estavel e --geracoes-avaliacao (None sem --ao-convergir).
+    """
+    if args.ao_convergir is None:
+        return None
+    criterios = {
+        'janela': args.janela_convergencia,
+        'tolerancia_q': args.tolerancia_q if args.tolerancia_q >= 0 else None,
+        'caminho_estavel': not args.sem_caminho_estavel,
+        'tolerancia_genes': args.tolerancia_genes if args.tolerancia_genes >= 0 else None,
+        'modo': args.ao_convergir,
+        'geracoes_avaliacao': args.geracoes_avaliacao,
+    }
+    try:
+        MonitorConvergencia(**criterios)
+    except ValueError as e:
+        parser.error(str(e))
+    return criterios
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando do treino headless.
+    Exemplo: python -m src.treino_headless --carros 6 --geracoes 100
+    """
+    parser = argparse.ArgumentParser(
+        description="Treina os carros autônomos sem interface gráfica.")
+    parser.add_argument('--carros', type=int, default=6,
+                        help="Número de carros da simulação (Padrão: 6)")
+    parser.add_argument('--geracoes', type=int, default=100,
+                        help="Número de gerações a executar (Padrão: 100)")
+    parser.add_argument('--max-passos', type=int, default=10000,
+                        help="Limite de ticks por episódio, 0 = sem limite (Padrão: 10000)")
+    parser.add_argument('--tabela', choices=['dicionario', 'densa', 'linear'], default='dicionario',
+                        help="Backend da tabela Q dos agentes; 'linear' aproxima Q por "
+                             "características do mapa e dos genes (Padrão: dicionario)")
+    parser.add_argument('--vetorizado', action='store_true',
+                        help="Passa e treina toda a frota com operações vetorizadas")
+    parser.add_argument('--checkpoint', default=None,
+                        help="Arquivo .npz onde o estado do treino é salvo")
+    parser.add_argument('--intervalo-checkpoint', type=int, default=0,
+                        help="Salva o checkpoint a cada N gerações, 0 = só no final (Padrão: 0)")
+    parser.add_argument('--retomar', action='store_true',
+                        help="Continua o treino a partir do checkpoint, se existir")
+    parser.add_argument('--estatisticas', default=None,
+                        help="Mede cada fase do loop e grava o resumo neste arquivo JSON")
+    parser.add_argument('--labirinto', choices=['fixo', 'backtracker', 'sidewinder'],
+                        default='fixo', help="Labirinto fixo ou procedural (Padrão: fixo)")
+    parser.add_argument('--dimensoes', type=int, nargs=2, metavar=('LINHAS', 'COLUNAS'),
+                        default=None, help="Dimensões do labirinto procedural")
+    parser.add_argument('--semente', type=int, default=None,
+                        help="Semente de todos os sorteios do treino; a mesma semente "
+                             "reproduz a execução (Padrão: aleatória, impressa ao final)")
+    parser.add_argument('--semente-labirinto', type=int, default=None,
+                        help="Semente do labirinto procedural (Padrão: derivada de --semente)")
+    parser.add_argument('--novo-labirinto', action='store_true',
+                        help="Gera um labirinto procedural novo a cada geração")
+    parser.add_argument('--modelagem', type=float, default=None,
+                        help="Peso da modelagem de recompensa pela distância até a meta")
+    parser.add_argument('--evoluir-por-progresso', action='store_true',
+                        help="Evolui mesmo sem dois carros na meta, pela distância alcançada")
+    parser.add_argument('--trajetoria', default=None,
+                        help="Grava todos os passos neste log binário para o replay")
+    parser.add_argument('--memoria-replay', type=int, default=0,
+                        help="Capacidade da memória de experiências, 0 = sem memória "
+                             "(exige --tabela densa ou --vetorizado)")
+    parser.add_argument('--lote-replay', type=int, default=32,
+                        help="Transições da memória reaprendidas por passo (Padrão: 32)")
+    parser.add_argument('--planejar', action='store_true',
+                        help="Inicializa as tabelas Q por iteração de valor sobre o labirinto")
+    parser.add_argument('--dyna', type=int, default=0,
+                        help="Atualizações simuladas do planejamento Dyna por passo real, "
+                             "0 = sem Dyna (exige --tabela densa ou --vetorizado)")
+    parser.add_argument('--registro', default=None,
+                        help="Registra gerações e carros neste arquivo .jsonl ou .csv")
+    parser.add_argument('--verbosidade', type=int, choices=[SILENCIOSO, RESUMO, DETALHADO],
+                        default=None, help="Detalhe do console: 0 = nada, 1 = uma linha por "
+                                           "geração, 2 = cada carro (Padrão: 0, ou 2 com --verboso)")
+    adicionar_argumentos_convergencia(parser)
+    parser.add_argument('--verboso', action='store_true',
+                        help="Imprime o registro detalhado de cada geração")
+    args = parser.parse_args(argv)
+    if args.memoria_replay and args.tabela == 'dicionario' and not args.vetorizado:
+        parser.error("--memoria-replay exige --tabela densa ou --vetorizado")
+    if args.dyna and args.tabela == 'dicionario' and not args.vetorizado:
+        parser.error("--dyna exige --tabela densa ou --vetorizado")
+    if args.tabela == 'linear' and (args.checkpoint or args.planejar or args.memoria_replay
+                                    or args.dyna):
+        parser.error("--tabela linear não suporta --checkpoint, --planejar, "
+                     "--memoria-replay nem --dyna")
+
+    estatisticas = executar_treino(
+        num_carros=args.carros,
+        geracoes=args.geracoes,
+        max_passos=args.max_passos or None,
+        verboso=args.verboso,
+        tabela=args.tabela,
+        vetorizado=args.vetorizado,
+        caminho_checkpoint=args.checkpoint,
+        intervalo_checkpoint=args.intervalo_checkpoint,
+        retomar=args.retomar,
+        caminho_estatisticas=args.estatisticas,
+        dimensoes=tuple(args.dimensoes) if args.dimensoes else None,
+        gerador=None if args.labirinto == 'fixo' else args.labirinto,
+        semente_labirinto=args.semente_labirinto,
+        semente=args.semente,
+        novo_labirinto=args.novo_labirinto,
+        fator_modelagem=args.modelagem,
+        evoluir_por_progresso=args.evoluir_por_progresso,
+        caminho_trajetoria=args.trajetoria,
+        capacidade_replay=args.memoria_replay,
+        lote_replay=args.lote_replay,
+        planejar=args.planejar,
+        passos_dyna=args.dyna,
+        caminho_registro=args.registro,
+        verbosidade=args.verbosidade,
+        criterios_convergencia=criterios_convergencia(args, parser)
+    )
+
+    print(f"\nTreino concluído: {estatisticas['geracoes']} gerações, "
+          f"{estatisticas['evolucoes']} evoluções")
+    print(f"Passos: {estatisticas['passos']} em {estatisticas['duracao']:.2f}s "
+          f"({estatisticas['passos_por_segundo']:.0f} passos/s)")
+    print(f"Semente: {estatisticas['semente']}")
+    if estatisticas['convergencia'] is not None:
+        geracao = estatisticas['convergencia'].geracao_convergencia
+        print(f"Convergência: {'geração ' + str(geracao) if geracao is not None else 'não atingida'}")
+
+if __name__ == "__main__":
+    main()
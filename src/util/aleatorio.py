@@ -0,0 +1,97 @@
+# src/util/aleatorio.py
+
+import random
+import numpy as np
+
+# Quantos números cada FluxoAleatorio sorteia de uma vez
+TAMANHO_BLOCO = 4096
+
+def gerador_ou_padrao(aleatorio):
+    """
+    Retorna o gerador informado ou, se for None, o módulo random. Os objetos
+    guardam None em vez do módulo, que não pode ser serializado com pickle.
+    """
+    return random if aleatorio is None else aleatorio
+
+class FluxoAleatorio:
+    """
+    Fluxo de números aleatórios sobre um numpy.random.Generator, com a
+    parte da interface de random.Random usada pela simulação (random,
+    uniform, choice, sample e getrandbits).
+
+    Os números de random(), uniform() e choice() são sorteados em blocos de
+    TAMANHO_BLOCO por uma única chamada vetorizada e entregues um a um a
+    partir de uma lista e de um índice, então cada chamada custa bem menos que
+    um sorteio escalar do Generator. A sequência depende só da semente e da
+    ordem das chamadas, nunca do processo em que o fluxo roda, e o fluxo pode
+    ser serializado com pickle no meio da sequência.
+    """
+    def __init__(self, semente=None, tamanho_bloco=TAMANHO_BLOCO):
+        """
+        Args:
+            semente: Semente do Generator (int, SeedSequence ou None = aleatória)
+            tamanho_bloco (int): Números sorteados por bloco
+        """
+        self.rng = np.random.default_rng(semente)
+        self.tamanho_bloco = tamanho_bloco
+        self._bloco = []
+        self._indice = 0
+
+    def random(self):
+        """Número em [0, 1), tirado do bloco atual (reabastecido quando acaba)."""
+        indice = self._indice
+        if indice >= len(self._bloco):
+            self._bloco = self.rng.random(self.tamanho_bloco).tolist()
+            indice = 0
+        self._indice = indice + 1
+        return self._bloco[indice]
+
+    def uniform(self, a, b):
+        """Número em [a, b)."""
+        return a + (b - a) * self.random()
+
+    def choice(self, sequencia):
+        """Elemento sorteado de uma sequência não vazia."""
+        return sequencia[int(self.random() * len(sequencia))]
+
+    def sample(self, populacao, k):
+        """k elementos distintos da população, em ordem aleatória."""
+        return [populacao[i] for i in self.rng.choice(len(populacao), k, replace=False).tolist()]
+
+    def getrandbits(self, k):
+        """Inteiro com k bits aleatórios (k <= 63)."""
+        return int(self.rng.integers(0, 1 << k))
+
+class FluxosExecucao:
+    """
+    Todos os fluxos aleatórios de uma execução de treino, derivados de uma
+    única semente por numpy.random.SeedSequence:
+
+    - execucao: armadilhas, genes iniciais e mutações (um fluxo por execução);
+    - exploracao[i]: exploração epsilon-greedy do agente do carro i;
+    - sensores[i]: sorteios do sensor de perigo do carro i;
+    - semente_labirinto: semente do primeiro labirinto procedural;
+    - semente_numpy(): sementes independentes para os Generators dos
+      componentes vetorizados (frota, aprendizes, memórias e modelos Dyna).
+
+    Como cada carro tem fluxos próprios, a sequência de um carro não depende
+    de quantas vezes os outros sortearam, e a mesma semente reproduz a
+    execução bit a bit em qualquer processo, serial ou em paralelo.
+    """
+    def __init__(self, semente, num_carros):
+        """
+        Args:
+            semente (int): Semente da execução (None = aleatória)
+            num_carros (int): Número de carros da execução
+        """
+        raiz = np.random.SeedSequence(semente)
+        execucao, exploracao, sensores, labirinto, self._numpy = raiz.spawn(5)
+        self.semente = raiz.entropy
+        self.execucao = FluxoAleatorio(execucao)
+        self.exploracao = [FluxoAleatorio(s) for s in exploracao.spawn(num_carros)]
+        self.sensores = [FluxoAleatorio(s) for s in sensores.spawn(num_carros)]
+        self.semente_labirinto = int(labirinto.generate_state(1)[0])
+
+    def semente_numpy(self):
+        """Nova semente independente, na ordem dos pedidos, para um numpy.random.Generator."""
+        return self._numpy.spawn(1)[0]
@@ -0,0 +1,215 @@
+# src/util/checkpoint.py
+
+import os
+import queue
+import threading
+import numpy as np
+from .constantes import ACOES, INDICE_ACAO
+from ..agentes.carro_genetico import Genes
+from ..ambiente.gerador_labirinto import compactar_labirinto, descompactar_labirinto
+
+# Formato: arquivo .npz sem compressão, com um array por campo
+# (versão 2: labirinto compactado em um bit por célula)
+VERSAO_CHECKPOINT = 2
+
+def tabela_densa(agente, dimensoes):
+    """
+    Retorna a tabela Q de um agente como array float32 (linhas, colunas, 4),
+    convertendo a versão com dicionários quando necessário.
+    """
+    if isinstance(agente.tabela_q, np.ndarray):
+        return agente.tabela_q.copy()
+    tabela = np.zeros(dimensoes + (len(ACOES),), dtype=np.float32)
+    for (x, y), linha in agente.tabela_q.items():
+        for acao, valor in linha.items():
+            tabela[y, x, INDICE_ACAO[acao]] = valor
+    return tabela
+
+def _restaurar_tabela(agente, tabela):
+    """Carrega uma tabela densa em um agente, com dicionários ou array."""
+    if isinstance(agente.tabela_q, np.ndarray):
+        agente.tabela_q[...] = tabela
+        return
+    agente.tabela_q.clear()
+    for y, x, indice_acao in np.argwhere(tabela != 0):
+        agente.tabela_q[(int(x), int(y))][ACOES[indice_acao]] = float(tabela[y, x, indice_acao])
+
+def capturar_estado(ambiente, agentes):
+    """
+    Copia todo o estado de aprendizado para um dicionário de arrays.
+    A cópia é feita na thread chamadora, então a gravação pode acontecer em
+    segundo plano enquanto a simulação continua alterando os originais.
+
+    Args:
+        ambiente (AmbienteCarro): Ambiente com labirinto, armadilhas e carros genéticos
+        agentes: Lista de AgenteQLearning/AgenteQLearningDenso ou um AprendizFrota
+
+    Returns:
+        dict: Arrays prontos para np.savez
+    """
+    carros = ambiente.carros_geneticos
+    bits_labirinto, formato_labirinto = compactar_labirinto(ambiente.labirinto)
+    estado = {
+        'versao': np.array(VERSAO_CHECKPOINT),
+        'episodio': np.array(ambiente.episodio),
+        'labirinto_bits': bits_labirinto,
+        'formato_labirinto': np.array(formato_labirinto),
+        'armadilhas': np.array(ambiente.armadilhas, dtype=np.int32).reshape(-1, 2),
+        'genes': np.array([(c.genes.velocidade, c.genes.sensor_perigo) for c in carros]),
+        'chegou_meta': np.array([c.chegou_meta for c in carros], dtype=bool),
+        'tempo_chegada': np.array([c.tempo_chegada for c in carros], dtype=np.float64),
+    }
+
+    if hasattr(agentes, 'tabelas_q'):
+        # AprendizFrota: as tabelas já estão empilhadas
+        estado['tabelas_q'] = agentes.tabelas_q.copy()
+        estado['epsilons'] = agentes.epsilons.copy()
+        estado['taxas_aprendizagem'] = np.array(agentes.taxas_aprendizagem)
+    else:
+        dimensoes = (ambiente.LINHAS, ambiente.COLUNAS)
+        estado['tabelas_q'] = np.stack([tabela_densa(a, dimensoes) for a in agentes])
+        estado['epsilons'] = np.array([a.epsilon for a in agentes])
+        estado['taxas_aprendizagem'] = np.array([a.taxa_aprendizagem for a in agentes])
+    return estado
+
+def gravar_estado(caminho, estado):
+    """
+    Grava um estado capturado de forma atômica: escreve em um arquivo
+    temporário e só então substitui o checkpoint anterior.
+    """
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'wb') as arquivo:
+        np.savez(arquivo, **estado)
+    os.replace(temporario, caminho)
+
+def salvar_checkpoint(caminho, ambiente, agentes):
+    """Captura e grava o checkpoint imediatamente (bloqueante)."""
+    gravar_estado(caminho, capturar_estado(ambiente, agentes))
+
+def carregar_checkpoint(caminho, ambiente, agentes):
+    """
+    Restaura um checkpoint no ambiente e nos agentes já construídos.
+
+    Args:
+        caminho (str): Arquivo .npz gravado por salvar_checkpoint
+        ambiente (AmbienteCarro): Ambiente a restaurar
+        agentes: Lista de agentes ou AprendizFrota com o mesmo número de carros
+
+    Raises:
+        ValueError: Se o checkpoint não for compatível com o ambiente ou agentes
+    """
+    with np.load(caminho) as dados:
+        if int(dados['versao']) != VERSAO_CHECKPOINT:
+            raise ValueError(f"Versão de checkpoint não suportada: {int(dados['versao'])}")
+
+        tabelas = dados['tabelas_q']
+        if tabelas.shape[0] != ambiente.num_carros:
+            raise ValueError(f"Checkpoint tem {tabelas.shape[0]} carros, "
+                             f"o ambiente tem {ambiente.num_carros}")
+        formato = tuple(int(n) for n in dados['formato_labirinto'])
+        if formato != (ambiente.LINHAS, ambiente.COLUNAS):
+            raise ValueError(f"Checkpoint tem labirinto {formato}, "
+                             f"o ambiente tem {(ambiente.LINHAS, ambiente.COLUNAS)}")
+
+        # Ambiente: labirinto, armadilhas e contador de episódios
+        ambiente.episodio = int(dados['episodio'])
+        ambiente.armadilhas = [tuple(p) for p in dados['armadilhas'].tolist()]
+        ambiente.atualizar_labirinto(descompactar_labirinto(dados['labirinto_bits'], formato))
+
+        # Carros genéticos
+        for carro, genes, chegou, tempo in zip(ambiente.carros_geneticos, dados['genes'],
+                                               dados['chegou_meta'], dados['tempo_chegada']):
+            carro.genes = Genes(velocidade=float(genes[0]), sensor_perigo=float(genes[1]))
+            carro.chegou_meta = bool(chegou)
+            carro.tempo_chegada = float(tempo)
+
+        # Agentes
+        if hasattr(agentes, 'tabelas_q'):
+            agentes.tabelas_q[...] = tabelas
+            agentes.epsilons[...] = dados['epsilons']
+            agentes.taxas_aprendizagem = dados['taxas_aprendizagem'].copy()
+        else:
+            for agente, tabela, epsilon, taxa in zip(agentes, tabelas, dados['epsilons'],
+                                                     dados['taxas_aprendizagem']):
+                _restaurar_tabela(agente, tabela)
+                agente.epsilon = float(epsilon)
+                agente.taxa_aprendizagem = float(taxa)
+
+class SalvadorCheckpoint:
+    """
+    Grava checkpoints periódicos em uma thread de segundo plano.
+    O estado é copiado na thread da simulação e a gravação em disco acontece
+    na thread do salvador; se uma gravação ainda estiver pendente, apenas o
+    estado mais recente é mantido. Um erro de gravação (disco cheio, permissão)
+    encerra a thread e é relançado na próxima chamada de agendar ou fechar.
+    """
+    def __init__(self, caminho, intervalo=0):
+        """
+        Args:
+            caminho (str): Arquivo .npz de destino
+            intervalo (int): Salva a cada intervalo episódios (0 = só quando pedido)
+        """
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.erro = None
+        self._fila = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def _executar(self):
+        while True:
+            estado = self._fila.get()
+            if estado is None:
+                break
+            try:
+                gravar_estado(self.caminho, estado)
+            except Exception as e:
+                self.erro = e
+                break
+
+    def _verificar_erro(self):
+        """Relança o erro da última gravação que falhou, se houver."""
+        if self.erro is not None:
+            raise self.erro
+
+    def agendar(self, ambiente, agentes):
+        """
+        Captura o estado atual e agenda sua gravação sem bloquear.
+
+        Raises:
+            Exception: O erro de uma gravação anterior que falhou
+        """
+        self._verificar_erro()
+        estado = capturar_estado(ambiente, agentes)
+        try:
+            self._fila.get_nowait()  # Descarta um estado ainda não gravado
+        except queue.Empty:
+            pass
+        self._fila.put(estado)
+
+    def talvez_salvar(self, ambiente, agentes):
+        """Agenda uma gravação quando o episódio atual é múltiplo do intervalo."""
+        if self.intervalo and ambiente.episodio % self.intervalo == 0:
+            self.agendar(ambiente, agentes)
+
+    def fechar(self, ambiente=None, agentes=None):
+        """
+        Encerra a thread de gravação, esperando as gravações pendentes.
+        Se ambiente e agentes forem informados, grava um último checkpoint antes.
+
+        Raises:
+            Exception: O erro de uma gravação que falhou
+        """
+        try:
+            if ambiente is not None:
+                self.agendar(ambiente, agentes)
+        finally:
+            # A thread pode morrer por um erro com a fila cheia: nunca bloqueia no put
+            while self._thread.is_alive():
+                try:
+                    self._fila.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            self._thread.join()
+        self._verificar_erro()
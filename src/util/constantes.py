@@ -37,8 +37,24 @@ PARAMS_GENETICOS = {
 PARAMS_APRENDIZAGEM = {
     'TAXA_APRENDIZAGEM_BASE': 0.3,    # Taxa base de aprendizagem
     'INCREMENTO_TAXA': 0.1,          # Incremento para cada carro adicional
+    'TAXA_APRENDIZAGEM_MAXIMA': 1.0,  # Limite da taxa (acima de 1 a tabela Q diverge)
     'FATOR_DESCONTO': 0.95,           # Quanto importam as recompensas futuras
     'EPSILON_INICIAL': 1.0,           # Taxa inicial de exploração
     'EPSILON_MINIMO': 0.01,           # Taxa mínima de exploração
-    'EPSILON_DECAY': 0.995            # Taxa de decaimento da exploração
-}
\ No newline at end of file
+    'EPSILON_DECAY': 0.995,           # Taxa de decaimento da exploração
+    'FATOR_MODELAGEM': 0.0            # Peso da modelagem de recompensa por distância (0 = desligada)
+}
+
+# Recompensas de cada resultado de um passo
+RECOMPENSAS = {
+    'PASSO': -0.1,              # Movimento livre (ou carro parado pela velocidade)
+    'PAREDE': -10,              # Colisão com parede (termina o episódio do carro)
+    'ARMADILHA_EVITADA': -5,    # Sensor de perigo evitou a armadilha
+    'ARMADILHA': -20,           # Caiu na armadilha (termina o episódio do carro)
+    'META': 100                 # Chegou à meta (termina o episódio do carro)
+}
+
+# Ações dos carros, na ordem usada pelos índices inteiros, e seus deslocamentos (dx, dy)
+ACOES = ('cima', 'direita', 'baixo', 'esquerda')
+DESLOCAMENTOS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+INDICE_ACAO = {acao: i for i, acao in enumerate(ACOES)}
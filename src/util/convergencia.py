@@ -0,0 +1,191 @@
+# src/util/convergencia.py
+
+from collections import deque
+import numpy as np
+from .constantes import PARAMS_GENETICOS as PG
+from .checkpoint import tabela_densa
+from ..ambiente.ambiente_carro import BITS_MASCARA
+from ..ambiente.transicoes import LIVRE, META
+
+# O que fazer quando os critérios são atingidos: encerrar o treino ou
+# congelar o aprendizado e avaliar a política gulosa por algumas gerações
+PARAR, CONGELAR = 'parar', 'congelar'
+
+def tabelas_valores(ambiente, agentes):
+    """
+    Valores Q de cada carro como arrays (linhas, colunas, 4), para qualquer
+    tipo de agente: tabelas densas, dicionários ou aproximação linear.
+
+    Args:
+        ambiente (AmbienteCarro): Ambiente dos carros
+        agentes: Lista de agentes, AprendizFrota ou AprendizLinearFrota
+
+    Returns:
+        list: Uma tabela por carro
+    """
+    if hasattr(agentes, 'tabelas_q'):
+        return list(agentes.tabelas_q)
+    if hasattr(agentes, 'tabelas_valores'):
+        return list(agentes.tabelas_valores())
+    dimensoes = (ambiente.LINHAS, ambiente.COLUNAS)
+    return [agente.tabela_valores() if hasattr(agente, 'tabela_valores')
+            else tabela_densa(agente, dimensoes) for agente in agentes]
+
+def vetor_parametros(agentes, tabelas):
+    """
+    Parâmetros aprendidos em um único vetor: os pesos dos agentes lineares
+    ou, para os demais, as próprias tabelas Q.
+    """
+    if hasattr(agentes, 'pesos'):
+        return np.array(agentes.pesos, dtype=np.float64).ravel()
+    if isinstance(agentes, list) and agentes and all(hasattr(agente, 'pesos') for agente in agentes):
+        return np.concatenate([agente.pesos.ravel() for agente in agentes])
+    return np.concatenate([tabela.ravel() for tabela in tabelas]).astype(np.float64)
+
+def caminho_guloso(ambiente, tabela):
+    """
+    Segue a política gulosa de uma tabela Q a partir da posição inicial, pelo
+    modelo determinístico do labirinto (sem velocidade e sem sensor de perigo).
+
+    Args:
+        ambiente (AmbienteCarro): Ambiente com a tabela de transições atual
+        tabela (np.ndarray): Valores Q (linhas, colunas, 4)
+
+    Returns:
+        int: Passos até a meta, ou None se a política bate em parede ou
+            armadilha, fica sem ação ou entra em ciclo
+    """
+    validas = BITS_MASCARA[ambiente.mascaras_acoes]
+    gulosas = np.argmax(np.where(validas, tabela, -np.inf), axis=2).ravel().tolist()
+    sem_acao = (~validas.any(axis=2)).ravel().tolist()
+    transicoes = ambiente.transicoes
+    destinos = transicoes.destinos
+    tipos = transicoes.tipos
+
+    celula = ambiente.COLUNAS + 1  # Posição inicial (1, 1)
+    visitadas = {celula}
+    passos = 0
+    while not sem_acao[celula]:
+        acao = gulosas[celula]
+        tipo = tipos[celula, acao]
+        passos += 1
+        if tipo == META:
+            return passos
+        if tipo != LIVRE:
+            return None
+        celula = int(destinos[celula, acao])
+        if celula in visitadas:
+            return None
+        visitadas.add(celula)
+    return None
+
+def congelar_agentes(agentes):
+    """Zera a exploração de todos os agentes, para avaliar a política gulosa."""
+    if hasattr(agentes, 'epsilons'):
+        agentes.epsilons[:] = 0.0
+        return
+    for agente in agentes:
+        agente.epsilon = 0.0
+
+class MonitorConvergencia:
+    """
+    Acompanha, uma vez por geração, sinais baratos de que o treino estabilizou:
+
+    - variacao_q: norma da variação dos parâmetros aprendidos (tabelas Q ou
+      pesos) desde a geração anterior, relativa à norma atual (None na primeira);
+    - caminho_guloso: menor caminho até a meta seguindo a política gulosa
+      de algum carro (None se nenhum chega);
+    - variancia_genes: variância, ao longo da janela, da média dos genes
+      normalizados da frota.
+
+    O treino é considerado estável quando, em uma janela inteira de gerações,
+    a média de variacao_q fica abaixo de tolerancia_q, o caminho guloso chega
+    à meta sem mudar de tamanho e a variância dos genes fica abaixo de
+    tolerancia_genes. Critérios com tolerância None (ou caminho_estavel=False)
+    são ignorados.
+    """
+    def __init__(self, janela=10, tolerancia_q=0.05, caminho_estavel=True,
+                 tolerancia_genes=1e-3, modo=PARAR, geracoes_avaliacao=5, geracoes_minimas=0):
+        """
+        Args:
+            janela (int): Gerações consecutivas em que os critérios devem valer
+            tolerancia_q (float): Limite da média de variacao_q na janela
+            caminho_estavel (bool): Exige o mesmo caminho guloso até a meta na janela
+            tolerancia_genes (float): Limite da variância dos genes na janela
+            modo (str): PARAR encerra o treino; CONGELAR desliga o aprendizado,
+                a exploração e a evolução e segue por geracoes_avaliacao gerações
+            geracoes_avaliacao (int): Gerações de avaliação gulosa no modo CONGELAR
+            geracoes_minimas (int): Gerações antes das quais nunca para
+
+        Raises:
+            ValueError: Se o modo for desconhecido ou nenhum critério estiver ativo
+        """
+        if modo not in (PARAR, CONGELAR):
+            raise ValueError(f"Modo desconhecido: {modo} (opções: {PARAR}, {CONGELAR})")
+        if tolerancia_q is None and not caminho_estavel and tolerancia_genes is None:
+            raise ValueError("Ative ao menos um critério de convergência")
+        self.janela = janela
+        self.tolerancia_q = tolerancia_q
+        self.caminho_estavel = caminho_estavel
+        self.tolerancia_genes = tolerancia_genes
+        self.modo = modo
+        self.geracoes_avaliacao = geracoes_avaliacao
+        self.geracoes_minimas = geracoes_minimas
+
+        self.historico = []
+        self.geracao_convergencia = None
+        self._anterior = None
+        self._variacoes = deque(maxlen=janela)
+        self._caminhos = deque(maxlen=janela)
+        self._genes = deque(maxlen=janela)
+
+    def atualizar(self, ambiente, agentes):
+        """
+        Mede a geração que acabou de terminar. Deve ser chamado antes de a
+        evolução aplicar novos genes.
+
+        Returns:
+            dict: Métricas da geração (variacao_q, caminho_guloso, variancia_genes)
+        """
+        tabelas = tabelas_valores(ambiente, agentes)
+        parametros = vetor_parametros(agentes, tabelas)
+        if self._anterior is None or self._anterior.shape != parametros.shape:
+            variacao = None
+        else:
+            variacao = float(np.linalg.norm(parametros - self._anterior)
+                             / max(np.linalg.norm(parametros), 1e-12))
+        self._anterior = parametros.copy()
+        self._variacoes.append(variacao)
+
+        caminho = None
+        if self.caminho_estavel:
+            caminhos = [c for c in (caminho_guloso(ambiente, t) for t in tabelas) if c is not None]
+            caminho = min(caminhos, default=None)
+        self._caminhos.append(caminho)
+
+        self._genes.append([np.mean([c.genes.velocidade for c in ambiente.carros_geneticos])
+                            / PG['VELOCIDADE_MAX'],
+                            np.mean([c.genes.sensor_perigo for c in ambiente.carros_geneticos])
+                            / PG['SENSOR_MAX']])
+        variancia = float(np.var(self._genes, axis=0).sum())
+
+        metricas = {'variacao_q': variacao, 'caminho_guloso': caminho, 'variancia_genes': variancia}
+        self.historico.append({'geracao': ambiente.episodio, **metricas})
+        if self.geracao_convergencia is None and ambiente.episodio >= self.geracoes_minimas \
+                and self.convergiu():
+            self.geracao_convergencia = ambiente.episodio
+        return metricas
+
+    def convergiu(self):
+        """True se todos os critérios ativos valem na última janela inteira."""
+        if len(self._variacoes) < self.janela:
+            return False
+        if self.tolerancia_q is not None and (None in self._variacoes
+                                              or np.mean(self._variacoes) >= self.tolerancia_q):
+            return False
+        if self.caminho_estavel and (self._caminhos[0] is None
+                                     or any(c != self._caminhos[0] for c in self._caminhos)):
+            return False
+        if self.tolerancia_genes is not None and np.var(self._genes, axis=0).sum() >= self.tolerancia_genes:
+            return False
+        return True
@@ -0,0 +1,154 @@
+# src/util/instrumentacao.py
+
+import json
+import time
+from collections import deque
+import numpy as np
+
+def tamanho_tabela_q(agente):
+    """
+    Retorna quantos pares estado-ação já foram aprendidos e quantos bytes a
+    tabela Q ocupa, para agentes com dicionários ou com array denso. Para
+    aprendizes lineares, conta os pesos não nulos.
+
+    Returns:
+        tuple: (entradas, bytes)
+    """
+    tabela = getattr(agente, 'tabela_q', None)
+    if tabela is None:
+        tabela = agente.pesos
+    if isinstance(tabela, np.ndarray):
+        return int(np.count_nonzero(tabela)), int(tabela.nbytes)
+    entradas = sum(len(linha) for linha in tabela.values())
+    return entradas, None
+
+class Instrumentacao:
+    """
+    Temporizadores e contadores de baixo custo para o loop da simulação.
+    Cada fase é medida encadeando timestamps: registrar() devolve o instante
+    atual, que serve de início da próxima fase, então cada fase custa uma
+    única chamada a time.perf_counter().
+    """
+    FASES = ('acao', 'passo', 'aprender', 'renderizar', 'clock', 'eventos')
+
+    def __init__(self, janela_quadros=1000):
+        """
+        Args:
+            janela_quadros (int): Quantos tempos de quadro recentes guardar
+                para o cálculo dos percentis
+        """
+        self.janela_quadros = janela_quadros
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Zera todos os tempos e contadores."""
+        self.tempos = dict.fromkeys(self.FASES, 0.0)
+        self.contagens = dict.fromkeys(self.FASES, 0)
+        self.quadros = deque(maxlen=self.janela_quadros)
+        self.inicio = time.perf_counter()
+
+    @staticmethod
+    def agora():
+        return time.perf_counter()
+
+    def registrar(self, fase, inicio, quantidade=1):
+        """
+        Soma o tempo desde inicio à fase e conta quantidade operações.
+
+        Args:
+            fase (str): Uma das FASES
+            inicio (float): Instante do início da fase (time.perf_counter)
+            quantidade (int): Operações realizadas (ex.: carros passados no lote)
+
+        Returns:
+            float: Instante atual, para encadear a próxima fase
+        """
+        agora = time.perf_counter()
+        self.tempos[fase] += agora - inicio
+        self.contagens[fase] += quantidade
+        return agora
+
+    def registrar_quadro(self, inicio):
+        """Registra a duração de um quadro (tick completo do loop)."""
+        agora = time.perf_counter()
+        self.quadros.append(agora - inicio)
+        return agora
+
+    def resumo(self, agentes=None):
+        """
+        Consolida as medidas em um dicionário serializável.
+
+        Args:
+            agentes: Lista de agentes ou AprendizFrota para medir as tabelas Q
+
+        Returns:
+            dict: Passos/s, aprendizados/s, tempo por fase, percentis do quadro
+                e tamanho da tabela Q por agente
+        """
+        duracao = max(time.perf_counter() - self.inicio, 1e-9)
+        total_fases = sum(self.tempos.values()) or 1e-9
+        resumo = {
+            'duracao': duracao,
+            'passos': self.contagens['passo'],
+            'aprendizados': self.contagens['aprender'],
+            'passos_por_segundo': self.contagens['passo'] / duracao,
+            'aprendizados_por_segundo': self.contagens['aprender'] / duracao,
+            'fases': {
+                fase: {
+                    'segundos': self.tempos[fase],
+                    'percentual': 100 * self.tempos[fase] / total_fases,
+                    'contagem': self.contagens[fase],
+                }
+                for fase in self.FASES
+            },
+        }
+
+        if self.quadros:
+            quadros_ms = np.array(self.quadros) * 1000
+            p50, p95, p99 = np.percentile(quadros_ms, [50, 95, 99])
+            resumo['quadro_ms'] = {'p50': p50, 'p95': p95, 'p99': p99,
+                                   'maximo': float(quadros_ms.max())}
+
+        if agentes is not None:
+            if hasattr(agentes, 'tabelas_q'):
+                # AprendizFrota: conta as entradas aprendidas de cada carro
+                entradas = np.count_nonzero(agentes.tabelas_q.reshape(agentes.num_carros, -1), axis=1)
+                bytes_por_carro = agentes.tabelas_q[0].nbytes if agentes.num_carros else 0
+                resumo['tabelas_q'] = [{'entradas': int(e), 'bytes': int(bytes_por_carro)}
+                                       for e in entradas]
+            elif hasattr(agentes, 'pesos'):
+                # AprendizLinearFrota: um único vetor de pesos para a frota
+                resumo['tabelas_q'] = [dict(zip(('entradas', 'bytes'), tamanho_tabela_q(agentes)))]
+            else:
+                resumo['tabelas_q'] = [dict(zip(('entradas', 'bytes'), tamanho_tabela_q(a)))
+                                       for a in agentes]
+        return resumo
+
+    def linhas_texto(self, agentes=None):
+        """
+        Formata o resumo em linhas curtas, para console ou para a tela de estatísticas.
+
+        Returns:
+            list: Linhas de texto
+        """
+        resumo = self.resumo(agentes)
+        linhas = [
+            f"Tempo: {resumo['duracao']:.1f}s",
+            f"Passos/s: {resumo['passos_por_segundo']:.0f}  "
+            f"Aprendizados/s: {resumo['aprendizados_por_segundo']:.0f}",
+        ]
+        for fase, dados in resumo['fases'].items():
+            if dados['contagem']:
+                linhas.append(f"  {fase}: {dados['segundos']:.2f}s ({dados['percentual']:.1f}%)")
+        if 'quadro_ms' in resumo:
+            q = resumo['quadro_ms']
+            linhas.append(f"Quadro (ms): p50 {q['p50']:.2f}  p95 {q['p95']:.2f}  "
+                          f"p99 {q['p99']:.2f}  máx {q['maximo']:.2f}")
+        for i, tabela in enumerate(resumo.get('tabelas_q', [])):
+            linhas.append(f"Carro {i+1}: {tabela['entradas']} entradas na tabela Q")
+        return linhas
+
+    def salvar(self, caminho, agentes=None):
+        """Grava o resumo em um arquivo JSON."""
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.resumo(agentes), arquivo, indent=2)
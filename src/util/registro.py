@@ -0,0 +1,241 @@
+# src/util/registro.py
+
+import csv
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+# Níveis de detalhe da saída no console
+SILENCIOSO, RESUMO, DETALHADO = range(3)
+
+# Colunas da saída CSV (uma tabela única para todos os tipos de registro)
+COLUNAS_CSV = ('tipo', 'episodio', 'carro', 'velocidade', 'sensor_perigo', 'passos',
+               'chegou_meta', 'tempo_chegada', 'melhor_distancia', 'ticks', 'truncado',
+               'chegaram', 'vencedores', 'tempos_vencedores', 'nova_velocidade',
+               'novo_sensor', 'variacao_q', 'caminho_guloso', 'variancia_genes', 'congelado',
+               'instante')
+
+def _finito(valor):
+    """Troca infinito por None, para que o registro seja JSON válido."""
+    return None if valor == float('inf') else valor
+
+def registros_geracao(ambiente, vencedores=None, novos_genes=None, **extras):
+    """
+    Monta os registros de uma geração: um por carro e um resumo da geração.
+    Deve ser chamado antes de os novos genes serem aplicados aos carros.
+
+    Args:
+        ambiente (AmbienteCarro): Ambiente ao final do episódio
+        vencedores (list): Carros genéticos escolhidos como pais (None = sem evolução)
+        novos_genes (Genes): Genes da próxima geração (None = sem evolução)
+        **extras: Campos adicionais do resumo (ex.: ticks, truncado)
+
+    Returns:
+        list: Dicionários prontos para as saídas
+    """
+    episodio = ambiente.episodio
+    registros = []
+    for carro, carro_genetico in zip(ambiente.carros, ambiente.carros_geneticos):
+        registros.append({
+            'tipo': 'carro',
+            'episodio': episodio,
+            'carro': carro_genetico.indice,
+            'velocidade': carro_genetico.genes.velocidade,
+            'sensor_perigo': carro_genetico.genes.sensor_perigo,
+            'passos': carro['passos'],
+            'chegou_meta': carro_genetico.chegou_meta,
+            'tempo_chegada': _finito(carro_genetico.tempo_chegada),
+            'melhor_distancia': _finito(carro_genetico.melhor_distancia),
+        })
+
+    resumo = {
+        'tipo': 'geracao',
+        'episodio': episodio,
+        'chegaram': sum(carro.chegou_meta for carro in ambiente.carros_geneticos),
+        'instante': time.time(),
+        **extras,
+    }
+    if vencedores is not None:
+        resumo['vencedores'] = [v.indice for v in vencedores]
+        resumo['tempos_vencedores'] = [_finito(v.tempo_chegada) for v in vencedores]
+    if novos_genes is not None:
+        resumo['nova_velocidade'] = novos_genes.velocidade
+        resumo['novo_sensor'] = novos_genes.sensor_perigo
+    registros.append(resumo)
+    return registros
+
+def formatar_registros(registros, verbosidade=DETALHADO):
+    """
+    Converte registros em texto para o console.
+    RESUMO gera uma linha por geração; DETALHADO acrescenta, antes dela,
+    cada carro e cada chegada à meta, como no antigo registro impresso da geração.
+
+    Returns:
+        str: Texto a imprimir (vazio se nada for exibido nesse nível)
+    """
+    linhas = []
+    carros = [r for r in registros if r['tipo'] == 'carro']
+    for registro in registros:
+        tipo = registro['tipo']
+        if tipo == 'chegada' and verbosidade >= DETALHADO:
+            linhas.append(f"Carro {registro['carro'] + 1} chegou à meta em {registro['passos']} passos!")
+        if tipo == 'geracao' and verbosidade >= DETALHADO:
+            linhas.append(f"\n{'=' * 50}\nGeração {registro['episodio']}\n{'=' * 50}")
+            linhas.append("\nCarros da geração:")
+            for carro in carros:
+                linhas.append(f"\nCarro {carro['carro'] + 1}:")
+                linhas.append(f" Velocidade: {carro['velocidade']:.2f}")
+                linhas.append(f" Sensor: {carro['sensor_perigo']:.2f}")
+                linhas.append(f" Passos: {carro['passos']}")
+                linhas.append(f" Chegou à meta: {'Sim' if carro['chegou_meta'] else 'Não'}")
+                if carro['chegou_meta']:
+                    linhas.append(f" Tempo até meta: {carro['tempo_chegada']}")
+            if 'vencedores' in registro:
+                linhas.append("\nVencedores que gerarão a próxima geração:")
+                por_indice = {carro['carro']: carro for carro in carros}
+                for posicao, indice in enumerate(registro['vencedores']):
+                    vencedor = por_indice[indice]
+                    linhas.append(f"\nVencedor {posicao + 1} (carro {indice + 1}):")
+                    linhas.append(f"  Velocidade: {vencedor['velocidade']:.2f}")
+                    linhas.append(f"  Sensor: {vencedor['sensor_perigo']:.2f}")
+                    linhas.append(f"  Tempo até meta: {registro['tempos_vencedores'][posicao]}")
+            if 'nova_velocidade' in registro:
+                linhas.append("\nNovos genes para a próxima geração:")
+                linhas.append(f" Velocidade: {registro['nova_velocidade']:.2f}")
+                linhas.append(f" Sensor: {registro['novo_sensor']:.2f}")
+            linhas.append('=' * 50)
+        if tipo == 'geracao' and verbosidade >= RESUMO:
+            linha = f"Geração {registro['episodio']}: {registro['chegaram']} na meta"
+            if 'ticks' in registro:
+                estado = 'truncado' if registro.get('truncado') else 'concluído'
+                linha += f", {registro['ticks']} ticks ({estado})"
+            if 'nova_velocidade' in registro:
+                linha += (f" | novos genes: velocidade {registro['nova_velocidade']:.2f}"
+                          f" sensor {registro['novo_sensor']:.2f}")
+            linhas.append(linha)
+    return '\n'.join(linhas)
+
+class SaidaJsonl:
+    """Grava um registro JSON por linha."""
+    def __init__(self, caminho):
+        self._arquivo = open(caminho, 'w', encoding='utf-8')
+
+    def escrever(self, registros):
+        self._arquivo.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in registros)
+
+    def fechar(self):
+        self._arquivo.close()
+
+class SaidaCsv:
+    """Grava todos os registros em uma tabela CSV com as colunas de COLUNAS_CSV."""
+    def __init__(self, caminho):
+        self._arquivo = open(caminho, 'w', newline='', encoding='utf-8')
+        self._escritor = csv.DictWriter(self._arquivo, fieldnames=COLUNAS_CSV, extrasaction='ignore')
+        self._escritor.writeheader()
+
+    def escrever(self, registros):
+        for registro in registros:
+            self._escritor.writerow({chave: ';'.join(map(str, valor)) if isinstance(valor, list) else valor
+                                     for chave, valor in registro.items()})
+
+    def fechar(self):
+        self._arquivo.close()
+
+class SaidaConsole:
+    """Imprime os registros no console conforme a verbosidade."""
+    def __init__(self, verbosidade=RESUMO, fluxo=None):
+        self.verbosidade = verbosidade
+        self.fluxo = fluxo or sys.stdout
+
+    def escrever(self, registros):
+        texto = formatar_registros(registros, self.verbosidade)
+        if texto:
+            self.fluxo.write(texto + '\n')
+            self.fluxo.flush()
+
+    def fechar(self):
+        pass
+
+def saida_arquivo(caminho):
+    """
+    Cria a saída de arquivo pelo formato da extensão (.csv ou JSONL nos demais casos).
+    """
+    if os.path.splitext(caminho)[1].lower() == '.csv':
+        return SaidaCsv(caminho)
+    return SaidaJsonl(caminho)
+
+class RegistroMetricas:
+    """
+    Registro estruturado das gerações sem print dentro do loop da simulação.
+    Os registros são acumulados em memória e entregues por geração a uma
+    thread de segundo plano, que os grava nas saídas (arquivo JSONL/CSV e,
+    opcionalmente, o console). A simulação nunca espera a escrita.
+    """
+    def __init__(self, caminho=None, verbosidade=SILENCIOSO, saidas=None):
+        """
+        Args:
+            caminho (str): Arquivo .jsonl ou .csv dos registros (None = sem arquivo)
+            verbosidade (int): SILENCIOSO, RESUMO ou DETALHADO para o console
+            saidas (list): Saídas adicionais (objetos com escrever e fechar)
+        """
+        self.saidas = list(saidas or [])
+        if caminho:
+            self.saidas.append(saida_arquivo(caminho))
+        if verbosidade > SILENCIOSO:
+            self.saidas.append(SaidaConsole(verbosidade))
+
+        self._pendentes = []
+        self._fila = queue.Queue()
+        self._thread = None
+        if self.saidas:
+            self._thread = threading.Thread(target=self._executar, daemon=True)
+            self._thread.start()
+
+    @property
+    def ativo(self):
+        """True se há alguma saída (sem saídas, registrar não faz nada)."""
+        return self._thread is not None
+
+    def _executar(self):
+        while True:
+            registros = self._fila.get()
+            if registros is None:
+                break
+            for saida in self.saidas:
+                saida.escrever(registros)
+
+    def chegada(self, episodio, carro, passos):
+        """Acumula a chegada de um carro à meta (gravada com a próxima geração)."""
+        if self.ativo:
+            self._pendentes.append({'tipo': 'chegada', 'episodio': episodio,
+                                    'carro': carro, 'passos': passos})
+
+    def geracao(self, ambiente, vencedores=None, novos_genes=None, **extras):
+        """
+        Registra a geração atual (ver registros_geracao) e entrega à thread de
+        escrita tudo o que foi acumulado. Deve ser chamado antes de aplicar os novos genes.
+        """
+        if not self.ativo:
+            return
+        self._pendentes.extend(registros_geracao(ambiente, vencedores, novos_genes, **extras))
+        self.descarregar()
+
+    def descarregar(self):
+        """Entrega os registros acumulados à thread de escrita, sem esperar."""
+        if self._pendentes:
+            self._fila.put(self._pendentes)
+            self._pendentes = []
+
+    def fechar(self):
+        """Entrega os registros pendentes, espera a escrita e fecha as saídas."""
+        if not self.ativo:
+            return
+        self.descarregar()
+        self._fila.put(None)
+        self._thread.join()
+        self._thread = None
+        for saida in self.saidas:
+            saida.fechar()
@@ -0,0 +1,296 @@
+# src/util/trajetoria.py
+
+import numpy as np
+from ..ambiente.gerador_labirinto import compactar_labirinto, descompactar_labirinto
+
+# Formato do arquivo: cabeçalho fixo seguido de registros de tamanho fixo
+MAGICO = b'TRAJCARR'
+VERSAO_TRAJETORIA = 1
+
+DTYPE_CABECALHO = np.dtype([
+    ('magico', 'S8'),
+    ('versao', '<u4'),
+    ('tamanho_registro', '<u4'),
+    ('num_carros', '<u4'),
+    ('reservado', '<u4'),
+    ('quantidade', '<u8'),
+])
+
+# Um registro por passo de carro (20 bytes)
+DTYPE_REGISTRO = np.dtype([
+    ('episodio', '<u4'),
+    ('passo', '<u4'),       # Tick do episódio em que a ação foi executada
+    ('carro', '<u2'),
+    ('x', '<u2'),           # Posição após a ação
+    ('y', '<u2'),
+    ('acao', 'u1'),         # Índice em ACOES
+    ('fim', 'u1'),
+    ('recompensa', '<f4'),
+])
+
+def caminho_mapas(caminho):
+    """Arquivo auxiliar com os labirintos usados na trajetória."""
+    return f"{caminho}.mapas.npz"
+
+class GravadorTrajetoria:
+    """
+    Grava os passos do treino em um log binário mapeado em memória.
+    Os registros são escritos em lote direto no arquivo mapeado, que cresce
+    dobrando de capacidade; o número de registros válidos fica no cabeçalho.
+    Os labirintos (que podem mudar por geração) e os genes dos carros em cada
+    episódio vão para um .npz auxiliar.
+
+    O loop escalar usa acrescentar(), que acumula tuplas e as descarrega em
+    blocos de tamanho_lote; o loop vetorizado grava lotes com registrar().
+    """
+    def __init__(self, caminho, num_carros, capacidade_inicial=1 << 16, tamanho_lote=4096):
+        """
+        Args:
+            caminho (str): Arquivo do log (sobrescrito se existir)
+            num_carros (int): Número de carros gravados
+            capacidade_inicial (int): Registros reservados no início
+            tamanho_lote (int): Registros acumulados por acrescentar() antes de gravar
+        """
+        self.caminho = caminho
+        self.num_carros = num_carros
+        self.quantidade = 0
+        self.tamanho_lote = tamanho_lote
+        self._pendentes = []
+        self._mapas = {}
+        self._genes = {}
+        self._ultimos_genes = None
+
+        cabecalho = np.zeros(1, dtype=DTYPE_CABECALHO)
+        cabecalho['magico'] = MAGICO
+        cabecalho['versao'] = VERSAO_TRAJETORIA
+        cabecalho['tamanho_registro'] = DTYPE_REGISTRO.itemsize
+        cabecalho['num_carros'] = num_carros
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(cabecalho.tobytes())
+
+        self._registros = None
+        self._redimensionar(capacidade_inicial)
+
+    def _redimensionar(self, capacidade):
+        """Aumenta o arquivo e remapeia a área de registros."""
+        if self._registros is not None:
+            self._registros.flush()
+            self._registros = None
+        with open(self.caminho, 'r+b') as arquivo:
+            arquivo.truncate(DTYPE_CABECALHO.itemsize + capacidade * DTYPE_REGISTRO.itemsize)
+        self._registros = np.memmap(self.caminho, dtype=DTYPE_REGISTRO, mode='r+',
+                                    offset=DTYPE_CABECALHO.itemsize, shape=(capacidade,))
+        self.capacidade = capacidade
+
+    def _reservar(self, n):
+        """Garante espaço para mais n registros e retorna a fatia onde escrevê-los."""
+        if self.quantidade + n > self.capacidade:
+            self._redimensionar(max(2 * self.capacidade, self.quantidade + n))
+        lote = self._registros[self.quantidade:self.quantidade + n]
+        self.quantidade += n
+        return lote
+
+    def _descarregar(self):
+        """Grava os registros acumulados por acrescentar()."""
+        if self._pendentes:
+            self._reservar(len(self._pendentes))[:] = np.array(self._pendentes, dtype=DTYPE_REGISTRO)
+            self._pendentes.clear()
+
+    def acrescentar(self, episodio, passo, carro, posicao, acao, recompensa, fim):
+        """Acrescenta um único passo de carro, gravado em blocos."""
+        self._pendentes.append((episodio, passo, carro, posicao[0], posicao[1], acao, fim, recompensa))
+        if len(self._pendentes) >= self.tamanho_lote:
+            self._descarregar()
+
+    def registrar(self, episodio, passo, carros, posicoes, acoes, recompensas, fins):
+        """
+        Acrescenta um lote de passos (normalmente um tick de todos os carros ativos).
+
+        Args:
+            episodio (int): Episódio atual
+            passo (int): Tick do episódio
+            carros (array-like): Índices dos carros
+            posicoes (array-like): Posições (x, y) após a ação, formato (n, 2)
+            acoes (array-like): Índices das ações executadas
+            recompensas (array-like): Recompensas recebidas
+            fins (array-like): Se cada carro terminou neste passo
+        """
+        self._descarregar()
+        carros = np.asarray(carros)
+        n = len(carros)
+        if n == 0:
+            return
+
+        posicoes = np.asarray(posicoes).reshape(n, 2)
+        lote = self._reservar(n)
+        lote['episodio'] = episodio
+        lote['passo'] = passo
+        lote['carro'] = carros
+        lote['x'] = posicoes[:, 0]
+        lote['y'] = posicoes[:, 1]
+        lote['acao'] = acoes
+        lote['fim'] = fins
+        lote['recompensa'] = recompensas
+
+    def registrar_mapa(self, ambiente):
+        """
+        Guarda o labirinto, as armadilhas e a meta válidos a partir do
+        próximo episódio. Deve ser chamado no início e a cada troca de labirinto.
+        """
+        bits, formato = compactar_labirinto(ambiente.labirinto)
+        self._mapas[ambiente.episodio + 1] = (bits, formato, list(ambiente.armadilhas),
+                                              ambiente.pos_meta)
+
+    def registrar_genes(self, ambiente):
+        """
+        Guarda os genes (velocidade, sensor_perigo) de cada carro válidos a partir
+        do próximo episódio, se mudaram desde o último registro. Deve ser
+        chamado antes de cada episódio.
+        """
+        genes = [(c.genes.velocidade, c.genes.sensor_perigo) for c in ambiente.carros_geneticos]
+        if genes != self._ultimos_genes:
+            self._genes[ambiente.episodio + 1] = genes
+            self._ultimos_genes = genes
+
+    def fechar(self):
+        """Grava a quantidade no cabeçalho, ajusta o tamanho do arquivo e salva os mapas."""
+        if self._registros is None:
+            return
+        self._descarregar()
+        self._registros.flush()
+        self._registros = None
+
+        with open(self.caminho, 'r+b') as arquivo:
+            cabecalho = np.frombuffer(arquivo.read(DTYPE_CABECALHO.itemsize),
+                                      dtype=DTYPE_CABECALHO).copy()
+            cabecalho['quantidade'] = self.quantidade
+            arquivo.seek(0)
+            arquivo.write(cabecalho.tobytes())
+            arquivo.truncate(DTYPE_CABECALHO.itemsize + self.quantidade * DTYPE_REGISTRO.itemsize)
+
+        mapas = {'episodios': np.array(sorted(self._mapas), dtype=np.int64)}
+        for i, episodio in enumerate(mapas['episodios']):
+            bits, formato, armadilhas, meta = self._mapas[episodio]
+            mapas[f'labirinto_{i}'] = bits
+            mapas[f'formato_{i}'] = np.array(formato)
+            mapas[f'armadilhas_{i}'] = np.array(armadilhas, dtype=np.int32).reshape(-1, 2)
+            mapas[f'meta_{i}'] = np.array(meta)
+        mapas['episodios_genes'] = np.array(sorted(self._genes), dtype=np.int64)
+        mapas['genes'] = np.array([self._genes[e] for e in mapas['episodios_genes']],
+                                  dtype=np.float64).reshape(-1, self.num_carros, 2)
+        with open(caminho_mapas(self.caminho), 'wb') as arquivo:
+            np.savez(arquivo, **mapas)
+
+class LeitorTrajetoria:
+    """
+    Leitura de um log gravado por GravadorTrajetoria, sem carregar o arquivo
+    inteiro: os registros são um memmap somente leitura.
+    """
+    def __init__(self, caminho):
+        """
+        Raises:
+            ValueError: Se o arquivo não for um log de trajetória compatível
+        """
+        with open(caminho, 'rb') as arquivo:
+            cabecalho = np.frombuffer(arquivo.read(DTYPE_CABECALHO.itemsize), dtype=DTYPE_CABECALHO)
+        if len(cabecalho) != 1 or cabecalho['magico'][0] != MAGICO:
+            raise ValueError(f"{caminho} não é um log de trajetória")
+        if cabecalho['versao'][0] != VERSAO_TRAJETORIA:
+            raise ValueError(f"Versão de trajetória não suportada: {cabecalho['versao'][0]}")
+
+        self.num_carros = int(cabecalho['num_carros'][0])
+        quantidade = int(cabecalho['quantidade'][0])
+        if quantidade:
+            self.registros = np.memmap(caminho, dtype=DTYPE_REGISTRO, mode='r',
+                                       offset=DTYPE_CABECALHO.itemsize, shape=(quantidade,))
+        else:
+            self.registros = np.zeros(0, dtype=DTYPE_REGISTRO)
+
+        # Início de cada episódio no log (os registros estão em ordem de episódio)
+        episodios = np.asarray(self.registros['episodio'])
+        novo = np.ones(quantidade, dtype=bool)
+        novo[1:] = episodios[1:] != episodios[:-1]
+        self._inicios = np.flatnonzero(novo)
+        self._fins = np.append(self._inicios[1:], quantidade)
+        self.episodios = episodios[self._inicios].astype(np.int64)
+
+        with np.load(caminho_mapas(caminho)) as dados:
+            self._mapas = []
+            for i, episodio in enumerate(dados['episodios']):
+                formato = tuple(int(n) for n in dados[f'formato_{i}'])
+                self._mapas.append((
+                    int(episodio),
+                    descompactar_labirinto(dados[f'labirinto_{i}'], formato),
+                    [tuple(p) for p in dados[f'armadilhas_{i}'].tolist()],
+                    tuple(int(n) for n in dados[f'meta_{i}']),
+                ))
+            # Logs antigos não têm genes
+            self._episodios_genes = dados['episodios_genes'] if 'episodios_genes' in dados else None
+            self._genes = dados['genes'] if 'genes' in dados else None
+
+    def registros_episodio(self, indice):
+        """Registros do indice-ésimo episódio gravado (fatia do memmap)."""
+        return self.registros[self._inicios[indice]:self._fins[indice]]
+
+    def mapa(self, episodio):
+        """
+        Retorna o mapa válido em um episódio.
+
+        Returns:
+            tuple: (labirinto, armadilhas, pos_meta)
+        """
+        atual = self._mapas[0]
+        for mapa in self._mapas:
+            if mapa[0] <= episodio:
+                atual = mapa
+        return atual[1:]
+
+    def genes(self, episodio):
+        """
+        Retorna os genes dos carros em um episódio.
+
+        Returns:
+            np.ndarray: (velocidade, sensor_perigo) de cada carro, formato
+                (num_carros, 2), ou None se o log não gravou os genes
+        """
+        if self._genes is None or len(self._genes) == 0:
+            return None
+        indice = max(int(np.searchsorted(self._episodios_genes, episodio, side='right')) - 1, 0)
+        return self._genes[indice]
+
+def aplicar_registros(posicoes, passos, registros):
+    """
+    Atualiza em lugar posições e passos dos carros com um trecho de registros,
+    usando a última posição de cada carro no trecho.
+
+    Args:
+        posicoes (np.ndarray): Posições (num_carros, 2) a atualizar
+        passos (np.ndarray): Passos (num_carros,) a atualizar
+        registros (np.ndarray): Registros em ordem de gravação
+    """
+    if len(registros) == 0:
+        return
+    carros, ultimos = np.unique(registros['carro'][::-1], return_index=True)
+    ultimos = len(registros) - 1 - ultimos
+    posicoes[carros, 0] = registros['x'][ultimos]
+    posicoes[carros, 1] = registros['y'][ultimos]
+    passos += np.bincount(registros['carro'], minlength=len(passos))
+
+def estado_no_tick(registros, tick, num_carros):
+    """
+    Reconstrói posições e passos de todos os carros ao final de um tick,
+    a partir dos registros de um episódio (permite avançar e voltar livremente).
+
+    Returns:
+        tuple: (posicoes (num_carros, 2), passos (num_carros,))
+    """
+    posicoes = np.ones((num_carros, 2), dtype=np.int64)  # Posição inicial (1, 1)
+    passos = np.zeros(num_carros, dtype=np.int64)
+    aplicar_registros(posicoes, passos, registros[:np.searchsorted(registros['passo'], tick, side='right')])
+    return posicoes, passos
+
+def abrir_gravador(caminho, ambiente):
+    """Cria o gravador de trajetória e registra o mapa inicial do ambiente."""
+    gravador = GravadorTrajetoria(caminho, ambiente.num_carros)
+    gravador.registrar_mapa(ambiente)
+    return gravador
@@ -0,0 +1,332 @@
+# src/varredura.py
+
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from src.treino_headless import executar_treino, adicionar_argumentos_convergencia, criterios_convergencia
+from src.util.constantes import PARAMS_APRENDIZAGEM, PARAMS_GENETICOS
+
+# Parâmetros da simulação que podem ser variados além dos dicionários de constantes
+PARAMETROS_INTEIROS = ('carros', 'semente_labirinto')
+PARAMETROS = tuple(PARAMS_APRENDIZAGEM) + tuple(PARAMS_GENETICOS) + PARAMETROS_INTEIROS
+
+# Colunas de resultado de cada execução
+COLUNAS_RESULTADO = ('passos_ate_meta', 'geracoes_ate_meta', 'melhor_tempo', 'caminho_minimo',
+                     'geracoes_convergencia', 'geracao_estavel', 'geracoes', 'evolucoes', 'passos',
+                     'duracao', 'erro')
+
+def _converter(nome, texto):
+    """Converte o valor de um parâmetro lido da linha de comando."""
+    return int(texto) if nome in PARAMETROS_INTEIROS else float(texto)
+
+def _separar(especificacao):
+    """
+    Separa 'NOME=valores' e valida o nome do parâmetro.
+
+    Raises:
+        ValueError: Se a especificação não tiver '=' ou o parâmetro não existir
+    """
+    nome, sep, valores = especificacao.partition('=')
+    if not sep:
+        raise ValueError(f"Especificação inválida (esperado NOME=valores): {especificacao}")
+    if nome not in PARAMETROS:
+        raise ValueError(f"Parâmetro desconhecido: {nome} (opções: {', '.join(PARAMETROS)})")
+    return nome, valores
+
+def configuracoes_grade(especificacoes):
+    """
+    Gera o produto cartesiano de listas de valores.
+
+    Args:
+        especificacoes (list): Textos 'NOME=v1,v2,...'
+
+    Returns:
+        list: Dicionários {parâmetro: valor}, um por combinação
+    """
+    eixos = []
+    for especificacao in especificacoes:
+        nome, valores = _separar(especificacao)
+        eixos.append([(nome, _converter(nome, v)) for v in valores.split(',')])
+    return [dict(combinacao) for combinacao in itertools.product(*eixos)]
+
+def configuracoes_aleatorias(especificacoes, amostras, semente=None):
+    """
+    Sorteia configurações uniformemente em intervalos.
+    Parâmetros inteiros são sorteados entre os limites, inclusive.
+
+    Args:
+        especificacoes (list): Textos 'NOME=min:max'
+        amostras (int): Número de configurações sorteadas
+        semente (int): Semente do sorteio
+
+    Returns:
+        list: Dicionários {parâmetro: valor}, um por amostra
+    """
+    rng = np.random.default_rng(semente)
+    intervalos = []
+    for especificacao in especificacoes:
+        nome, valores = _separar(especificacao)
+        minimo, sep, maximo = valores.partition(':')
+        if not sep:
+            raise ValueError(f"Intervalo inválido (esperado NOME=min:max): {especificacao}")
+        intervalos.append((nome, _converter(nome, minimo), _converter(nome, maximo)))
+
+    configuracoes = []
+    for _ in range(amostras):
+        configuracao = {}
+        for nome, minimo, maximo in intervalos:
+            if nome in PARAMETROS_INTEIROS:
+                configuracao[nome] = int(rng.integers(minimo, maximo, endpoint=True))
+            else:
+                configuracao[nome] = float(rng.uniform(minimo, maximo))
+        configuracoes.append(configuracao)
+    return configuracoes
+
+def executar_configuracao(tarefa):
+    """
+    Executa o treino headless de uma configuração no processo trabalhador.
+    Os parâmetros de constantes são aplicados nos dicionários do próprio
+    processo, que são lidos pelos agentes e carros genéticos a cada uso.
+
+    A convergência usa o menor caminho por busca em largura até a meta: é a
+    primeira geração em que algum carro chega em no máximo
+    fator_convergencia vezes esse número de passos. Com critérios de
+    convergência nas opções, geracao_estavel é a geração em que o
+    MonitorConvergencia considerou o treino estável.
+
+    Args:
+        tarefa (tuple): (índice, parâmetros, opções do treino, semente,
+            fator_convergencia)
+
+    Returns:
+        dict: Linha de resultado com os parâmetros e as métricas da execução
+    """
+    indice, parametros, opcoes, semente, fator_convergencia = tarefa
+    originais = (dict(PARAMS_APRENDIZAGEM), dict(PARAMS_GENETICOS))
+    for nome, valor in parametros.items():
+        if nome in PARAMS_APRENDIZAGEM:
+            PARAMS_APRENDIZAGEM[nome] = valor
+        elif nome in PARAMS_GENETICOS:
+            PARAMS_GENETICOS[nome] = valor
+
+    linha = {'execucao': indice, 'semente': semente, **parametros}
+    linha.update(dict.fromkeys(COLUNAS_RESULTADO))
+    progresso = {'passos': 0, 'geracao': 0}
+
+    def ao_fim_geracao(ambiente, resultado):
+        progresso['geracao'] += 1
+        if linha['caminho_minimo'] is None:
+            linha['caminho_minimo'] = ambiente.distancia((1, 1))
+        tempos = [c.tempo_chegada for c in ambiente.carros_geneticos if c.chegou_meta]
+        if tempos:
+            melhor = min(tempos)
+            if linha['passos_ate_meta'] is None:
+                # Passos de todos os carros até o fim do episódio da primeira chegada
+                linha['passos_ate_meta'] = progresso['passos'] + resultado.passos
+                linha['geracoes_ate_meta'] = progresso['geracao']
+            if linha['melhor_tempo'] is None or melhor < linha['melhor_tempo']:
+                linha['melhor_tempo'] = melhor
+            if (linha['geracoes_convergencia'] is None
+                    and melhor <= fator_convergencia * linha['caminho_minimo']):
+                linha['geracoes_convergencia'] = progresso['geracao']
+        progresso['passos'] += resultado.passos
+
+    try:
+        opcoes = dict(opcoes)
+        num_carros = int(parametros.get('carros', opcoes.pop('carros')))
+        opcoes['semente_labirinto'] = parametros.get('semente_labirinto', opcoes.get('semente_labirinto'))
+        estatisticas = executar_treino(num_carros=num_carros, ao_fim_geracao=ao_fim_geracao,
+                                       semente=semente, **opcoes)
+        linha.update(geracoes=estatisticas['geracoes'], evolucoes=estatisticas['evolucoes'],
+                     passos=estatisticas['passos'], duracao=estatisticas['duracao'])
+        if estatisticas['convergencia'] is not None:
+            linha['geracao_estavel'] = estatisticas['convergencia'].geracao_convergencia
+    except Exception as e:
+        linha['erro'] = f"{type(e).__name__}: {e}"
+    finally:
+        PARAMS_APRENDIZAGEM.clear()
+        PARAMS_APRENDIZAGEM.update(originais[0])
+        PARAMS_GENETICOS.clear()
+        PARAMS_GENETICOS.update(originais[1])
+    return linha
+
+def _importar_pandas():
+    """
+    Importa o pandas, dependência opcional usada só na saída Parquet.
+
+    Raises:
+        RuntimeError: Se pandas não estiver instalado
+    """
+    try:
+        import pandas
+    except ImportError as e:
+        raise RuntimeError("A saída Parquet exige o pacote pandas (e pyarrow ou fastparquet)") from e
+    return pandas
+
+def salvar_parquet(caminho, linhas, colunas):
+    """Grava os resultados em Parquet, ordenados pela execução."""
+    pd = _importar_pandas()
+    pd.DataFrame(linhas, columns=colunas).sort_values('execucao').to_parquet(caminho, index=False)
+
+class Varredura:
+    """
+    Executa uma lista de configurações de treino headless em um
+    ProcessPoolExecutor e grava uma linha por execução em CSV, à medida que
+    as execuções terminam, para que uma varredura interrompida não perca o
+    que já foi medido. Opcionalmente grava também um arquivo Parquet no final.
+    """
+    def __init__(self, configuracoes, opcoes, repeticoes=1, processos=None, semente=None,
+                 fator_convergencia=1.1):
+        """
+        Args:
+            configuracoes (list): Dicionários {parâmetro: valor} a executar
+            opcoes (dict): Argumentos fixos de executar_treino (inclui 'carros')
+            repeticoes (int): Execuções de cada configuração, com sementes diferentes
+            processos (int): Número de processos (Padrão: núcleos disponíveis)
+            semente (int): Semente das sementes de cada execução
+            fator_convergencia (float): Tolerância sobre o menor caminho para
+                considerar que a frota convergiu
+        """
+        self.configuracoes = configuracoes
+        self.opcoes = opcoes
+        self.repeticoes = repeticoes
+        self.processos = processos or os.cpu_count()
+        self.fator_convergencia = fator_convergencia
+        self.rng = np.random.default_rng(semente)
+        nomes = sorted({nome for configuracao in configuracoes for nome in configuracao},
+                       key=PARAMETROS.index)
+        self.colunas = ('execucao', 'repeticao', 'semente') + tuple(nomes) + COLUNAS_RESULTADO
+
+    def tarefas(self):
+        """Tarefas de executar_configuracao, com uma semente própria por execução."""
+        combinacoes = [(configuracao, repeticao) for configuracao in self.configuracoes
+                       for repeticao in range(self.repeticoes)]
+        sementes = self.rng.integers(0, 2**63, size=len(combinacoes))
+        return [(indice, {**configuracao, 'repeticao': repeticao}, self.opcoes, int(semente),
+                 self.fator_convergencia)
+                for indice, ((configuracao, repeticao), semente) in enumerate(zip(combinacoes, sementes))]
+
+    def executar(self, caminho_csv, caminho_parquet=None, verboso=True):
+        """
+        Executa todas as tarefas e grava os resultados.
+
+        Returns:
+            list: Linhas de resultado, na ordem de término
+
+        Raises:
+            RuntimeError: Se a saída Parquet for pedida sem pandas (antes de executar)
+        """
+        if caminho_parquet:
+            _importar_pandas()
+        tarefas = self.tarefas()
+        linhas = []
+        inicio = time.perf_counter()
+        with open(caminho_csv, 'w', newline='') as arquivo, \
+                ProcessPoolExecutor(max_workers=self.processos) as executor:
+            escritor = csv.DictWriter(arquivo, fieldnames=self.colunas)
+            escritor.writeheader()
+            futuros = [executor.submit(executar_configuracao, tarefa) for tarefa in tarefas]
+            for futuro in as_completed(futuros):
+                linha = futuro.result()
+                linhas.append(linha)
+                escritor.writerow(linha)
+                arquivo.flush()
+                if verboso:
+                    estado = linha['erro'] or f"{linha['duracao']:.1f}s"
+                    print(f"[{len(linhas)}/{len(tarefas)}] execução {linha['execucao']}: "
+                          f"convergência {linha['geracoes_convergencia']} | {estado} "
+                          f"({time.perf_counter() - inicio:.0f}s no total)")
+
+        if caminho_parquet:
+            salvar_parquet(caminho_parquet, linhas, self.colunas)
+        return linhas
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando da varredura.
+    Exemplos:
+        python -m src.varredura --grade FATOR_DESCONTO=0.9,0.95,0.99 --grade carros=4,8
+        python -m src.varredura --aleatorio TAXA_APRENDIZAGEM_BASE=0.05:0.5 --amostras 50
+    """
+    parser = argparse.ArgumentParser(
+        description="Varre parâmetros do treino headless em vários processos.")
+    parser.add_argument('--grade', action='append', default=[], metavar='NOME=V1,V2,...',
+                        help="Valores de um parâmetro; as grades são combinadas entre si")
+    parser.add_argument('--aleatorio', action='append', default=[], metavar='NOME=MIN:MAX',
+                        help="Intervalo sorteado de um parâmetro (combinado com as grades)")
+    parser.add_argument('--amostras', type=int, default=20,
+                        help="Configurações sorteadas com --aleatorio (Padrão: 20)")
+    parser.add_argument('--repeticoes', type=int, default=1,
+                        help="Execuções de cada configuração (Padrão: 1)")
+    parser.add_argument('--saida', default='varredura.csv',
+                        help="Arquivo CSV dos resultados (Padrão: varredura.csv)")
+    parser.add_argument('--parquet', default=None,
+                        help="Grava também os resultados neste arquivo Parquet (exige pandas)")
+    parser.add_argument('--processos', type=int, default=None,
+                        help="Número de processos (Padrão: núcleos disponíveis)")
+    parser.add_argument('--semente', type=int, default=None,
+                        help="Semente das configurações sorteadas e das execuções")
+    parser.add_argument('--convergencia', type=float, default=1.1,
+                        help="Converge quando um carro chega em até este múltiplo do "
+                             "menor caminho (Padrão: 1.1)")
+    parser.add_argument('--carros', type=int, default=6,
+                        help="Número de carros, se não for varrido (Padrão: 6)")
+    parser.add_argument('--geracoes', type=int, default=50,
+                        help="Gerações de cada execução (Padrão: 50)")
+    parser.add_argument('--max-passos', type=int, default=5000,
+                        help="Limite de ticks por episódio, 0 = sem limite (Padrão: 5000)")
+    parser.add_argument('--tabela', choices=['dicionario', 'densa', 'linear'], default='densa',
+                        help="Backend da tabela Q dos agentes (Padrão: densa)")
+    parser.add_argument('--vetorizado', action='store_true',
+                        help="Usa a frota e o aprendiz vetorizados")
+    parser.add_argument('--labirinto', choices=['fixo', 'backtracker', 'sidewinder'],
+                        default='fixo', help="Labirinto fixo ou procedural (Padrão: fixo)")
+    parser.add_argument('--dimensoes', type=int, nargs=2, metavar=('LINHAS', 'COLUNAS'),
+                        default=None, help="Dimensões do labirinto procedural")
+    parser.add_argument('--evoluir-por-progresso', action='store_true',
+                        help="Evolui mesmo sem dois carros na meta, pela distância alcançada")
+    parser.add_argument('--planejar', action='store_true',
+                        help="Inicializa as tabelas Q por iteração de valor sobre o labirinto")
+    adicionar_argumentos_convergencia(parser)
+    args = parser.parse_args(argv)
+    if not args.grade and not args.aleatorio:
+        parser.error("informe ao menos um --grade ou --aleatorio")
+    if args.tabela == 'linear' and args.planejar:
+        parser.error("--tabela linear não suporta --planejar")
+
+    try:
+        grade = configuracoes_grade(args.grade) if args.grade else [{}]
+        aleatorias = (configuracoes_aleatorias(args.aleatorio, args.amostras, args.semente)
+                      if args.aleatorio else [{}])
+    except ValueError as e:
+        parser.error(str(e))
+    configuracoes = [{**g, **a} for g in grade for a in aleatorias]
+
+    opcoes = {
+        'carros': args.carros,
+        'geracoes': args.geracoes,
+        'max_passos': args.max_passos or None,
+        'tabela': args.tabela,
+        'vetorizado': args.vetorizado,
+        'dimensoes': tuple(args.dimensoes) if args.dimensoes else None,
+        'gerador': None if args.labirinto == 'fixo' else args.labirinto,
+        'evoluir_por_progresso': args.evoluir_por_progresso,
+        'planejar': args.planejar,
+        'criterios_convergencia': criterios_convergencia(args, parser),
+    }
+    varredura = Varredura(configuracoes, opcoes, args.repeticoes, args.processos,
+                          args.semente, args.convergencia)
+    print(f"Varredura: {len(configuracoes)} configurações x {args.repeticoes} repetições "
+          f"em {varredura.processos} processos")
+    try:
+        varredura.executar(args.saida, args.parquet)
+    except RuntimeError as e:
+        parser.error(str(e))
+    print(f"Resultados gravados em {args.saida}")
+
+if __name__ == "__main__":
+    main()
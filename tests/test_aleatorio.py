@@ -0,0 +1,48 @@
+# tests/test_aleatorio.py
+
+import pickle
+import pytest
+from src.agentes.agente_q_learning import AgenteQLearning, AgenteQLearningDenso
+from src.agentes.agente_linear import AgenteLinear, ExtratorCaracteristicas
+from src.agentes.carro_genetico import CarroGenetico
+from src.ambiente.ambiente_carro import AmbienteCarro
+from src.util.aleatorio import FluxoAleatorio, FluxosExecucao
+
+def _ida_e_volta(objeto):
+    """Serializa e desserializa com pickle."""
+    return pickle.loads(pickle.dumps(objeto))
+
+def test_fluxo_continua_a_mesma_sequencia_apos_pickle():
+    fluxo = FluxoAleatorio(11, tamanho_bloco=8)
+    for _ in range(13):  # Para no meio do segundo bloco
+        fluxo.random()
+    copia = _ida_e_volta(fluxo)
+    assert [copia.random() for _ in range(20)] == [fluxo.random() for _ in range(20)]
+
+def test_fluxos_da_execucao_sobrevivem_ao_pickle():
+    fluxos = FluxosExecucao(1, 2)
+    copia = _ida_e_volta(fluxos)
+    assert copia.execucao.random() == fluxos.execucao.random()
+    assert copia.sensores[1].random() == fluxos.sensores[1].random()
+    assert copia.semente_labirinto == fluxos.semente_labirinto
+
+@pytest.mark.parametrize('aleatorio', [None, FluxoAleatorio(5)])
+def test_agentes_e_carros_sobrevivem_ao_pickle(aleatorio):
+    ambiente = AmbienteCarro(num_carros=2, headless=True, aleatorio=aleatorio)
+    objetos = [
+        AgenteQLearning(0, aleatorio),
+        AgenteQLearningDenso(1, aleatorio=aleatorio),
+        AgenteLinear(0, ExtratorCaracteristicas(ambiente), aleatorio=aleatorio),
+        CarroGenetico(0, aleatorio),
+        ambiente,
+    ]
+    for objeto in objetos:
+        _ida_e_volta(objeto)
+
+def test_agente_restaurado_explora_como_o_original():
+    agente = AgenteQLearning(0, FluxoAleatorio(3))
+    agente.epsilon = 0.5
+    copia = _ida_e_volta(agente)
+    acoes = ['cima', 'direita', 'baixo']
+    assert ([copia.escolher_acao((1, 1), acoes) for _ in range(50)]
+            == [agente.escolher_acao((1, 1), acoes) for _ in range(50)])
@@ -0,0 +1,46 @@
+# tests/test_ambiente_carro.py
+
+import math
+import numpy as np
+import pytest
+from src.ambiente.ambiente_carro import AmbienteCarro
+from src.ambiente.frota_vetorizada import FrotaVetorizada
+from src.ambiente.campo_distancias import calcular_campo_distancias, INALCANCAVEL
+
+def _tem_caminho_seguro(ambiente):
+    """Indica se a meta é alcançável a partir de (1, 1) sem passar por armadilhas."""
+    seguro = ambiente.labirinto == 0
+    for x, y in ambiente.armadilhas:
+        seguro[y, x] = False
+    return calcular_campo_distancias(seguro, ambiente.pos_meta)[1, 1] != INALCANCAVEL
+
+@pytest.mark.parametrize('dimensoes, taxa_ciclos', [((41, 41), 0.0), ((41, 41), 0.05), ((5, 5), 0.05)])
+def test_armadilhas_nunca_bloqueiam_o_caminho_ate_a_meta(dimensoes, taxa_ciclos):
+    for semente in range(30):
+        ambiente = AmbienteCarro(num_carros=1, headless=True, dimensoes=dimensoes,
+                                 semente_labirinto=semente, taxa_ciclos=taxa_ciclos)
+        assert _tem_caminho_seguro(ambiente)
+        assert len(ambiente.armadilhas) <= ambiente.num_armadilhas
+        assert (1, 1) not in ambiente.armadilhas
+        assert ambiente.pos_meta not in ambiente.armadilhas
+
+@pytest.mark.parametrize('tamanho_grid', [60, 100, 200])
+def test_labirinto_fixo_rejeita_celulas_maiores_que_o_padrao(tamanho_grid):
+    with pytest.raises(ValueError):
+        AmbienteCarro(num_carros=1, headless=True, tamanho_grid=tamanho_grid)
+
+def test_modelagem_finita_em_celulas_sem_caminho():
+    ambiente = AmbienteCarro(num_carros=1, headless=True, fator_modelagem=1.0)
+    # Célula livre (3, 3) isolada por paredes
+    labirinto = ambiente.labirinto.copy()
+    labirinto[[2, 3, 3, 4], [3, 2, 4, 3]] = 1
+    labirinto[3, 3] = 0
+    ambiente.atualizar_labirinto(labirinto)
+    assert ambiente.distancia((3, 3)) == float('inf')
+    assert math.isfinite(ambiente.modelagem_recompensa((3, 3), (3, 3)))
+    assert math.isfinite(ambiente.modelagem_recompensa((1, 1), (3, 3)))
+
+    frota = FrotaVetorizada(ambiente, semente=1)
+    frota.posicoes[:] = (3, 3)
+    _, recompensas, _ = frota.passo(np.array([0]))
+    assert np.isfinite(recompensas).all()
@@ -0,0 +1,19 @@
+# tests/test_populacao_genetica.py
+
+import pytest
+from src.agentes.populacao_genetica import PopulacaoGenetica
+
+@pytest.mark.parametrize('elite', [0, 2, 4])
+def test_nova_geracao_mantem_o_tamanho(elite):
+    populacao = PopulacaoGenetica(4, semente=1)
+    populacao.fitness[:] = [3.0, 1.0, 4.0, 2.0]
+    indices_elite = populacao.nova_geracao('torneio', elite)
+    assert populacao.tamanho == 4
+    assert len(indices_elite) == elite
+
+@pytest.mark.parametrize('elite', [-1, 5])
+def test_nova_geracao_rejeita_elite_fora_da_populacao(elite):
+    populacao = PopulacaoGenetica(4, semente=1)
+    with pytest.raises(ValueError):
+        populacao.nova_geracao('torneio', elite)
+    assert populacao.tamanho == 4
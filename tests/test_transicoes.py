@@ -0,0 +1,114 @@
+# tests/test_transicoes.py
+
+import numpy as np
+import pytest
+from src.ambiente.transicoes import TabelaTransicoes, LIVRE, PAREDE, ARMADILHA, META
+from src.util.aleatorio import FluxoAleatorio
+from src.util.constantes import DESLOCAMENTOS, RECOMPENSAS
+
+def _labirinto_aberto(linhas=9, colunas=9):
+    """Labirinto sem paredes internas, cercado por uma borda de paredes."""
+    labirinto = np.zeros((linhas, colunas), dtype=np.int8)
+    labirinto[[0, -1], :] = 1
+    labirinto[:, [0, -1]] = 1
+    return labirinto
+
+def _sorteio_fixo(valor):
+    """Gerador que sempre devolve o mesmo número, no formato de random.random."""
+    return lambda: valor
+
+@pytest.mark.parametrize('velocidade', range(1, 11))
+@pytest.mark.parametrize('x, y', [(4, 4), (3, 3), (4, 3), (3, 4)])
+def test_passo_segue_regra_original_de_arredondamento(velocidade, x, y):
+    tabela = TabelaTransicoes(_labirinto_aberto(), [], (7, 7))
+    for indice_acao, (dx, dy) in enumerate(DESLOCAMENTOS):
+        # Regra original: round() arredonda 0.5 para o par
+        esperado = (round(x + dx * velocidade * 0.1), round(y + dy * velocidade * 0.1))
+        novo_x, novo_y, recompensa, terminado = tabela.passo(
+            x, y, indice_acao, velocidade, 1.0, _sorteio_fixo(0.0))
+        assert (novo_x, novo_y) == esperado
+        assert recompensa == RECOMPENSAS['PASSO']
+        assert not terminado
+
+def test_passo_com_velocidade_cinco_so_anda_de_coordenada_impar():
+    tabela = TabelaTransicoes(_labirinto_aberto(), [], (7, 7))
+    direita, baixo = 1, 2
+    assert tabela.passo(3, 4, direita, 5, 1.0, _sorteio_fixo(0.0))[:2] == (4, 4)
+    assert tabela.passo(4, 4, direita, 5, 1.0, _sorteio_fixo(0.0))[:2] == (4, 4)
+    assert tabela.passo(4, 3, baixo, 5, 1.0, _sorteio_fixo(0.0))[:2] == (4, 4)
+    assert tabela.passo(4, 4, baixo, 5, 1.0, _sorteio_fixo(0.0))[:2] == (4, 4)
+
+def test_passo_e_passo_lote_concordam_com_os_mesmos_sorteios():
+    labirinto = _labirinto_aberto(15, 15)
+    labirinto[5, 2:12] = 1
+    labirinto[2:10, 8] = 1
+    armadilhas = [(3, 3), (6, 7), (10, 11), (12, 4)]
+    tabela = TabelaTransicoes(labirinto, armadilhas, (13, 13))
+
+    rng = np.random.default_rng(17)
+    livres = np.argwhere(labirinto == 0)[:, ::-1]
+    n = 2000
+    posicoes = livres[rng.integers(len(livres), size=n)]
+    acoes = rng.integers(len(DESLOCAMENTOS), size=n)
+    velocidades = rng.choice(np.array([1.0, 4.0, 5.0, 6.0, 10.0, 7.3]), size=n)
+    sensores = rng.uniform(0.12, 10, size=n)
+    sorteios = rng.random(n)
+
+    novas, recompensas, terminados, _ = tabela.passo_lote(
+        posicoes, acoes, velocidades, sensores, sorteios)
+    for i in range(n):
+        x, y = posicoes[i].tolist()
+        esperado = tabela.passo(x, y, int(acoes[i]), float(velocidades[i]),
+                                float(sensores[i]), _sorteio_fixo(float(sorteios[i])))
+        assert (*novas[i].tolist(), float(recompensas[i]), bool(terminados[i])) == esperado
+
+@pytest.mark.parametrize('sensor', [0.3, 1.5, 2.7])
+def test_armadilha_evitada_com_probabilidade_do_sensor(sensor):
+    # Armadilha à direita da posição (4, 4)
+    tabela = TabelaTransicoes(_labirinto_aberto(), [(5, 4)], (7, 7))
+    direita = 1
+    limite = sensor / 3.0
+
+    evitada = tabela.passo(4, 4, direita, 10, sensor, _sorteio_fixo(limite - 1e-9))
+    assert evitada == (4, 4, RECOMPENSAS['ARMADILHA_EVITADA'], False)
+    caiu = tabela.passo(4, 4, direita, 10, sensor, _sorteio_fixo(limite))
+    assert caiu == (4, 4, RECOMPENSAS['ARMADILHA'], True)
+
+    aleatorio = FluxoAleatorio(3)
+    n = 20000
+    evitadas = sum(not tabela.passo(4, 4, direita, 10, sensor, aleatorio.random)[3]
+                   for _ in range(n))
+    assert abs(evitadas / n - limite) < 0.02
+
+def test_passo_lote_evita_armadilha_sem_encerrar():
+    tabela = TabelaTransicoes(_labirinto_aberto(), [(5, 4)], (7, 7))
+    posicoes = np.array([[4, 4], [4, 4]])
+    novas, recompensas, terminados, tipos = tabela.passo_lote(
+        posicoes, np.array([1, 1]), np.array([10.0, 10.0]), np.array([1.5, 1.5]),
+        np.array([0.1, 0.5]))  # 0.5 = sensor / 3: no limite o carro cai
+    assert novas.tolist() == [[4, 4], [4, 4]]
+    assert recompensas.tolist() == [RECOMPENSAS['ARMADILHA_EVITADA'], RECOMPENSAS['ARMADILHA']]
+    assert terminados.tolist() == [False, True]
+    assert tipos.tolist() == [ARMADILHA, ARMADILHA]
+
+def test_tipos_terminais_de_parede_meta_e_armadilha():
+    # Em (1, 1): paredes acima e à esquerda, meta à direita e armadilha abaixo
+    labirinto = _labirinto_aberto()
+    tabela = TabelaTransicoes(labirinto, [(1, 2)], (2, 1))
+    cima, direita, baixo, esquerda = range(4)
+    assert tabela.tipos[1 * tabela.colunas + 1].tolist() == [PAREDE, META, ARMADILHA, PAREDE]
+
+    posicoes = np.array([[1, 1]] * 4 + [[3, 3]])
+    acoes = np.array([cima, direita, baixo, esquerda, direita])
+    novas, recompensas, terminados, tipos = tabela.passo_lote(
+        posicoes, acoes, np.full(5, 10.0), np.zeros(5), np.ones(5))
+    assert tipos.tolist() == [PAREDE, META, ARMADILHA, PAREDE, LIVRE]
+    assert novas.tolist() == [[1, 1], [2, 1], [1, 1], [1, 1], [4, 3]]
+    assert recompensas.tolist() == [RECOMPENSAS['PAREDE'], RECOMPENSAS['META'],
+                                    RECOMPENSAS['ARMADILHA'], RECOMPENSAS['PAREDE'],
+                                    RECOMPENSAS['PASSO']]
+    assert terminados.tolist() == [True, True, True, True, False]
+
+    assert tabela.passo(1, 1, cima, 10, 0.0, _sorteio_fixo(1.0)) == (1, 1, RECOMPENSAS['PAREDE'], True)
+    assert tabela.passo(1, 1, direita, 10, 0.0, _sorteio_fixo(1.0)) == (2, 1, RECOMPENSAS['META'], True)
+    assert tabela.passo(1, 1, baixo, 10, 0.0, _sorteio_fixo(1.0)) == (1, 1, RECOMPENSAS['ARMADILHA'], True)